@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from Benchmarks.SalesDataGenerator import SalesDataGenerator
+from Core.CsvImport import CsvImport
+from Core.SalesAnalyzer import SalesAnalyzer
+from Core.SalesPlots import SalesPlots
+from Core.XlsxExport import XlsxExport
+
+
+class BenchmarkSuite:
+    """
+    Times and memory-profiles every stage of the SalesResult pipeline on synthetic data.
+
+    Each stage is run `repeats` times per dataset size; the reported time is the
+    median and the reported memory is the peak traced by tracemalloc during the
+    first run. Results can be written as JSON and compared against a stored baseline.
+    """
+
+    def __init__(self, sizes: list, repeats: int = 3, generator: SalesDataGenerator = None, workdir: str = None):
+        """
+        Args:
+            sizes (list): Dataset sizes (rows) to benchmark.
+            repeats (int): Timed runs per stage.
+            generator (SalesDataGenerator, optional): Data source; defaults to seed 42.
+            workdir (str, optional): Directory for generated CSVs and exports (temporary by default).
+        """
+        self.sizes = sizes
+        self.repeats = max(1, repeats)
+        self.generator = generator or SalesDataGenerator()
+        self.workdir = workdir
+
+    def run(self) -> dict:
+        """
+        Runs all stages for every size.
+
+        Returns:
+            dict: {'meta': environment info, 'results': [{'stage', 'rows', 'seconds', 'peak_mb'}, ...]}
+        """
+        results = []
+        with tempfile.TemporaryDirectory(dir=self.workdir) as tmp:
+            for rows in self.sizes:
+                csv_path = self.generator.write_csv(os.path.join(tmp, f"sales_{rows}.csv"), rows)
+                results.extend(self._run_size(rows, csv_path, tmp))
+
+        return {"meta": self._meta(), "results": results}
+
+    def _run_size(self, rows: int, csv_path: str, tmp: str) -> list:
+        """Internal helper benchmarking every stage on one dataset size."""
+        analyzer = SalesAnalyzer()
+        df = CsvImport().load(csv_path)
+        category = analyzer.get_category_share(df)
+        report = analyzer.get_full_report(df)
+        histogram = analyzer.get_histogram(df, "Revenue", by="Country")
+        boxes = analyzer.get_box_summary(df, "Revenue", by="Category")
+
+        stages = [
+            ("CsvImport.load", lambda: CsvImport().load(csv_path)),
+            ("SalesAnalyzer.get_category_share", lambda: analyzer.get_category_share(df)),
+            ("SalesAnalyzer.get_country_share", lambda: analyzer.get_country_share(df)),
+            ("SalesAnalyzer.get_age_group_share", lambda: analyzer.get_age_group_share(df)),
+            ("SalesAnalyzer.calculate_total_revenue", lambda: analyzer.calculate_total_revenue(df)),
+            ("SalesAnalyzer.get_full_report", lambda: analyzer.get_full_report(df)),
+            ("SalesAnalyzer.get_histogram", lambda: analyzer.get_histogram(df, "Revenue", by="Country")),
+            ("SalesAnalyzer.get_box_summary", lambda: analyzer.get_box_summary(df, "Revenue", by="Category")),
+            ("SalesPlots.draw (Agg)", lambda: self._draw_agg(category)),
+            ("SalesPlots.draw histogram (Agg)", lambda: self._draw_agg(histogram, "Histogram", "by Country")),
+            ("SalesPlots.draw box plot (Agg)", lambda: self._draw_agg(boxes, "Box Plot")),
+            ("XlsxExport.save", lambda: XlsxExport().save(category, os.path.join(tmp, "bench.xlsx"))),
+            ("XlsxExport.save_report", lambda: XlsxExport().save_report(report, os.path.join(tmp, "report.xlsx"))),
+            ("HomeView.update_grid", self._update_grid_stage(df)),
+        ]
+
+        return [self._measure(name, rows, func) for name, func in stages]
+
+    def _measure(self, name: str, rows: int, func) -> dict:
+        """Internal helper: peak memory from a traced run, median time from untraced runs."""
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        for _ in range(self.repeats):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+
+        result = {
+            "stage": name,
+            "rows": rows,
+            "seconds": round(statistics.median(timings), 6),
+            "peak_mb": round(peak / 2**20, 3),
+        }
+        print(f"{name:<42} {rows:>12,} rows  {result['seconds']:>10.4f} s  {result['peak_mb']:>10.1f} MB",
+              file=sys.stderr)
+        return result
+
+    def _draw_agg(self, data: pd.Series, chart_type: str = "Bar Chart", title_suffix: str = "by Product Category"):
+        """Internal helper drawing a chart and rasterizing it with the Agg canvas."""
+        figure = Figure(figsize=(7, 5), dpi=100)
+        FigureCanvasAgg(figure)
+        SalesPlots(figure).draw(data, chart_type, title_suffix, "#60a5fa", 45)
+        figure.canvas.draw()
+
+    def _update_grid_stage(self, df: pd.DataFrame):
+        """
+        Internal helper returning a callable that runs HomeView.update_grid.
+
+        A real Tk HomeView is used when a display is available; otherwise the
+        method runs against stubbed Treeview/scrollbar/font objects, which still
+        measures the Python-side work (width estimation, row window fetch).
+        """
+        try:
+            import tkinter as tk
+            from Ui.HomeView import HomeView
+
+            root = tk.Tk()
+            root.withdraw()
+            view = HomeView(root, lambda *args: None)
+            return lambda: (view.update_grid(df), root.update_idletasks())
+        except Exception:
+            return lambda: _stub_home_view().update_grid(df)
+
+    def _meta(self) -> dict:
+        """Internal helper describing the environment the numbers were taken on."""
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "repeats": self.repeats,
+            "seed": self.generator.seed,
+        }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Compares benchmark results with a baseline.
+
+    Args:
+        current (dict): Output of BenchmarkSuite.run().
+        baseline (dict): A previously stored result in the same format.
+        tolerance (float): Allowed slowdown before a stage counts as a regression (0.25 = 25 %).
+
+    Returns:
+        list: One entry per stage present in both, with 'ratio' (current / baseline)
+              and 'regression' (bool).
+    """
+    reference = {(r["stage"], r["rows"]): r for r in baseline.get("results", [])}
+    comparison = []
+    for result in current["results"]:
+        base = reference.get((result["stage"], result["rows"]))
+        if base is None or base["seconds"] <= 0:
+            continue
+
+        ratio = result["seconds"] / base["seconds"]
+        comparison.append({
+            "stage": result["stage"],
+            "rows": result["rows"],
+            "seconds": result["seconds"],
+            "baseline_seconds": base["seconds"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + tolerance,
+        })
+    return comparison
+
+
+class _StubTree:
+    """Minimal in-memory stand-in for ttk.Treeview used when no display is available."""
+
+    def __init__(self):
+        self._items = {}
+        self._config = {}
+        self._next = 0
+
+    def insert(self, parent, index, values=(), tags=()):
+        iid = f"I{self._next}"
+        self._next += 1
+        self._items[iid] = (values, tags)
+        return iid
+
+    def item(self, iid, values=(), tags=()):
+        self._items[iid] = (values, tags)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self._items.pop(iid, None)
+
+    def get_children(self, *args):
+        return list(self._items)
+
+    def heading(self, *args, **kwargs):
+        pass
+
+    def column(self, *args, **kwargs):
+        pass
+
+    def __setitem__(self, key, value):
+        self._config[key] = value
+
+
+class _StubScrollbar:
+    def set(self, first, last):
+        pass
+
+
+class _StubFont:
+    def measure(self, text):
+        return 7 * len(text)
+
+
+def _stub_home_view():
+    """Builds a HomeView instance wired to stubs instead of Tk widgets (no display needed)."""
+    from Ui.HomeView import HomeView
+    from Ui.ColumnWidthEstimator import ColumnWidthEstimator
+
+    view = HomeView.__new__(HomeView)
+    view.tree = _StubTree()
+    view.scroll_y = _StubScrollbar()
+    view.width_estimator = ColumnWidthEstimator(_StubFont())
+    view.view_data = None
+    view.view_positions = None
+    view.view_offset = 0
+    view.visible_rows = 25
+    view._row_items = []
+    view._grid_columns = []
+    view._show_table_empty_state = lambda show: None
+    return view
+
+
+def main(argv=None) -> int:
+    """
+    Command-line entry point.
+
+    Returns:
+        int: 0 if no regressions were found (or no baseline given), 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks.BenchmarkSuite",
+                                     description="Benchmark the SalesResult pipeline on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Dataset sizes to benchmark (default: 10k 100k 1M).")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (default: 3).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--categories", type=int, default=6, help="Distinct product categories.")
+    parser.add_argument("--countries", type=int, default=7, help="Distinct countries.")
+    parser.add_argument("--extra-columns", type=int, default=0, help="Additional filler columns.")
+    parser.add_argument("--workdir", default=None, help="Directory for temporary CSV files.")
+    parser.add_argument("--output", default=None, help="Write results JSON to this file.")
+    parser.add_argument("--baseline", default=None, help="Compare against this results JSON.")
+    parser.add_argument("--save-baseline", default=None, help="Store the results as a new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs. baseline before failing (default: 0.25).")
+    args = parser.parse_args(argv)
+
+    generator = SalesDataGenerator(args.seed, args.categories, args.countries, args.extra_columns)
+    results = BenchmarkSuite(args.rows, args.repeats, generator, args.workdir).run()
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            results["comparison"] = compare(results, json.load(handle), args.tolerance)
+        if any(entry["regression"] for entry in results["comparison"]):
+            exit_code = 1
+
+    text = json.dumps(results, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(text)
+    print(text)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+
+class SalesDataGenerator:
+    """
+    Produces deterministic synthetic sales data for benchmarking.
+
+    Columns mirror the real exports: 'Date', 'Product_Category', 'Country',
+    'Customer_Age' and 'Revenue', optionally followed by filler columns to
+    emulate wide files. Every chunk is drawn from a generator seeded with
+    (seed, first row), so the same settings always yield the same data and
+    files far larger than memory can be streamed to disk.
+    """
+
+    BASE_CATEGORIES = ["Bikes", "Accessories", "Clothing", "Components", "Helmets", "Shoes"]
+    BASE_COUNTRIES = ["Poland", "Germany", "France", "United States", "United Kingdom", "Canada", "Australia"]
+
+    def __init__(self, seed: int = 42, categories: int = 6, countries: int = 7, extra_columns: int = 0):
+        """
+        Args:
+            seed (int): Base random seed.
+            categories (int): Number of distinct product categories (cardinality).
+            countries (int): Number of distinct countries (cardinality).
+            extra_columns (int): Additional filler columns (mixed numeric/text) for wide files.
+        """
+        self.seed = seed
+        self.extra_columns = extra_columns
+
+        self.categories = self._labels(self.BASE_CATEGORIES, categories, "Category")
+        self.countries = self._labels(self.BASE_COUNTRIES, countries, "Country")
+
+        # Zipf-like popularity: a few categories/countries dominate, like real sales
+        self.category_weights = self._zipf_weights(len(self.categories))
+        self.country_weights = self._zipf_weights(len(self.countries))
+
+    def generate(self, rows: int, start: int = 0) -> pd.DataFrame:
+        """
+        Generates a block of rows.
+
+        Args:
+            rows (int): Number of rows.
+            start (int): Index of the first row, used to keep chunked output deterministic.
+
+        Returns:
+            pd.DataFrame: Synthetic sales rows.
+        """
+        rng = np.random.default_rng([self.seed, start])
+
+        days = rng.integers(0, 3 * 365, rows)
+        ages = np.clip(rng.normal(38, 12, rows), 18, 80).astype(np.int64)
+        revenue = np.round(rng.lognormal(mean=5.5, sigma=1.0, size=rows), 2)
+
+        data = {
+            "Date": (np.datetime64("2022-01-01") + days).astype(str),
+            "Product_Category": np.asarray(self.categories, dtype=object)[
+                rng.choice(len(self.categories), rows, p=self.category_weights)
+            ],
+            "Country": np.asarray(self.countries, dtype=object)[
+                rng.choice(len(self.countries), rows, p=self.country_weights)
+            ],
+            "Customer_Age": ages,
+            "Revenue": revenue,
+        }
+
+        for i in range(self.extra_columns):
+            if i % 2 == 0:
+                data[f"Metric_{i}"] = np.round(rng.random(rows) * 100, 3)
+            else:
+                data[f"Note_{i}"] = np.char.add("note-", rng.integers(0, 1000, rows).astype(str))
+
+        return pd.DataFrame(data)
+
+    def write_csv(self, path: str, rows: int, chunk_rows: int = 1_000_000) -> str:
+        """
+        Streams generated rows to a CSV file without holding them all in memory.
+
+        Args:
+            path (str): Destination file.
+            rows (int): Total number of rows.
+            chunk_rows (int): Rows generated and written per chunk.
+
+        Returns:
+            str: The destination path.
+        """
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            for start in range(0, rows, chunk_rows):
+                chunk = self.generate(min(chunk_rows, rows - start), start=start)
+                chunk.to_csv(handle, index=False, header=(start == 0))
+        return path
+
+    def _labels(self, base: list, count: int, prefix: str) -> list:
+        """Internal helper returning `count` labels, extending the realistic base list if needed."""
+        if count <= len(base):
+            return base[:count]
+        return base + [f"{prefix} {i}" for i in range(len(base) + 1, count + 1)]
+
+    def _zipf_weights(self, count: int) -> np.ndarray:
+        """Internal helper computing normalized 1/rank popularity weights."""
+        weights = 1.0 / np.arange(1, count + 1)
+        return weights / weights.sum()
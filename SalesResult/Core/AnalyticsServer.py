@@ -0,0 +1,427 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from Core.CsvImport import CsvImport
+from Core.Dataset import Dataset
+from Core.MemoryGovernor import MemoryGovernor
+from Core.SalesAnalyzer import SalesAnalyzer
+
+
+class HttpError(Exception):
+    """
+    Raised by request handlers to answer with a non-200 status and a JSON error body.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalyticsServer:
+    """
+    Local HTTP/JSON service answering SalesAnalyzer queries from datasets kept warm in memory.
+
+    Built on asyncio streams only (no third-party web framework), so it runs fully
+    offline. Each connection is served by its own coroutine; parsing and
+    aggregation run on a thread pool so slow requests never block fast ones.
+    Every dataset's full report is computed once at load time; filtered results
+    are cached in a bounded LRU keyed by dataset generation, so reloading a
+    dataset invalidates exactly its own entries. A MemoryGovernor keeps the
+    loaded datasets under a memory budget by spilling the least recently
+    queried ones to memory-mapped files.
+
+    Endpoints (all responses are JSON):
+        GET    /health
+        GET    /datasets
+        POST   /datasets                 body: {"path": "...", "name": "..."} (name optional)
+        DELETE /datasets/<name>
+        GET    /datasets/<name>/aggregate?by=Country[&<Column>=<value>...]
+        GET    /datasets/<name>/top?by=Country&n=5[&<Column>=<value>...]
+
+    Query parameters other than 'by' and 'n' filter rows by column value; repeat
+    a parameter to allow several values (e.g. ?Country=Poland&Country=Germany).
+    """
+
+    # Report sections that can be requested with ?by=
+    DIMENSIONS = ("Category", "Country", "Age Group")
+
+    # Largest accepted request body (POST /datasets only carries a small JSON document)
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = None, cache_size: int = 256,
+                 memory_budget: int = None):
+        """
+        Args:
+            host (str): Interface to bind. Defaults to loopback only.
+            port (int): TCP port; 0 picks a free one (see `port` after start()).
+            workers (int, optional): Threads for parsing and aggregation. Defaults to the CPU count.
+            cache_size (int): Maximum number of cached query results (least recently used are evicted).
+            memory_budget (int, optional): Bytes of resident dataset memory before spilling.
+                Defaults to MemoryGovernor's default.
+        """
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.analyzer = SalesAnalyzer()
+
+        # name -> {'name', 'path', 'data' (Dataset), 'report', 'generation', 'loaded_at', 'seconds'}
+        self.datasets = {}
+        self._generation = 0
+        self._loading = {}
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.memory = MemoryGovernor(memory_budget)
+
+        self._pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                        thread_name_prefix="analytics")
+        self._server = None
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def start(self):
+        """Binds the listening socket. Updates `port` when 0 was requested."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, preload: dict = None):
+        """
+        Starts the server (if needed), loads the given datasets and serves until cancelled.
+
+        Args:
+            preload (dict, optional): Dataset name -> CSV path loaded before serving.
+        """
+        if self._server is None:
+            await self.start()
+        for name, path in (preload or {}).items():
+            await self.load_dataset(path, name)
+
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stops accepting connections, shuts the worker pool down and removes spill files."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.memory.close()
+
+    # ------------------------------------------------------------------ datasets
+
+    async def load_dataset(self, path: str, name: str = None) -> dict:
+        """
+        Parses a CSV file and computes its full report on the worker pool.
+
+        Concurrent requests for the same name share one load. Loading a name
+        that already exists replaces it and invalidates its cached results.
+
+        Args:
+            path (str): CSV file path.
+            name (str, optional): Dataset name; defaults to the file name without extension.
+
+        Returns:
+            dict: Dataset description (see _describe).
+        """
+        name = name or os.path.splitext(os.path.basename(path))[0]
+
+        task = self._loading.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._load_and_store(path, name))
+            self._loading[name] = task
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+
+        return self._describe(await task)
+
+    def remove_dataset(self, name: str):
+        """
+        Forgets a dataset and its cached results.
+
+        Raises:
+            HttpError: 404 if no dataset has this name.
+        """
+        dataset = self._dataset(name)
+        del self.datasets[name]
+        self._evict_generation(dataset["generation"])
+        self.memory.unregister(dataset["data"])
+
+    async def _load_and_store(self, path: str, name: str) -> dict:
+        """Internal helper: load on the pool, publish under a new generation, then enforce the memory budget."""
+        loop = asyncio.get_running_loop()
+        dataset = await loop.run_in_executor(self._pool, self._load, path, name)
+
+        self._generation += 1
+        dataset["generation"] = self._generation
+
+        previous = self.datasets.get(name)
+        self.datasets[name] = dataset
+        if previous is not None:
+            self._evict_generation(previous["generation"])
+            self.memory.unregister(previous["data"])
+
+        self.memory.register(dataset["data"])
+        if self.memory.over_budget():
+            await loop.run_in_executor(self._pool, self.memory.enforce)
+        return dataset
+
+    def _load(self, path: str, name: str) -> dict:
+        """Internal helper (worker thread): import and pre-aggregate one file."""
+        started = time.perf_counter()
+        df = CsvImport().load(path)
+        if "Revenue" not in df.columns:
+            raise HttpError(400, f"'{path}' has no 'Revenue' column.")
+
+        data = Dataset(df, name=name, source=path)
+        report = self.analyzer.get_full_report(data)
+        return {
+            "name": name,
+            "path": os.path.abspath(path),
+            "data": data,
+            "report": report,
+            "loaded_at": time.time(),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def _evict_generation(self, generation: int):
+        """Internal helper dropping cached results of a replaced or removed dataset."""
+        for key in [key for key in self._cache if key[0] == generation]:
+            del self._cache[key]
+
+    def _describe(self, dataset: dict) -> dict:
+        """Internal helper: JSON-friendly dataset description."""
+        return {
+            "name": dataset["name"],
+            "path": dataset["path"],
+            "rows": len(dataset["data"]),
+            "columns": [str(col) for col in dataset["data"].columns],
+            "dimensions": [name for name in self.DIMENSIONS if name in dataset["report"]],
+            "generation": dataset["generation"],
+            "load_seconds": dataset["seconds"],
+        }
+
+    def _dataset(self, name: str) -> dict:
+        """Internal helper looking a dataset up or answering 404."""
+        dataset = self.datasets.get(name)
+        if dataset is None:
+            raise HttpError(404, f"Unknown dataset '{name}'.")
+        self.memory.touch(dataset["data"])
+        return dataset
+
+    # ------------------------------------------------------------------ queries
+
+    async def aggregate(self, name: str, by: str, filters: dict) -> dict:
+        """
+        Revenue per `by` group, optionally over a filtered subset of rows.
+
+        Unfiltered requests are answered from the report computed at load time;
+        filtered ones are computed on the worker pool and cached.
+
+        Returns:
+            dict: {'dataset', 'by', 'rows', 'total', 'values': [{'label', 'revenue'}, ...]}
+        """
+        dataset = self._dataset(name)
+        self._check_dimension(dataset, by)
+
+        rows, report = await self._filtered_report(dataset, filters)
+        return self._series_result(dataset, by, rows, report.get(by, pd.Series(dtype=float)))
+
+    async def top(self, name: str, by: str, n: int, filters: dict) -> dict:
+        """
+        The `n` groups with the highest revenue (same filters and format as aggregate()).
+        """
+        dataset = self._dataset(name)
+        self._check_dimension(dataset, by)
+
+        rows, report = await self._filtered_report(dataset, filters)
+        series = report.get(by, pd.Series(dtype=float)).nlargest(n)
+        result = self._series_result(dataset, by, rows, series)
+        result["n"] = n
+        return result
+
+    async def _filtered_report(self, dataset: dict, filters: dict):
+        """Internal helper returning (row count, report) for a filter, using the LRU cache."""
+        if not filters:
+            return len(dataset["data"]), dataset["report"]
+
+        key = (dataset["generation"], tuple(sorted((col, tuple(sorted(values))) for col, values in filters.items())))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._pool, self._compute_filtered, dataset["data"], filters
+        )
+
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _compute_filtered(self, data: Dataset, filters: dict):
+        """Internal helper (worker thread): filter to a zero-copy view and recompute the report."""
+        view = data
+        for column, values in filters.items():
+            if column not in data.columns:
+                raise HttpError(400, f"Unknown filter column '{column}'.")
+
+            if pd.api.types.is_numeric_dtype(data.column(column)):
+                try:
+                    values = [float(value) for value in values]
+                except ValueError:
+                    raise HttpError(400, f"Column '{column}' is numeric; got {values}.")
+            view = view.where(column, values)
+
+        return len(view), self.analyzer.get_full_report(view)
+
+    def _check_dimension(self, dataset: dict, by: str):
+        """Internal helper validating the ?by= parameter."""
+        if by not in self.DIMENSIONS:
+            raise HttpError(400, f"'by' must be one of {', '.join(self.DIMENSIONS)}.")
+        if by not in dataset["report"]:
+            raise HttpError(400, f"Dataset '{dataset['name']}' has no data for '{by}'.")
+
+    def _series_result(self, dataset: dict, by: str, rows: int, series: pd.Series) -> dict:
+        """Internal helper: JSON-friendly aggregation result."""
+        return {
+            "dataset": dataset["name"],
+            "by": by,
+            "rows": rows,
+            "total": float(series.sum()),
+            "values": [{"label": str(label), "revenue": float(value)} for label, value in series.items()],
+        }
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Internal helper serving HTTP/1.1 requests on one connection (keep-alive aware)."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                length = headers.get("content-length") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length."}, keep_alive=False)
+                    break
+                length = int(length)
+                if length > self.MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+                status, payload = await self._dispatch(method.upper(), target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        """Internal helper routing a request. Returns (status, JSON payload)."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = parse_qs(url.query)
+
+        try:
+            if parts == ["health"] and method == "GET":
+                return 200, {
+                    "status": "ok",
+                    "datasets": len(self.datasets),
+                    "cache": {"entries": len(self._cache), "hits": self.cache_hits, "misses": self.cache_misses},
+                    "memory": self.memory.usage(),
+                }
+
+            if parts == ["datasets"]:
+                if method == "GET":
+                    return 200, {"datasets": [self._describe(d) for d in self.datasets.values()]}
+                if method == "POST":
+                    request = self._json_body(body)
+                    if not request.get("path"):
+                        raise HttpError(400, "Missing 'path'.")
+                    return 200, await self.load_dataset(request["path"], request.get("name"))
+
+            if len(parts) == 2 and parts[0] == "datasets" and method == "DELETE":
+                self.remove_dataset(parts[1])
+                return 200, {"deleted": parts[1]}
+
+            if len(parts) == 3 and parts[0] == "datasets" and method == "GET":
+                name, action = parts[1], parts[2]
+                by = query.pop("by", [None])[0]
+                if action == "aggregate":
+                    return 200, await self.aggregate(name, by, query)
+                if action == "top":
+                    n = query.pop("n", ["10"])[0]
+                    if not n.isdigit() or int(n) < 1:
+                        raise HttpError(400, "'n' must be a positive integer.")
+                    return 200, await self.top(name, by, int(n), query)
+
+            raise HttpError(404, f"No route for {method} {url.path}.")
+
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except FileNotFoundError as e:
+            return 404, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def _json_body(self, body: bytes) -> dict:
+        """Internal helper decoding a JSON object request body."""
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Request body is not valid JSON.")
+        if not isinstance(request, dict):
+            raise HttpError(400, "Request body must be a JSON object.")
+        return request
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool):
+        """Internal helper writing a JSON response."""
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                   500: "Internal Server Error"}
+        data = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
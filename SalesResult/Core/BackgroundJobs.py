@@ -0,0 +1,161 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """
+    Raised by long-running work functions when their job has been cancelled.
+    """
+
+
+class Job:
+    """
+    Handle for a single unit of background work (progress, cancellation, callbacks).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, title: str, events: queue.Queue, on_done=None, on_error=None,
+                 on_progress=None, on_cancel=None):
+        """
+        Args:
+            title (str): Human readable description shown in the UI.
+            events (queue.Queue): Queue shared with the owning BackgroundJobs instance.
+            on_done (callable, optional): Called with the work result.
+            on_error (callable, optional): Called with the raised exception.
+            on_progress (callable, optional): Called with a fraction in range 0.0-1.0.
+            on_cancel (callable, optional): Called when the job ends due to cancellation.
+        """
+        self.id = next(self._ids)
+        self.title = title
+        self.cancel_event = threading.Event()
+        self.progress = 0.0
+
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+
+        self._events = events
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been requested."""
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Requests cooperative cancellation. The work function decides when to stop."""
+        self.cancel_event.set()
+
+    def set_progress(self, fraction: float):
+        """
+        Reports progress from the worker thread. Safe to call from any thread.
+
+        Args:
+            fraction (float): Completed share of the work, clamped to 0.0-1.0.
+        """
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        self._events.put(("progress", self, self.progress))
+
+
+class BackgroundJobs:
+    """
+    Runs work functions on background threads and hands their results back to the caller thread.
+
+    Jobs are executed in submission order by a fixed pool of worker threads, so
+    submitting more jobs than workers simply queues them. Callbacks are never
+    invoked from the worker: they are delivered by poll(), which the UI calls
+    periodically (e.g. via Tk `after()`), keeping all widget access on the UI thread.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """
+        Args:
+            max_workers (int): Number of jobs allowed to run at the same time.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SalesResultJob")
+        self._events = queue.Queue()
+        self._jobs = {}
+
+    def submit(self, work, title: str = "", on_done=None, on_error=None, on_progress=None,
+               on_cancel=None) -> Job:
+        """
+        Queues a work function for background execution.
+
+        Args:
+            work (callable): Function taking the Job handle and returning a result.
+                It should poll `job.cancelled` (or pass `job.cancel_event` on) and may
+                raise JobCancelled to stop early.
+            title (str): Human readable description of the job.
+            on_done, on_error, on_progress, on_cancel (callable, optional):
+                Callbacks delivered on the thread calling poll().
+
+        Returns:
+            Job: Handle that can be used to cancel the job.
+        """
+        job = Job(title, self._events, on_done, on_error, on_progress, on_cancel)
+        self._jobs[job.id] = job
+        self._executor.submit(self._run, job, work)
+        return job
+
+    def poll(self) -> int:
+        """
+        Delivers all pending job events to their callbacks on the calling thread.
+
+        Returns:
+            int: Number of jobs still queued or running.
+        """
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind != "progress":
+                self._jobs.pop(job.id, None)
+
+            callback = getattr(job, f"on_{kind}")
+            if callback is not None:
+                if kind == "cancel":
+                    callback()
+                else:
+                    callback(payload)
+
+        return len(self._jobs)
+
+    def active_jobs(self) -> list:
+        """Returns the jobs which have been submitted but not yet delivered."""
+        return list(self._jobs.values())
+
+    def cancel_all(self):
+        """Requests cancellation of every queued and running job."""
+        for job in list(self._jobs.values()):
+            job.cancel()
+
+    def shutdown(self, cancel: bool = True):
+        """
+        Stops accepting jobs and releases the worker threads.
+
+        Args:
+            cancel (bool): If True, outstanding jobs are cancelled first.
+        """
+        if cancel:
+            self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=cancel)
+
+    def _run(self, job: Job, work):
+        """Internal worker entry point; translates the outcome into a queued event."""
+        if job.cancelled:
+            self._events.put(("cancel", job, None))
+            return
+
+        try:
+            result = work(job)
+        except JobCancelled:
+            self._events.put(("cancel", job, None))
+        except Exception as e:
+            self._events.put(("error", job, e))
+        else:
+            self._events.put(("done", job, result))
@@ -0,0 +1,156 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+
+from Core.CsvImport import CsvImport
+from Core.LookupEnricher import LookupEnricher
+from Core.SalesAnalyzer import SalesAnalyzer
+from Core.SalesPlots import SalesPlots
+from Core.XlsxExport import XlsxExport
+
+
+class BatchReport:
+    """
+    Runs the CsvImport -> SalesAnalyzer -> XlsxExport / SalesPlots pipeline headlessly for many files.
+
+    Nothing in this module touches Tk: charts are rendered with Matplotlib's
+    Agg rasterizer straight from a Figure, so it works on display-less machines.
+    """
+
+    # Chart panels written to the overview PNG: (report section, chart type, title suffix, color, x rotation)
+    CHART_PANELS = [
+        ("Category", "Pie Chart", "by Product Category", "#60a5fa", 45),
+        ("Country", "Bar Chart", "by Country", "#22c55e", 45),
+        ("Age Group", "Bar Chart", "by Age Group", "#fb923c", 0),
+    ]
+
+    def __init__(self, output_dir: str, workers: int = None, charts: bool = True, enrich: str = None):
+        """
+        Args:
+            output_dir (str): Directory receiving one report workbook (and chart) per input file.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                1 processes files sequentially in the current process.
+            charts (bool): Whether to also render an overview PNG per input file.
+            enrich (str, optional): Enrichment file (LookupEnricher) applied to every input
+                before aggregation, e.g. to convert revenue to one currency.
+        """
+        self.output_dir = output_dir
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.charts = charts
+        self.enrich = enrich
+
+    def run(self, paths: list) -> dict:
+        """
+        Processes every input file and collects a machine-readable summary.
+
+        Args:
+            paths (list): CSV file paths to process.
+
+        Returns:
+            dict: Summary with 'ok' (bool), 'files' (per-file results in input order),
+                  'succeeded', 'failed' and 'seconds' keys.
+        """
+        started = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        jobs = [(path, self._output_stem(path, i, paths)) for i, path in enumerate(paths)]
+
+        if self.workers == 1 or len(jobs) <= 1:
+            results = [process_file(path, stem, self.charts, self.enrich) for path, stem in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                futures = [pool.submit(process_file, path, stem, self.charts, self.enrich) for path, stem in jobs]
+                results = [future.result() for future in futures]
+
+        failed = sum(1 for result in results if result["status"] != "ok")
+        return {
+            "ok": failed == 0,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 3),
+            "files": results,
+        }
+
+    def _output_stem(self, path: str, index: int, paths: list) -> str:
+        """Internal helper building a unique output path prefix for an input file."""
+        stem = os.path.splitext(os.path.basename(path))[0]
+        clashes = [p for p in paths[:index] if os.path.splitext(os.path.basename(p))[0] == stem]
+        if clashes:
+            stem = f"{stem}_{len(clashes) + 1}"
+        return os.path.join(self.output_dir, stem)
+
+
+def process_file(path: str, output_stem: str, charts: bool = True, enrich: str = None) -> dict:
+    """
+    Processes a single CSV file. Module-level so it can run in a worker process.
+
+    Args:
+        path (str): Input CSV path.
+        output_stem (str): Output path prefix; '_report.xlsx' / '_charts.png' are appended.
+        charts (bool): Whether to render the overview PNG.
+        enrich (str, optional): Enrichment file applied after import.
+
+    Returns:
+        dict: Per-file result with 'input', 'status' ("ok"/"error"), 'rows',
+              'total_revenue', 'outputs', 'seconds', 'unmatched' (rows per enriched
+              column without a lookup match, with enrichment) and, on failure, 'error'.
+    """
+    started = time.perf_counter()
+    result = {"input": path, "status": "ok", "rows": None, "total_revenue": None, "outputs": []}
+
+    try:
+        df = CsvImport().load(path)
+        if enrich:
+            enricher = LookupEnricher.from_file(enrich)
+            df = enricher.enrich(df)
+            result["unmatched"] = {target: info["rows"] for target, info in enricher.unmatched.items()}
+
+        analyzer = SalesAnalyzer()
+        report = analyzer.get_full_report(df)
+
+        result["rows"] = len(df)
+        result["total_revenue"] = float(analyzer.calculate_total_revenue(df))
+
+        workbook = f"{output_stem}_report.xlsx"
+        success, message = XlsxExport().save_report(report, workbook)
+        if not success:
+            raise RuntimeError(message)
+        result["outputs"].append(workbook)
+
+        if charts:
+            image = f"{output_stem}_charts.png"
+            render_charts(report, image)
+            result["outputs"].append(image)
+
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def render_charts(report: dict, image_path: str):
+    """
+    Rasterizes the overview panels of a full report to an image with Agg (no GUI backend).
+
+    Args:
+        report (dict): Result of SalesAnalyzer.get_full_report().
+        image_path (str): Destination file (format from the extension, e.g. .png).
+    """
+    plots = SalesPlots(Figure(figsize=(15, 5), dpi=100))
+    panels = [
+        {
+            "key": name,
+            "data": report.get(name),
+            "chart_type": chart_type,
+            "title_suffix": title_suffix,
+            "color": color,
+            "rotate_x": rotate_x,
+        }
+        for name, chart_type, title_suffix, color, rotate_x in BatchReport.CHART_PANELS
+    ]
+    plots.draw_panels(panels, 1, len(panels))
+    plots.figure.savefig(image_path)
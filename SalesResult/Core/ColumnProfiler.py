@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+from Core.Dataset import Dataset
+from Core.StageProfiler import profiler
+
+
+class ColumnProfiler:
+    """
+    Summarizes every column of a dataset: nulls, distinct values, range, mean and most frequent values.
+
+    Each column is processed in one vectorized pass. Text, boolean and categorical
+    columns are dictionary-encoded once (pd.factorize); nulls, the exact distinct
+    count and the top values all come from the codes. Numeric columns get
+    min/max/mean/sum from NumPy reductions; their distinct count is exact for small
+    columns and for low-cardinality data, and otherwise estimated with a
+    k-minimum-values sketch over 64-bit hashes (no sort, no hash table of all values).
+
+    Results contain plain Python values only (int, float, str, bool), so they can be
+    displayed or serialized to JSON directly.
+    """
+
+    # Most frequent values reported per column
+    TOP_N = 5
+
+    # Numeric columns up to this many rows always get an exact distinct count
+    EXACT_ROWS = 100_000
+
+    # Estimated cardinality up to which numeric columns are counted exactly (with top values)
+    EXACT_DISTINCT = 10_000
+
+    # Hashes kept by the distinct-count sketch (relative error about 1 / sqrt(SKETCH_SIZE))
+    SKETCH_SIZE = 1024
+
+    def profile(self, df) -> dict:
+        """
+        Profiles every column of a dataset.
+
+        Args:
+            df (pd.DataFrame | Dataset): The data. With a Dataset the result is memoized
+                on the handle (key 'column_profile').
+
+        Returns:
+            dict: column -> statistics, see profile_column().
+        """
+        if isinstance(df, Dataset):
+            return df.derived('column_profile', lambda: self._profile(df))
+        return self._profile(df)
+
+    def _profile(self, df) -> dict:
+        """Internal helper profiling each column in turn."""
+        with profiler.span("ColumnProfiler.profile", len(df)):
+            columns = df.columns
+            get = df.column if isinstance(df, Dataset) else df.__getitem__
+            return {col: self.profile_column(get(col)) for col in columns}
+
+    def profile_column(self, values: pd.Series) -> dict:
+        """
+        Profiles a single column.
+
+        Args:
+            values (pd.Series): Column to profile.
+
+        Returns:
+            dict: 'dtype', 'count' (non-null values), 'nulls', 'distinct',
+                'distinct_approx' (True if estimated), 'min', 'max', 'mean', 'sum'
+                (None where not applicable) and 'top': a list of (value, count) pairs,
+                most frequent first (empty when the distinct count is estimated).
+        """
+        stats = {
+            "dtype": str(values.dtype),
+            "count": 0,
+            "nulls": 0,
+            "distinct": 0,
+            "distinct_approx": False,
+            "min": None,
+            "max": None,
+            "mean": None,
+            "sum": None,
+            "top": [],
+        }
+
+        if self._is_numeric(values):
+            self._numeric_stats(values, stats)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            self._datetime_stats(values, stats)
+        else:
+            self._dictionary_stats(values, stats)
+        return stats
+
+    def _numeric_stats(self, values: pd.Series, stats: dict) -> None:
+        """Internal helper: range, mean and sum via NumPy reductions; distinct exact or sketched."""
+        if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(values):
+            # Nullable integers (Int64, ...) stay integers – float64 would round above 2**53
+            data = values.dropna().to_numpy(dtype=values.dtype.numpy_dtype)
+        else:
+            data = values.to_numpy()
+        if data.dtype.kind not in "iu":
+            data = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            data = data[~np.isnan(data)]
+
+        stats["count"] = len(data)
+        stats["nulls"] = len(values) - len(data)
+        if not len(data):
+            return
+
+        stats["min"] = data.min().item()
+        stats["max"] = data.max().item()
+        stats["sum"] = int(data.sum(dtype=np.int64)) if data.dtype.kind in "iu" else float(data.sum())
+        stats["mean"] = stats["sum"] / len(data)
+
+        if len(data) > self.EXACT_ROWS:
+            estimate = self._estimate_distinct(data)
+            if estimate is not None and estimate > self.EXACT_DISTINCT:
+                stats["distinct"] = min(int(round(estimate)), len(data))
+                stats["distinct_approx"] = True
+                return
+
+        codes, uniques = pd.factorize(data)
+        self._count_codes(codes, uniques, stats)
+
+    def _datetime_stats(self, values: pd.Series, stats: dict) -> None:
+        """Internal helper: datetime range (ISO text) plus the dictionary statistics."""
+        valid = values.dropna()
+        if len(valid):
+            stats["min"] = valid.min().isoformat()
+            stats["max"] = valid.max().isoformat()
+        self._dictionary_stats(values, stats)
+        stats["top"] = [(pd.Timestamp(value).isoformat(), count) for value, count in stats["top"]]
+
+    def _dictionary_stats(self, values: pd.Series, stats: dict) -> None:
+        """Internal helper: nulls, exact distinct count and top values from one factorize pass."""
+        codes, uniques = pd.factorize(values)
+        stats["nulls"] = int((codes < 0).sum())
+        stats["count"] = len(values) - stats["nulls"]
+        self._count_codes(codes, uniques, stats)
+
+    def _count_codes(self, codes: np.ndarray, uniques, stats: dict) -> None:
+        """Internal helper deriving the distinct count and the top values from dictionary codes."""
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        stats["distinct"] = len(uniques)
+
+        top = min(self.TOP_N, len(counts))
+        if not top:
+            return
+
+        if len(counts) > top:
+            # Every value above the top-th count, then the earliest codes tied with it
+            threshold = np.partition(counts, len(counts) - top)[len(counts) - top]
+            above = np.flatnonzero(counts > threshold)
+            tied = np.flatnonzero(counts == threshold)[:top - len(above)]
+            candidates = np.concatenate([above, tied])
+        else:
+            candidates = np.arange(len(counts))
+        # Most frequent first; ties keep the order of first appearance (factorize code order)
+        order = candidates[np.lexsort((candidates, -counts[candidates]))]
+        stats["top"] = [(self._plain(uniques[i]), int(counts[i])) for i in order]
+
+    def _estimate_distinct(self, data: np.ndarray):
+        """
+        Internal helper estimating the number of distinct values (k-minimum-values sketch).
+
+        Returns None when the smallest hashes repeat so much that the column clearly
+        has few distinct values (the caller then counts exactly).
+        """
+        hashes = pd.util.hash_array(data)
+        take = min(4 * self.SKETCH_SIZE, len(hashes))
+        smallest = np.unique(np.partition(hashes, take - 1)[:take])
+        if len(smallest) < self.SKETCH_SIZE:
+            return None
+
+        kth = float(smallest[self.SKETCH_SIZE - 1]) + 1.0
+        return (self.SKETCH_SIZE - 1) * 2.0 ** 64 / kth
+
+    def _plain(self, value):
+        """Internal helper converting NumPy / pandas scalars to plain Python values."""
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _is_numeric(self, values: pd.Series) -> bool:
+        """Internal helper; booleans are profiled like text (top values True/False)."""
+        return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+
+class CronSchedule:
+    """
+    A cron-style schedule: "minute hour day-of-month month day-of-week".
+
+    Each field accepts '*', numbers, ranges ('1-5'), lists ('0,30') and steps
+    ('*/15', '8-18/2'). Day of week is 0-6 with 0 = Sunday (7 is accepted as
+    Sunday too). As in cron, when both day fields are restricted a day matches
+    if either of them does. The aliases @hourly, @daily, @weekly and @monthly
+    are supported as well.
+    """
+
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+
+    # (name, lowest, highest) of the five fields
+    FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+    def __init__(self, expression: str):
+        """
+        Args:
+            expression (str): Cron expression or alias, e.g. "0 * * * *" or "@hourly".
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        self.expression = expression.strip()
+        fields = self.ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != len(self.FIELDS):
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+
+        parsed = [self._parse_field(text, low, high, name) for text, (name, low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def matches(self, moment: datetime) -> bool:
+        """True if the schedule fires in the minute containing `moment`."""
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        The first minute strictly after `moment` at which the schedule fires.
+
+        Raises:
+            ValueError: If the schedule never fires (e.g. "0 0 31 2 *").
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=4 * 366)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=candidate.year + (month == 1), month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Internal helper applying cron's day-of-month / day-of-week rule."""
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def _parse_field(self, text: str, low: int, high: int, name: str) -> set:
+        """Internal helper expanding one field into the set of values it allows."""
+        values = set()
+        for part in text.split(","):
+            body, _, step = part.partition("/")
+            try:
+                step = int(step) if step else 1
+                if body == "*":
+                    start, stop = low, high
+                elif "-" in body:
+                    start, stop = (int(value) for value in body.split("-", 1))
+                else:
+                    start = stop = int(body)
+            except ValueError:
+                raise ValueError(f"Invalid {name} field in cron expression: '{text}'") from None
+
+            if step < 1 or start < low or stop > high or start > stop:
+                raise ValueError(f"Invalid {name} field in cron expression: '{text}'")
+            values.update(range(start, stop + 1, step))
+        return values
@@ -1,25 +1,147 @@
+import csv
+import os
+
 import pandas as pd
 
+from Core.BackgroundJobs import JobCancelled
+from Core.NumericParser import NumericParser
+from Core.StageProfiler import profiler
+
 class CsvImport:
     """
     Handles data ingestion from CSV sources with robust format detection.
     """
 
-    def load(self, path: str) -> pd.DataFrame:
+    # Bytes read from the start of the file to detect the field separator
+    SNIFF_BYTES = 64 * 1024
+
+    # Rows parsed per chunk; progress and cancellation are checked between chunks
+    CHUNK_ROWS = 250_000
+
+    # Separators considered by the sniffer
+    DELIMITERS = ",;\t|"
+
+    # Columns converted from locale-formatted text ("1 234,56 zł", "$1,234.56") to numbers
+    NUMERIC_COLUMNS = ("Revenue", "Customer_Age")
+
+    def load(self, path: str, progress=None, cancel_event=None) -> pd.DataFrame:
         """
         Loads a CSV file into a pandas DataFrame.
 
-        This method uses the Python parsing engine to automatically infer the 
-        field separator (e.g., comma, semicolon, tab) based on the file content.
+        The field separator (e.g., comma, semicolon, tab) is inferred from a sample
+        at the start of the file, after which the fast C parsing engine reads the
+        file in chunks. Numeric columns written with locale-specific separators or
+        currency symbols (see NUMERIC_COLUMNS) are then converted to numbers.
 
         Args:
             path (str): The absolute or relative file path to the CSV dataset.
+            progress (callable, optional): Receives the fraction (0.0-1.0) of the
+                file parsed so far, after each chunk.
+            cancel_event (threading.Event, optional): When set, parsing stops
+                before the next chunk.
 
         Returns:
             pd.DataFrame: A DataFrame containing the loaded data.
-        
+
         Raises:
             FileNotFoundError: If the provided path does not exist.
             pd.errors.ParserError: If the file content cannot be parsed.
+            JobCancelled: If cancel_event was set during parsing.
+        """
+        with profiler.span("CsvImport.sniff"):
+            sep = self.sniff(path)
+        total_bytes = os.path.getsize(path) or 1
+
+        with profiler.span("CsvImport.parse") as span:
+            df = self._parse(path, sep, total_bytes, progress, cancel_event)
+            span.set_rows(len(df))
+
+        with profiler.span("CsvImport.normalize", len(df)):
+            return self._normalize_numeric(df)
+
+    def load_many(self, paths: list, deduplicator=None, progress=None, cancel_event=None) -> pd.DataFrame:
         """
-        return pd.read_csv(path, sep=None, engine='python')
\ No newline at end of file
+        Loads several CSV files (e.g., overlapping regional exports) into one DataFrame.
+
+        Files are parsed one after another with load(). With a deduplicator, each
+        file is deduplicated against itself and every earlier file as soon as it
+        is parsed, so repeated rows are never accumulated.
+
+        Args:
+            paths (list): CSV files, in the order their rows should appear.
+            deduplicator (RowDeduplicator, optional): Drops repeated rows; its
+                'removed' counter reports how many.
+            progress (callable, optional): Receives the overall fraction (0.0-1.0) loaded.
+            cancel_event (threading.Event, optional): When set, loading stops before the next chunk.
+
+        Returns:
+            pd.DataFrame: Rows of all files (columns missing in some files are filled with NaN).
+
+        Raises:
+            FileNotFoundError: If one of the paths does not exist.
+            JobCancelled: If cancel_event was set.
+        """
+        frames = []
+        for i, path in enumerate(paths):
+            file_progress = None
+            if progress is not None:
+                file_progress = lambda fraction, i=i: progress((i + fraction) / len(paths))
+
+            df = self.load(path, progress=file_progress, cancel_event=cancel_event)
+            if deduplicator is not None:
+                df = deduplicator.drop_duplicates(df)
+            frames.append(df)
+
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _normalize_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Internal helper converting text NUMERIC_COLUMNS to numeric dtypes (vectorized)."""
+        parser = NumericParser()
+        for col in self.NUMERIC_COLUMNS:
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = parser.normalize(df[col])
+        return df
+
+    def _parse(self, path: str, sep: str, total_bytes: int, progress, cancel_event) -> pd.DataFrame:
+        """Internal helper reading the file in chunks with the C engine."""
+        chunks = []
+        with open(path, "rb") as handle:
+            reader = pd.read_csv(handle, sep=sep, chunksize=self.CHUNK_ROWS)
+            for chunk in reader:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise JobCancelled()
+
+                chunks.append(chunk)
+
+                if progress is not None:
+                    progress(min(handle.tell() / total_bytes, 1.0))
+
+        if not chunks:
+            return pd.read_csv(path, sep=sep)
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
+
+    def sniff(self, path: str) -> str:
+        """
+        Detects the field separator from the first lines of the file.
+
+        Args:
+            path (str): The file path to inspect.
+
+        Returns:
+            str: The detected separator, or "," if it cannot be determined.
+        """
+        with open(path, "r", encoding="utf-8", errors="replace", newline="") as handle:
+            sample = handle.read(self.SNIFF_BYTES)
+
+        # Drop a trailing partial line so it does not confuse the sniffer
+        if len(sample) == self.SNIFF_BYTES and "\n" in sample:
+            sample = sample[:sample.rfind("\n")]
+
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=self.DELIMITERS).delimiter
+        except csv.Error:
+            return ","
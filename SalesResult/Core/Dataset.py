@@ -0,0 +1,219 @@
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class Dataset:
+    """
+    Immutable, versioned handle over imported sales data, shared by every view.
+
+    The wrapped DataFrame is never modified. Anything derived from it (age
+    buckets, the full report, sort indexes, ...) is memoized on the handle with
+    derived(), so every cache is tied to exactly one version of the data and is
+    released together with it. A new import produces a new handle with a new
+    version id, which is what views compare to discard stale results.
+
+    Filtered views (filter()/where()) share the parent's frame and only store the
+    selected row positions; columns are gathered on demand, one at a time, so a
+    view never copies columns it does not use. Deferred datasets (deferred()) know
+    their shape up front and read the frame only when something first needs it.
+    """
+
+    _versions = itertools.count(1)
+
+    def __init__(self, frame: pd.DataFrame, name: str = None, source: str = None):
+        """
+        Args:
+            frame (pd.DataFrame): The data. Must not be modified after wrapping.
+            name (str, optional): Display name (e.g., the file name).
+            source (str, optional): Where the data came from (file path, library id, ...).
+        """
+        self.version = next(self._versions)
+        self.name = name
+        self.source = source
+
+        self._base = frame
+        self._positions = None
+        self._memo = {}
+        self._lock = threading.Lock()
+
+        # Deferred datasets: produces the frame on first access (see deferred())
+        self._loader = None
+        self._load_lock = threading.Lock()
+        self._shape = None
+
+    @classmethod
+    def deferred(cls, loader, columns, rows: int, name: str = None, source: str = None) -> "Dataset":
+        """
+        Creates a full dataset whose frame is read by `loader` on first access.
+
+        Columns and row count are known without loading, so the handle can be shown
+        and aggregates computed elsewhere (e.g. SQL) can be memoized on it up front.
+
+        Args:
+            loader (callable): Called once, without arguments, to produce the DataFrame.
+            columns: Column labels of the data.
+            rows (int): Number of rows.
+            name (str, optional): Display name.
+            source (str, optional): Where the data comes from.
+
+        Returns:
+            Dataset: A new handle (new version id); is_loaded is False until the frame is read.
+        """
+        dataset = cls(None, name, source)
+        dataset._loader = loader
+        dataset._shape = (pd.Index(columns), int(rows))
+        return dataset
+
+    @property
+    def is_loaded(self) -> bool:
+        """False for a deferred dataset whose frame has not been read yet."""
+        return self._base is not None
+
+    def _loaded_base(self) -> pd.DataFrame:
+        """Internal helper returning the wrapped frame, reading a deferred one first (once)."""
+        if self._base is None:
+            with self._load_lock:
+                if self._base is None:
+                    self._base = self._loader()
+                    self._loader = None
+        return self._base
+
+    @property
+    def columns(self) -> pd.Index:
+        """Column labels of the data."""
+        if self._base is None:
+            return self._shape[0]
+        return self._base.columns
+
+    @property
+    def is_view(self) -> bool:
+        """True for handles created by filter()/where()."""
+        return self._positions is not None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        The data as a DataFrame.
+
+        For a full dataset this is the wrapped frame itself (no copy). For a view
+        the selected rows are gathered once, on first access, and memoized.
+        """
+        if self._positions is None:
+            return self._loaded_base()
+        return self.derived("frame", lambda: self._base.take(self._positions))
+
+    def __len__(self) -> int:
+        if self._positions is not None:
+            return len(self._positions)
+        return self._shape[1] if self._base is None else len(self._base)
+
+    def column(self, name: str) -> pd.Series:
+        """
+        A single column of the data (gathered and memoized for views).
+
+        Args:
+            name (str): Column label.
+
+        Returns:
+            pd.Series: The column; views keep the original row labels.
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        if self._positions is None:
+            return self._loaded_base()[name]
+        return self.derived(("column", name), lambda: self._base[name].take(self._positions))
+
+    def derived(self, key, factory):
+        """
+        Returns a value computed from this version of the data, computing it on first use.
+
+        Safe to call from worker threads. If two threads race on the same key the
+        value may be computed twice, but both receive the one that was stored first.
+
+        Args:
+            key: Hashable memo key (e.g., "full_report").
+            factory (callable): Called without arguments to compute the value.
+
+        Returns:
+            The memoized value. Callers must treat it as read-only.
+        """
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+
+        value = factory()
+
+        with self._lock:
+            return self._memo.setdefault(key, value)
+
+    def cached(self, key, default=None):
+        """
+        Returns a memoized value without computing it.
+
+        Args:
+            key: Memo key used with derived().
+            default: Returned when nothing is memoized under the key.
+        """
+        with self._lock:
+            return self._memo.get(key, default)
+
+    def memoized(self) -> dict:
+        """
+        Returns a snapshot of everything memoized with derived() (key -> value).
+        """
+        with self._lock:
+            return dict(self._memo)
+
+    def relocate(self, frame: pd.DataFrame, memo: dict = None) -> None:
+        """
+        Moves the data to different storage, e.g. a memory-mapped copy on disk.
+
+        The values do not change, so the version id stays the same; only memoized
+        data that still refers to the old storage has to go. Views created earlier
+        keep reading the old frame.
+
+        Args:
+            frame (pd.DataFrame): Data equal to the current frame (same rows, order and columns).
+            memo (dict, optional): Memoized values to keep; everything else is recomputed on demand.
+
+        Raises:
+            ValueError: For views, which do not own their storage.
+        """
+        if self._positions is not None:
+            raise ValueError("Only full datasets can be relocated.")
+
+        with self._lock:
+            self._base = frame
+            self._memo = dict(memo or {})
+
+    def filter(self, mask) -> "Dataset":
+        """
+        Creates a zero-copy view with the rows where `mask` is True.
+
+        Args:
+            mask: Boolean array-like with one entry per row of this dataset.
+
+        Returns:
+            Dataset: A new handle (new version id) sharing this dataset's frame.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != len(self):
+            raise ValueError(f"Mask has {len(mask)} entries, dataset has {len(self)} rows.")
+
+        positions = np.flatnonzero(mask)
+        if self._positions is not None:
+            positions = self._positions[positions]
+
+        view = Dataset(self._loaded_base(), self.name, self.source)
+        view._positions = positions
+        return view
+
+    def where(self, column: str, values) -> "Dataset":
+        """
+        Creates a zero-copy view with the rows whose `column` value is one of `values`.
+        """
+        return self.filter(self.column(column).isin(values).to_numpy())
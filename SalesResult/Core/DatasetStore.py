@@ -0,0 +1,376 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from Core.BackgroundJobs import JobCancelled
+from Core.SalesAnalyzer import SalesAnalyzer
+from Core.StageProfiler import profiler
+
+
+class DatasetStore:
+    """
+    Persists imported datasets in a local SQLite database so they survive between sessions.
+
+    Every dataset is written once, in bulk, into its own table (batched executemany
+    inside a single transaction) with indexes on the grouping columns. Revenue
+    breakdowns are then answered by indexed SQL GROUP BY queries without loading
+    the table into pandas, and previews page through rows by rowid (keyset
+    pagination), which costs the same for the first and the millionth page.
+    """
+
+    # Default database location (per user, outside the project folder)
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".salesresult", "datasets.sqlite3")
+
+    # Rows bound per executemany() call; progress and cancellation are checked between batches
+    BATCH_ROWS = 50_000
+
+    # Covering indexes for the SalesAnalyzer dimensions: GROUP BY queries read only the index,
+    # never the table. Columns missing from a dataset are left out (the leading one must exist).
+    INDEXES = (
+        ("Product_Category", "Country", "Revenue"),
+        ("Country", "Revenue"),
+        ("Customer_Age", "Revenue"),
+    )
+
+    def __init__(self, db_path: str = None):
+        """
+        Args:
+            db_path (str, optional): SQLite database file. Defaults to DEFAULT_PATH.
+        """
+        self.db_path = db_path or self.DEFAULT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS datasets ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " source_path TEXT,"
+                " rows INTEGER NOT NULL,"
+                " columns TEXT NOT NULL,"
+                " created_at TEXT NOT NULL)"
+            )
+
+    def save(self, df: pd.DataFrame, name: str, source_path: str = None,
+             progress=None, cancel_event=None) -> int:
+        """
+        Stores a DataFrame as a new dataset.
+
+        Args:
+            df (pd.DataFrame): Data to store.
+            name (str): Display name of the dataset.
+            source_path (str, optional): File the data was imported from.
+            progress (callable, optional): Receives the fraction (0.0-1.0) written after each batch.
+            cancel_event (threading.Event, optional): When set, the write is rolled back
+                before the next batch.
+
+        Returns:
+            int: The new dataset id.
+
+        Raises:
+            JobCancelled: If cancel_event was set; nothing is stored in that case.
+        """
+        columns = [str(col) for col in df.columns]
+        dtypes = [self._sql_type(df[col]) for col in df.columns]
+
+        with profiler.span("DatasetStore.save", len(df)), self._connect() as conn:
+            try:
+                conn.execute("BEGIN")
+                cursor = conn.execute(
+                    "INSERT INTO datasets (name, source_path, rows, columns, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (name, source_path, len(df),
+                     json.dumps([[col, str(df[col].dtype)] for col in df.columns]),
+                     datetime.now().isoformat(timespec="seconds")),
+                )
+                dataset_id = cursor.lastrowid
+                table = self._table(dataset_id)
+
+                definition = ", ".join(f"{self._quote(col)} {sql}" for col, sql in zip(columns, dtypes))
+                conn.execute(f"CREATE TABLE {table} ({definition})")
+
+                insert = f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})"
+                for start in range(0, len(df), self.BATCH_ROWS):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise JobCancelled()
+
+                    conn.executemany(insert, self._batch_rows(df.iloc[start:start + self.BATCH_ROWS]))
+
+                    if progress is not None:
+                        progress(min((start + self.BATCH_ROWS) / len(df), 1.0))
+
+                # Indexes are built once after the bulk load (cheaper than maintaining them per row)
+                for index in self.INDEXES:
+                    if index[0] in columns:
+                        indexed = ", ".join(self._quote(col) for col in index if col in columns)
+                        conn.execute(f"CREATE INDEX {table}_{index[0].lower()} ON {table} ({indexed})")
+
+                conn.execute("COMMIT")
+                return dataset_id
+
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def list(self) -> list:
+        """
+        Lists stored datasets, newest first.
+
+        Returns:
+            list: Dicts with 'id', 'name', 'source_path', 'rows', 'columns' and 'created_at'.
+        """
+        with self._connect() as conn:
+            records = conn.execute(
+                "SELECT id, name, source_path, rows, columns, created_at FROM datasets ORDER BY id DESC"
+            ).fetchall()
+
+        return [
+            {
+                "id": record[0],
+                "name": record[1],
+                "source_path": record[2],
+                "rows": record[3],
+                "columns": [col for col, _ in json.loads(record[4])],
+                "created_at": record[5],
+            }
+            for record in records
+        ]
+
+    def delete(self, dataset_id: int):
+        """Removes a dataset and its table."""
+        with self._connect() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {self._table(dataset_id)}")
+            conn.execute("DELETE FROM datasets WHERE id = ?", (dataset_id,))
+
+    def load(self, dataset_id: int) -> pd.DataFrame:
+        """
+        Reads a whole dataset back into a DataFrame (original column order and dtypes).
+
+        Args:
+            dataset_id (int): Id returned by save().
+
+        Returns:
+            pd.DataFrame: The stored data.
+
+        Raises:
+            KeyError: If no dataset has this id.
+        """
+        columns = self._columns(dataset_id)
+        with profiler.span("DatasetStore.load") as span, self._connect() as conn:
+            df = pd.read_sql_query(f"SELECT * FROM {self._table(dataset_id)} ORDER BY rowid", conn)
+            span.set_rows(len(df))
+
+        for col, dtype in columns:
+            if dtype == "bool":
+                df[col] = df[col].astype(bool)
+            elif dtype.startswith("datetime64"):
+                df[col] = pd.to_datetime(df[col])
+        return df
+
+    def table(self, dataset_id: int) -> "StoredTable":
+        """
+        Opens a paged, read-only view of a dataset for previews.
+
+        Args:
+            dataset_id (int): Id returned by save().
+
+        Returns:
+            StoredTable: Row source fetching pages on demand.
+        """
+        return StoredTable(self, dataset_id)
+
+    # ------------------------------------------------------------------ SQL aggregations
+
+    def get_category_share(self, dataset_id: int) -> pd.Series:
+        """Revenue per product category (same result as SalesAnalyzer.get_category_share)."""
+        return self._group_share(dataset_id, "Product_Category")
+
+    def get_country_share(self, dataset_id: int) -> pd.Series:
+        """Revenue per country (same result as SalesAnalyzer.get_country_share)."""
+        return self._group_share(dataset_id, "Country")
+
+    def get_age_group_share(self, dataset_id: int) -> pd.Series:
+        """
+        Revenue per standard age bucket (same buckets as SalesAnalyzer).
+
+        Returns:
+            pd.Series: Revenue sum indexed by age group; empty if 'Customer_Age' is missing.
+        """
+        if "Customer_Age" not in [col for col, _ in self._columns(dataset_id)]:
+            return pd.Series(dtype=float)
+
+        # Only ~100 distinct ages: group by age on the index, then bucket the small result
+        with profiler.span("DatasetStore.get_age_group_share"), self._connect() as conn:
+            per_age = pd.read_sql_query(
+                f"SELECT \"Customer_Age\" AS age, SUM(\"Revenue\") AS revenue FROM {self._table(dataset_id)} "
+                f"WHERE \"Customer_Age\" IS NOT NULL GROUP BY \"Customer_Age\"",
+                conn,
+            )
+
+        buckets = pd.cut(per_age["age"], bins=SalesAnalyzer.AGE_BINS, labels=SalesAnalyzer.AGE_LABELS)
+        shares = per_age["revenue"].groupby(buckets.rename("Age Group"), observed=True).sum()
+        return shares.astype(float).rename("Revenue")
+
+    def calculate_total_revenue(self, dataset_id: int) -> float:
+        """Sum of all revenue entries."""
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT SUM(\"Revenue\") FROM {self._table(dataset_id)}").fetchone()[0]
+        return float(total or 0.0)
+
+    def get_full_report(self, dataset_id: int) -> dict:
+        """
+        Computes the same sections as SalesAnalyzer.get_full_report with SQL GROUP BY queries.
+
+        Returns:
+            dict: "Category", "Country", "Age Group" (pd.Series) and "Category x Country"
+                  (pd.DataFrame); sections whose source column is missing are omitted.
+        """
+        columns = [col for col, _ in self._columns(dataset_id)]
+        if "Revenue" not in columns:
+            return {}
+
+        report = {}
+        if "Product_Category" in columns:
+            report["Category"] = self.get_category_share(dataset_id).rename_axis("Category")
+        if "Country" in columns:
+            report["Country"] = self.get_country_share(dataset_id).rename_axis("Country")
+        if "Customer_Age" in columns:
+            report["Age Group"] = self.get_age_group_share(dataset_id)
+
+        if "Product_Category" in columns and "Country" in columns:
+            with self._connect() as conn:
+                cells = pd.read_sql_query(
+                    f"SELECT \"Product_Category\" AS Category, \"Country\", SUM(\"Revenue\") AS Revenue "
+                    f"FROM {self._table(dataset_id)} GROUP BY \"Product_Category\", \"Country\"",
+                    conn,
+                )
+            report["Category x Country"] = (
+                cells.dropna(subset=["Category", "Country"])
+                .set_index(["Category", "Country"])["Revenue"]
+                .unstack(fill_value=0)
+            )
+
+        return report
+
+    # ------------------------------------------------------------------ helpers
+
+    def _group_share(self, dataset_id: int, column: str) -> pd.Series:
+        """Internal helper: SUM(Revenue) GROUP BY one column, served by the column index."""
+        with profiler.span(f"DatasetStore.group_by {column}"), self._connect() as conn:
+            records = conn.execute(
+                f"SELECT {self._quote(column)}, SUM(\"Revenue\") FROM {self._table(dataset_id)} "
+                f"WHERE {self._quote(column)} IS NOT NULL "
+                f"GROUP BY {self._quote(column)} ORDER BY {self._quote(column)}"
+            ).fetchall()
+
+        return pd.Series([total for _, total in records], index=pd.Index([key for key, _ in records], name=column),
+                         name="Revenue", dtype=float)
+
+    def _columns(self, dataset_id: int) -> list:
+        """Internal helper returning [(column, pandas dtype), ...] of a dataset."""
+        with self._connect() as conn:
+            record = conn.execute("SELECT columns FROM datasets WHERE id = ?", (dataset_id,)).fetchone()
+        if record is None:
+            raise KeyError(f"Unknown dataset id {dataset_id}.")
+        return [tuple(item) for item in json.loads(record[0])]
+
+    def _batch_rows(self, chunk: pd.DataFrame):
+        """Internal helper converting a chunk to Python rows (missing values -> NULL)."""
+        columns = []
+        for col in chunk.columns:
+            series = chunk[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = series.dt.strftime("%Y-%m-%dT%H:%M:%S")
+            if series.dtype.kind == "f":
+                # SQLite stores NaN as NULL on its own; tolist() already yields Python floats
+                columns.append(series.tolist())
+            else:
+                columns.append(series.astype(object).where(series.notna(), None).tolist())
+        return zip(*columns)
+
+    def _sql_type(self, series: pd.Series) -> str:
+        """Internal helper mapping a pandas dtype onto an SQLite column type."""
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(series):
+            return "REAL"
+        return "TEXT"
+
+    def _table(self, dataset_id: int) -> str:
+        """Internal helper returning the table name of a dataset."""
+        return f"dataset_{int(dataset_id)}"
+
+    def _quote(self, name: str) -> str:
+        """Internal helper quoting an SQL identifier."""
+        return '"' + str(name).replace('"', '""') + '"'
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Internal helper opening a connection. Connections are short-lived and per call,
+        so the store can be used from worker threads; WAL lets readers run during a write.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return _ClosingConnection(conn)
+
+
+class StoredTable:
+    """
+    Read-only row source over a stored dataset, fetching pages by rowid (keyset pagination).
+
+    Rows are inserted once in order, so rowid = position + 1 and a page starting
+    at any position is a single index seek. The connection is bound to the thread
+    that created the table (use it from the UI thread only).
+    """
+
+    def __init__(self, store: DatasetStore, dataset_id: int):
+        """
+        Args:
+            store (DatasetStore): The owning store.
+            dataset_id (int): Id of the dataset to page through.
+        """
+        self.dataset_id = dataset_id
+        self.columns = [col for col, _ in store._columns(dataset_id)]
+        self._table = store._table(dataset_id)
+        self._conn = sqlite3.connect(store.db_path)
+
+        self._rows = self._conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def fetch(self, start: int, count: int) -> list:
+        """
+        Returns `count` rows starting at position `start` (0-based) as tuples.
+        """
+        return self._conn.execute(
+            f"SELECT * FROM {self._table} WHERE rowid > ? ORDER BY rowid LIMIT ?", (int(start), int(count))
+        ).fetchall()
+
+    def head(self, count: int) -> pd.DataFrame:
+        """Returns the first `count` rows as a DataFrame (e.g. to size preview columns)."""
+        return pd.DataFrame(self.fetch(0, count), columns=self.columns)
+
+    def close(self):
+        """Closes the underlying connection."""
+        self._conn.close()
+
+
+class _ClosingConnection:
+    """Context manager closing an sqlite3 connection on exit (sqlite3's own only ends transactions)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.close()
+        return False
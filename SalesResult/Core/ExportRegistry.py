@@ -0,0 +1,75 @@
+import os
+
+from Core.XlsxExport import XlsxExport
+from Core.FastExport import ArrowIpcExport, CsvExport, JsonLinesExport, ParquetExport
+
+
+class ExportRegistry:
+    """
+    Maps file extensions onto exporter instances sharing the `save(data, path) -> (bool, str)` contract.
+    """
+
+    def __init__(self):
+        # extension -> (label, exporter, supports_rows)
+        self._formats = {}
+
+    @classmethod
+    def default(cls) -> "ExportRegistry":
+        """
+        Builds the registry with every built-in format.
+
+        Returns:
+            ExportRegistry: Registry with Excel, CSV, Parquet, JSON Lines and Arrow IPC writers.
+        """
+        registry = cls()
+        registry.register(".xlsx", "Excel files", XlsxExport(), supports_rows=False)
+        registry.register(".csv", "CSV files", CsvExport())
+        registry.register(".parquet", "Parquet files", ParquetExport())
+        registry.register(".jsonl", "JSON Lines files", JsonLinesExport())
+        registry.register(".arrow", "Arrow IPC files", ArrowIpcExport())
+        return registry
+
+    def register(self, extension: str, label: str, exporter, supports_rows: bool = True):
+        """
+        Adds (or replaces) the exporter used for a file extension.
+
+        Args:
+            extension (str): File extension including the dot, e.g. ".csv".
+            label (str): Description shown in file dialogs.
+            exporter: Object exposing `save(data, file_path, progress=None, cancel_event=None)`.
+            supports_rows (bool): Whether the exporter accepts raw rows (pd.DataFrame)
+                in addition to aggregates (pd.Series).
+        """
+        self._formats[extension.lower()] = (label, exporter, supports_rows)
+
+    def exporter_for(self, file_path: str, rows: bool = False):
+        """
+        Resolves the exporter for a destination path by its extension.
+
+        Args:
+            file_path (str): The destination path.
+            rows (bool): True when exporting raw rows rather than an aggregate.
+
+        Returns:
+            The matching exporter, or None if the extension is not supported.
+        """
+        entry = self._formats.get(os.path.splitext(file_path)[1].lower())
+        if entry is None or (rows and not entry[2]):
+            return None
+        return entry[1]
+
+    def filetypes(self, rows: bool = False) -> list:
+        """
+        Builds the `filetypes` list for Tk file dialogs.
+
+        Args:
+            rows (bool): True to list only formats that can hold raw rows.
+
+        Returns:
+            list: (label, pattern) tuples in registration order.
+        """
+        return [
+            (label, f"*{extension}")
+            for extension, (label, _, supports_rows) in self._formats.items()
+            if supports_rows or not rows
+        ]
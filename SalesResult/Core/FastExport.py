@@ -0,0 +1,156 @@
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from Core.BackgroundJobs import JobCancelled
+
+
+class TabularExport(ABC):
+    """
+    Base class for lightweight, machine-readable exporters (aggregates and raw rows).
+
+    Subclasses implement `_write`, which consumes the data as a stream of row
+    chunks. Chunking lets every format report progress and honour cancellation
+    the same way XlsxExport does, without ever building the whole output in memory.
+    """
+
+    # Rows per chunk handed to the format writer
+    CHUNK_ROWS = 250_000
+
+    def save(self, data, file_path: str, progress=None, cancel_event=None) -> tuple[bool, str]:
+        """
+        Exports an aggregate (pd.Series) or raw rows (pd.DataFrame) to file_path.
+
+        Args:
+            data (pd.Series | pd.DataFrame): The data to export. A Series is written
+                as two columns: its index labels and its values.
+            file_path (str): The destination path.
+            progress (callable, optional): Receives the completed fraction (0.0-1.0).
+            cancel_event (threading.Event, optional): When set, the export stops
+                before the next chunk.
+
+        The format writer fills a temporary file next to file_path, which replaces
+        file_path only once it is complete: a cancelled or failed export leaves an
+        existing file untouched and no truncated output behind.
+
+        Returns:
+            tuple[bool, str]: A tuple containing:
+                - Success flag (True/False)
+                - Status message or error description
+        """
+        root, ext = os.path.splitext(file_path)
+        tmp_path = f"{root}.tmp{ext}"
+        try:
+            frame = self._to_frame(data)
+            self._write(frame, self._chunks(frame, progress, cancel_event), tmp_path)
+            os.replace(tmp_path, file_path)
+            return True, "File saved successfully."
+
+        except JobCancelled:
+            return False, "Export cancelled."
+
+        except Exception as e:
+            return False, str(e)
+
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @abstractmethod
+    def _write(self, frame: pd.DataFrame, chunks, file_path: str):
+        """
+        Writes the chunk stream to file_path. Implemented by subclasses.
+
+        frame is the whole table the chunks are sliced from, so formats with a
+        fixed schema can derive it from every row rather than the first chunk.
+        """
+
+    def _to_frame(self, data) -> pd.DataFrame:
+        """Internal helper turning an aggregate Series into a two-column table."""
+        if isinstance(data, pd.DataFrame):
+            return data
+
+        value_name = str(data.name) if data.name else "Value"
+        label_name = str(data.index.name) if data.index.name else "Label"
+        return data.rename(value_name).rename_axis(label_name).reset_index()
+
+    def _chunks(self, frame: pd.DataFrame, progress, cancel_event):
+        """Internal generator yielding row slices while tracking progress and cancellation."""
+        total = len(frame)
+        if total == 0:
+            yield frame
+            return
+
+        for start in range(0, total, self.CHUNK_ROWS):
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelled()
+
+            yield frame.iloc[start:start + self.CHUNK_ROWS]
+
+            if progress is not None:
+                progress(min(start + self.CHUNK_ROWS, total) / total)
+
+    def _require_pyarrow(self, format_name: str):
+        """Internal helper importing the optional pyarrow dependency."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(f"{format_name} export requires the 'pyarrow' package.") from None
+        return pa
+
+
+class CsvExport(TabularExport):
+    """
+    Writes data as comma-separated text (UTF-8, header row, no index).
+    """
+
+    def _write(self, frame: pd.DataFrame, chunks, file_path: str):
+        with open(file_path, "w", encoding="utf-8", newline="") as handle:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(handle, index=False, header=(i == 0))
+
+
+class JsonLinesExport(TabularExport):
+    """
+    Writes data as JSON Lines: one JSON object per row.
+    """
+
+    def _write(self, frame: pd.DataFrame, chunks, file_path: str):
+        with open(file_path, "w", encoding="utf-8") as handle:
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                text = chunk.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+                handle.write(text if text.endswith("\n") else text + "\n")
+
+
+class ParquetExport(TabularExport):
+    """
+    Writes data as an Apache Parquet file (one row group per chunk). Requires pyarrow.
+    """
+
+    def _write(self, frame: pd.DataFrame, chunks, file_path: str):
+        pa = self._require_pyarrow("Parquet")
+        import pyarrow.parquet as pq
+
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        with pq.ParquetWriter(file_path, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+class ArrowIpcExport(TabularExport):
+    """
+    Writes data as an Arrow IPC (Feather v2) file. Requires pyarrow.
+    """
+
+    def _write(self, frame: pd.DataFrame, chunks, file_path: str):
+        pa = self._require_pyarrow("Arrow IPC")
+
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        with pa.ipc.new_file(file_path, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
@@ -0,0 +1,235 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from Core.CsvImport import CsvImport
+from Core.Dataset import Dataset
+from Core.NumericParser import NumericParser
+from Core.StageProfiler import profiler
+
+
+class LookupEnricher:
+    """
+    Joins small lookup tables (CSV) onto a dataset: category remapping, currency conversion, ...
+
+    Each step looks the values of one dataset column up in a key column of a
+    lookup table. The dataset column is dictionary-encoded once (pd.factorize,
+    or the codes of a categorical column), only its distinct keys are matched
+    against the table (Index.get_indexer), and the result is expanded to all rows
+    with a single integer take. No row-wise apply and no merge: the other columns
+    of the dataset are never copied.
+
+    Steps (dicts, e.g. from an enrichment file, see from_file()):
+        table (str):     Lookup CSV path (relative paths are resolved against the file).
+        key (str):       Key column in the table.
+        on (str):        Dataset column holding the keys. Defaults to `key`.
+        value (str):     Table column to fetch. Defaults to the table's only non-key column.
+        target (str):    Dataset column to write (added or replaced). Defaults to `value`,
+                         or to `convert` for conversions.
+        convert (str):   Optional numeric dataset column multiplied by the fetched value
+                         (e.g. 'Revenue' by an FX rate) instead of storing the value itself.
+        default:         Optional value used for keys missing from the table (else null).
+
+    Text keys are compared without surrounding whitespace; a number and its text
+    form ("7" vs 7) match. When a key repeats in a table, its first row wins.
+    """
+
+    # Keys listed per step in `unmatched` (the count covers all of them)
+    UNMATCHED_SAMPLES = 5
+
+    def __init__(self, steps: list, base_dir: str = None):
+        """
+        Args:
+            steps (list): Step definitions (see the class docstring).
+            base_dir (str, optional): Directory relative table paths are resolved against.
+
+        Raises:
+            ValueError: If a step lacks 'table' or 'key'.
+        """
+        for i, step in enumerate(steps):
+            missing = [field for field in ("table", "key") if not step.get(field)]
+            if missing:
+                raise ValueError(f"Lookup step {i + 1} is missing: {', '.join(missing)}")
+
+        self.steps = [dict(step) for step in steps]
+        self.base_dir = base_dir
+
+        # Step target -> {'rows': rows without a match, 'keys': sample of unmatched keys}
+        self.unmatched = {}
+
+        self._tables = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "LookupEnricher":
+        """
+        Reads an enrichment file: JSON with a "lookups" list of steps, e.g.
+
+            {"lookups": [
+                {"table": "fx_eur.csv", "key": "Currency", "value": "Rate", "convert": "Revenue"},
+                {"table": "categories.csv", "key": "SKU_Category", "on": "Product_Category",
+                 "value": "Reporting_Category", "target": "Product_Category"}
+            ]}
+
+        Args:
+            path (str): Enrichment file path.
+
+        Returns:
+            LookupEnricher: Enricher resolving tables relative to the file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not valid JSON or has no "lookups" list.
+        """
+        with open(path, encoding="utf-8") as handle:
+            try:
+                spec = json.load(handle)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid enrichment file {path}: {e}") from e
+
+        steps = spec.get("lookups") if isinstance(spec, dict) else None
+        if not isinstance(steps, list):
+            raise ValueError(f"Enrichment file {path} has no \"lookups\" list.")
+        return cls(steps, base_dir=os.path.dirname(os.path.abspath(path)))
+
+    def table_paths(self) -> list:
+        """
+        Resolved paths of the lookup tables, in step order (e.g. to detect changes).
+
+        Returns:
+            list: Table file paths (a table used by several steps is listed once).
+        """
+        paths = [self._resolve(step["table"]) for step in self.steps]
+        return list(dict.fromkeys(paths))
+
+    def enrich(self, df):
+        """
+        Applies every step in order (a step can use columns written by earlier ones).
+
+        Args:
+            df (pd.DataFrame | Dataset): The data. It is not modified.
+
+        Returns:
+            pd.DataFrame | Dataset: The enriched data – a new frame sharing the untouched
+                columns, or a new Dataset (new version) with the same name and source.
+
+        Raises:
+            KeyError: If a dataset or table column named by a step is missing.
+            FileNotFoundError: If a lookup table does not exist.
+        """
+        if isinstance(df, Dataset):
+            return Dataset(self.enrich(df.frame), name=df.name, source=df.source)
+
+        with profiler.span("LookupEnricher.enrich", len(df)):
+            self.unmatched = {}
+            columns = {}
+            for step in self.steps:
+                target, values = self._apply(step, df, columns)
+                columns[target] = values
+
+            result = df.copy(deep=False)
+            for target, values in columns.items():
+                result[target] = values
+            return result
+
+    def _apply(self, step: dict, df: pd.DataFrame, columns: dict) -> tuple:
+        """Internal helper running one step; returns (target column, new values)."""
+        table = self._table(step["table"])
+        key = step["key"]
+        on = step.get("on", key)
+        value = step.get("value") or self._only_value_column(table, key)
+        convert = step.get("convert")
+        target = step.get("target") or convert or value
+
+        for col in (key, value):
+            if col not in table.columns:
+                raise KeyError(f"Column '{col}' not found in lookup table {step['table']}")
+
+        def column(name):
+            if name in columns:
+                return columns[name]
+            if name not in df.columns:
+                raise KeyError(f"Column '{name}' not found in the data (lookup {step['table']})")
+            return df[name]
+
+        keys = column(on)
+        lookup = table[value]
+        if convert is not None and not pd.api.types.is_numeric_dtype(lookup):
+            lookup = NumericParser().normalize(lookup)
+
+        positions, has_key = self._positions(keys, table[key])
+        fetched = pd.api.extensions.take(
+            lookup.to_numpy(dtype=np.float64, na_value=np.nan) if convert is not None else lookup.array,
+            positions,
+            allow_fill=True,
+            fill_value=step.get("default", np.nan if convert is not None else None),
+        )
+
+        missing = (positions < 0) & has_key
+        if missing.any():
+            sample = pd.unique(keys[missing].head(10_000))[:self.UNMATCHED_SAMPLES]
+            self.unmatched[target] = {"rows": int(missing.sum()), "keys": [str(k) for k in sample]}
+
+        if convert is not None:
+            amounts = column(convert).to_numpy(dtype=np.float64, na_value=np.nan)
+            return target, pd.Series(amounts * fetched, index=df.index, name=target)
+        return target, pd.Series(fetched, index=df.index, name=target)
+
+    def _positions(self, keys: pd.Series, table_keys: pd.Series) -> tuple:
+        """
+        Internal helper returning, per row, the table row of its key (-1 = no match or null key)
+        and a mask of rows that have a key at all.
+
+        Only distinct keys are matched; rows get their position through their dictionary code.
+        """
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            codes, uniques = keys.cat.codes.to_numpy(), keys.cat.categories
+        else:
+            codes, uniques = pd.factorize(keys)
+
+        uniques, table_index = self._comparable(pd.Index(uniques), pd.Index(table_keys))
+        if not table_index.is_unique:
+            first = ~table_index.duplicated()
+            table_rows = np.flatnonzero(first)
+            matched = table_index[first].get_indexer(uniques)
+            per_key = np.where(matched >= 0, table_rows[matched], -1)
+        else:
+            per_key = table_index.get_indexer(uniques)
+
+        # Code -1 (null key) picks the appended -1
+        return np.append(per_key, -1).astype(np.int64)[codes], codes >= 0
+
+    def _comparable(self, uniques: pd.Index, table_index: pd.Index) -> tuple:
+        """Internal helper bringing both key sets to one form: stripped text, unless both are numeric."""
+        if pd.api.types.is_numeric_dtype(uniques) and pd.api.types.is_numeric_dtype(table_index):
+            return uniques, table_index
+
+        def as_text(index):
+            if pd.api.types.is_float_dtype(index):
+                # 7.0 -> "7", so integer-valued floats (columns with gaps) match text keys
+                index = pd.Index([int(v) if v == v and float(v).is_integer() else v for v in index], dtype=object)
+            return index.astype(str).str.strip()
+
+        return as_text(uniques), as_text(table_index)
+
+    def _table(self, path: str) -> pd.DataFrame:
+        """Internal helper loading (once) a lookup table."""
+        path = self._resolve(path)
+        if path not in self._tables:
+            with profiler.span("LookupEnricher.load_table"):
+                self._tables[path] = CsvImport().load(path)
+        return self._tables[path]
+
+    def _resolve(self, path: str) -> str:
+        """Internal helper resolving relative table paths against base_dir."""
+        if self.base_dir and not os.path.isabs(path):
+            return os.path.join(self.base_dir, path)
+        return path
+
+    def _only_value_column(self, table: pd.DataFrame, key: str) -> str:
+        """Internal helper: the value column when a step does not name one."""
+        others = [col for col in table.columns if col != key]
+        if len(others) != 1:
+            raise KeyError(f"Lookup table has several value columns ({', '.join(map(str, others))}); set 'value'")
+        return others[0]
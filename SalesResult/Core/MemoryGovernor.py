@@ -0,0 +1,311 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from Core.SessionSnapshot import SessionSnapshot
+from Core.StageProfiler import profiler
+
+
+class MemoryGovernor:
+    """
+    Keeps the memory held by datasets (and data derived from them) under a budget.
+
+    Registered datasets are measured once per storage: numeric columns by their
+    buffer sizes, text columns with memory_usage(deep=True) on an evenly spaced
+    sample, scaled to the column and corrected for string objects shared between
+    rows. Memoized derived data (sort indexes, age buckets, ...) is sized on
+    every check, because it grows as the user works.
+
+    When resident memory exceeds the budget, the least recently used datasets are
+    spilled: written to a columnar session file (SessionSnapshot) in a private
+    spill directory and relocated onto its memory-mapped copy. From then on the OS
+    pages their numeric columns in lazily and can drop them again under pressure;
+    text columns are rebuilt from their dictionary (one string object per distinct
+    value) and bulky memoized data is released, to be recomputed on demand.
+
+    Datasets are tracked through weak references – the governor never keeps a
+    dataset alive – and all methods are safe to call from worker threads.
+    """
+
+    # Default budget when none is given and SALESRESULT_MEMORY_BUDGET_MB is not set
+    DEFAULT_BUDGET = 2 * 1024 ** 3
+
+    # Environment variable overriding the default budget (megabytes)
+    BUDGET_ENV = "SALESRESULT_MEMORY_BUDGET_MB"
+
+    # Datasets smaller than this are never spilled (not worth a file)
+    MIN_SPILL_BYTES = 16 * 1024 ** 2
+
+    # Memoized values at least this large are released when a dataset is spilled
+    BULKY_BYTES = 1024 ** 2
+
+    # Rows sampled per text column to estimate its deep size
+    SAMPLE_ROWS = 10_000
+
+    def __init__(self, budget: int = None, spill_dir: str = None):
+        """
+        Args:
+            budget (int, optional): Resident bytes allowed for datasets. Defaults to
+                SALESRESULT_MEMORY_BUDGET_MB or DEFAULT_BUDGET.
+            spill_dir (str, optional): Directory for spill files. Defaults to a new
+                temporary directory removed by close().
+        """
+        if budget is None:
+            env = os.environ.get(self.BUDGET_ENV)
+            budget = int(float(env) * 1024 ** 2) if env else self.DEFAULT_BUDGET
+        self.budget = budget
+
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+
+        # Dataset -> {'last_used', 'frame_id', 'resident', 'mapped', 'spill_path'}
+        self._entries = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+        self.spilled_total = 0
+
+    # ------------------------------------------------------------------ tracking
+
+    def register(self, dataset) -> None:
+        """
+        Starts tracking a dataset (measured now; counts as just used).
+
+        Args:
+            dataset (Dataset): A full dataset (not a view).
+        """
+        self._measure_frame(dataset)
+        self.touch(dataset)
+
+    def touch(self, dataset) -> None:
+        """Marks a dataset as used now (it becomes the last candidate for spilling)."""
+        with self._lock:
+            entry = self._entries.get(dataset)
+            if entry is not None:
+                entry["last_used"] = time.monotonic()
+
+    def unregister(self, dataset) -> None:
+        """Stops tracking a dataset and deletes its spill file (if possible)."""
+        with self._lock:
+            entry = self._entries.pop(dataset, None)
+        if entry is not None and entry["spill_path"]:
+            self._remove_file(entry["spill_path"])
+
+    def usage(self) -> dict:
+        """
+        Current estimate over all tracked datasets.
+
+        Returns:
+            dict: {'resident', 'mapped', 'budget' (bytes), 'datasets', 'spilled' (counts)}.
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+
+        resident = mapped = spilled = 0
+        for dataset, entry in entries:
+            frame_resident, frame_mapped = self._measure_frame(dataset)
+            resident += frame_resident + self._memo_bytes(dataset)
+            mapped += frame_mapped
+            spilled += entry["spill_path"] is not None
+
+        return {
+            "resident": resident,
+            "mapped": mapped,
+            "budget": self.budget,
+            "datasets": len(entries),
+            "spilled": spilled,
+        }
+
+    def over_budget(self) -> bool:
+        """True if the tracked datasets hold more resident memory than the budget."""
+        return self.usage()["resident"] > self.budget
+
+    def status_text(self) -> str:
+        """One-line summary for a status bar, e.g. 'RAM 1.2 GB / 2.0 GB · 0.4 GB mapped'."""
+        usage = self.usage()
+        text = f"RAM {self._format(usage['resident'])} / {self._format(usage['budget'])}"
+        if usage["mapped"]:
+            text += f" · {self._format(usage['mapped'])} mapped"
+        return text
+
+    # ------------------------------------------------------------------ spilling
+
+    def enforce(self, cancel_event=None) -> list:
+        """
+        Spills least recently used datasets until resident memory fits the budget.
+
+        Args:
+            cancel_event (threading.Event, optional): When set, stops before the next dataset.
+
+        Returns:
+            list: Datasets that were spilled (callers holding their old frame should re-read `frame`).
+        """
+        spilled = []
+        with profiler.span("MemoryGovernor.enforce"):
+            while self.over_budget():
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+
+                with self._lock:
+                    candidates = sorted(
+                        (entry["last_used"], id(dataset), dataset)
+                        for dataset, entry in self._entries.items()
+                        if entry["spill_path"] is None and entry["resident"] >= self.MIN_SPILL_BYTES
+                    )
+                if not candidates:
+                    break
+
+                dataset = candidates[0][2]
+                self.spill(dataset)
+                spilled.append(dataset)
+        return spilled
+
+    def spill(self, dataset) -> str:
+        """
+        Writes a dataset to a columnar spill file and relocates it onto the memory-mapped copy.
+
+        Small memoized values (reports, profiles) are kept; the preview index is kept
+        in its mapped form; bulky values are released.
+
+        Args:
+            dataset (Dataset): A registered full dataset.
+
+        Returns:
+            str: Path of the spill file.
+        """
+        with profiler.span("MemoryGovernor.spill", len(dataset)):
+            path = os.path.join(self._directory(), f"dataset-{dataset.version}{SessionSnapshot.EXTENSION}")
+
+            memo = dataset.memoized()
+            index = memo.get("table_index")
+            snapshot = SessionSnapshot()
+            snapshot.save(path, dataset, memo.get("full_report"), table_index=index)
+            restored = snapshot.load(path)
+
+            kept = {key: value for key, value in memo.items() if self._nbytes(value) < self.BULKY_BYTES}
+            kept.pop("table_index", None)
+            if index is not None:
+                kept["table_index"] = restored["table_index"]
+            dataset.relocate(restored["dataset"].frame, kept)
+
+            with self._lock:
+                entry = self._entries.get(dataset)
+                if entry is not None:
+                    entry["spill_path"] = path
+                self.spilled_total += 1
+
+            self._measure_frame(dataset)
+            return path
+
+    def close(self) -> None:
+        """Forgets all datasets and removes the spill directory it created (best effort)."""
+        with self._lock:
+            paths = [entry["spill_path"] for entry in self._entries.values() if entry["spill_path"]]
+            self._entries = weakref.WeakKeyDictionary()
+
+        for path in paths:
+            self._remove_file(path)
+        if self._owns_spill_dir and self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    # ------------------------------------------------------------------ measuring
+
+    def _measure_frame(self, dataset) -> tuple:
+        """Internal helper returning (resident, mapped) bytes of the frame, measured once per storage."""
+        frame = dataset.frame
+        with self._lock:
+            entry = self._entries.get(dataset)
+            if entry is not None and entry["frame_id"] == id(frame):
+                return entry["resident"], entry["mapped"]
+
+        resident = mapped = 0
+        for col in frame.columns:
+            column_resident, column_mapped = self._column_bytes(frame[col])
+            resident += column_resident
+            mapped += column_mapped
+
+        with self._lock:
+            entry = self._entries.get(dataset)
+            if entry is None:
+                entry = {"last_used": time.monotonic(), "spill_path": None}
+                self._entries[dataset] = entry
+            entry.update(frame_id=id(frame), resident=resident, mapped=mapped)
+        return resident, mapped
+
+    def _column_bytes(self, values: pd.Series) -> tuple:
+        """Internal helper estimating (resident, mapped) bytes of one column."""
+        if values.dtype != object and not (isinstance(values.dtype, pd.StringDtype) and values.dtype.storage == "python"):
+            array = values.to_numpy() if isinstance(values.dtype, np.dtype) else None
+            nbytes = int(values.memory_usage(deep=True, index=False))
+            return (0, nbytes) if array is not None and self._is_mapped(array) else (nbytes, 0)
+
+        if len(values) <= self.SAMPLE_ROWS:
+            return int(values.memory_usage(deep=True, index=False)), 0
+
+        # Pointers for every row + string objects estimated from a sample; objects shared
+        # between rows (e.g. a column rebuilt from a dictionary) are counted once
+        objects = values.to_numpy(dtype=object)
+        sample = objects[np.linspace(0, len(objects) - 1, self.SAMPLE_ROWS).astype(np.int64)]
+        sizes = {id(value): sys.getsizeof(value) for value in sample if value is not None and value == value}
+        if not sizes:
+            return 8 * len(values), 0
+
+        distinct_share = len(sizes) / len(sample)
+        average = sum(sizes.values()) / len(sizes)
+        return int(8 * len(values) + average * distinct_share * len(values)), 0
+
+    def _memo_bytes(self, dataset) -> int:
+        """Internal helper sizing memoized derived data."""
+        return sum(self._nbytes(value) for value in dataset.memoized().values())
+
+    def _nbytes(self, value) -> int:
+        """Internal helper estimating the size of a memoized value (arrays, pandas objects, indexes, containers)."""
+        if isinstance(value, (pd.Series, pd.Index)):
+            return int(value.memory_usage(deep=False)) if isinstance(value, pd.Series) else int(value.nbytes)
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=False, index=False).sum())
+        if isinstance(value, dict):
+            return sum(self._nbytes(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(self._nbytes(item) for item in value)
+        nbytes = getattr(value, "nbytes", None)
+        return int(nbytes) if isinstance(nbytes, (int, np.integer)) else 0
+
+    def _is_mapped(self, array: np.ndarray) -> bool:
+        """Internal helper: True if the array's memory belongs to a memory-mapped file."""
+        base = array
+        while base is not None:
+            if isinstance(base, np.memmap):
+                return True
+            base = getattr(base, "base", None)
+        return False
+
+    # ------------------------------------------------------------------ files
+
+    def _directory(self) -> str:
+        """Internal helper creating the spill directory on first use."""
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="salesresult-spill-")
+            else:
+                os.makedirs(self._spill_dir, exist_ok=True)
+            return self._spill_dir
+
+    def _remove_file(self, path: str) -> None:
+        """Internal helper deleting a spill file; files still mapped (Windows) are left for close()."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _format(self, nbytes: int) -> str:
+        """Internal helper formatting a byte count as MB / GB."""
+        if nbytes >= 1024 ** 3:
+            return f"{nbytes / 1024 ** 3:.1f} GB"
+        return f"{nbytes / 1024 ** 2:.0f} MB"
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+class NumericParser:
+    """
+    Converts text columns holding locale-formatted numbers into numeric dtypes.
+
+    Handles values such as "1 234,56 zł", "$1,234.56", "1.234,56 €", "1'234.56"
+    or "(1,234.00)". The thousands and decimal separators are inferred per column
+    from a sample of distinct values; the whole column is then converted with
+    vectorized string operations – there is no per-row Python code.
+    """
+
+    # Distinct values inspected to infer the number format
+    SAMPLE_SIZE = 1000
+
+    # Share of non-empty values that must parse for a column to be converted
+    MIN_PARSED_SHARE = 0.99
+
+    # Everything except digits, separators and the minus sign (currency, spaces, letters, apostrophes)
+    _NOISE = r"[^0-9.,\-]"
+
+    def detect(self, series: pd.Series):
+        """
+        Infers the number format of a text column.
+
+        Args:
+            series (pd.Series): Text values.
+
+        Returns:
+            tuple | None: (decimal separator, thousands separator or None), or None
+                if the sample does not look numeric.
+        """
+        sample = series.dropna().astype(str).str.strip()
+        sample = sample[sample != ""].drop_duplicates().head(self.SAMPLE_SIZE)
+        if sample.empty:
+            return None
+
+        cleaned = sample.str.replace(self._NOISE, "", regex=True)
+        if (cleaned.str.count(r"[0-9]") == 0).mean() > 1 - self.MIN_PARSED_SHARE:
+            return None
+
+        votes = {".": 0, ",": 0}
+        ambiguous = {".": 0, ",": 0}
+        for value in cleaned:
+            dots, commas = value.count("."), value.count(",")
+            if dots and commas:
+                # Both present: the one that comes last is the decimal separator
+                votes["." if value.rfind(".") > value.rfind(",") else ","] += 1
+            elif dots + commas == 1:
+                separator = "." if dots else ","
+                digits_after = len(value) - value.rfind(separator) - 1
+                if digits_after == 3:
+                    # "1,234" / "1.234" – thousands in most locales, decimal in a few
+                    ambiguous[separator] += 1
+                else:
+                    votes[separator] += 1
+            elif dots > 1:
+                votes[","] += 1   # "1.234.567" -> dots group thousands
+            elif commas > 1:
+                votes["."] += 1   # "1,234,567" -> commas group thousands
+
+        if votes["."] or votes[","]:
+            decimal = "." if votes["."] >= votes[","] else ","
+        elif ambiguous["."] or ambiguous[","]:
+            # Only "x,xxx"-style values: read the separator as grouping (whole numbers)
+            decimal = "," if ambiguous["."] >= ambiguous[","] else "."
+        else:
+            decimal = "."
+
+        thousands = "," if decimal == "." else "."
+        if not cleaned.str.contains(thousands, regex=False).any():
+            thousands = None
+        return decimal, thousands
+
+    def parse(self, series: pd.Series, number_format: tuple) -> pd.Series:
+        """
+        Converts a text column using the given format.
+
+        Args:
+            series (pd.Series): Text values.
+            number_format (tuple): (decimal separator, thousands separator or None) from detect().
+
+        Returns:
+            pd.Series: float64 values; entries that cannot be parsed become NaN.
+        """
+        decimal, thousands = number_format
+        text = series.astype("string")
+
+        cleaned = text.str.replace(self._NOISE, "", regex=True)
+        if thousands:
+            cleaned = cleaned.str.replace(thousands, "", regex=False)
+        if decimal != ".":
+            cleaned = cleaned.str.replace(decimal, ".", regex=False)
+
+        values = pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+        # Accounting notation: "(1,234.00)" is negative
+        if text.str.contains("(", regex=False).any():
+            negative = text.str.contains(r"\([^()]*[0-9][^()]*\)", regex=True).fillna(False).to_numpy(dtype=bool)
+            values = values.where(~negative, -values.abs())
+
+        return values.rename(series.name)
+
+    def normalize(self, series: pd.Series) -> pd.Series:
+        """
+        Converts a locale-formatted text column to a numeric one when it is safe to do so.
+
+        Columns that are already numeric, do not look numeric, or where fewer than
+        MIN_PARSED_SHARE of the non-empty values parse are returned unchanged.
+        Whole-number columns without gaps become int64, all others float64.
+
+        Args:
+            series (pd.Series): Column to convert.
+
+        Returns:
+            pd.Series: The converted column, or the original one.
+        """
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return series
+
+        number_format = self.detect(series)
+        if number_format is None:
+            return series
+
+        values = self.parse(series, number_format)
+
+        # Blank cells do not count against the parse rate; only unparsed rows are inspected
+        parsed = values.notna().to_numpy()
+        failed = series[~parsed].dropna().astype(str).str.strip() != ""
+        present = int(parsed.sum()) + int(failed.sum())
+        if present and int(failed.sum()) / present > 1 - self.MIN_PARSED_SHARE:
+            return series
+
+        array = values.to_numpy()
+        if parsed.all() and np.array_equal(array, np.round(array)) and np.abs(array).max(initial=0) < 2**53:
+            return values.astype("int64")
+        return values
@@ -0,0 +1,447 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+from Core.BatchReport import render_charts
+from Core.CronSchedule import CronSchedule
+from Core.CsvImport import CsvImport
+from Core.LookupEnricher import LookupEnricher
+from Core.SalesAnalyzer import SalesAnalyzer
+from Core.StageProfiler import profiler
+from Core.XlsxExport import XlsxExport
+
+
+class ReportScheduler:
+    """
+    Regenerates report workbooks from CSV inputs on cron-like schedules, redoing only what changed.
+
+    Jobs come from a definition file (JSON):
+
+        {"jobs": [
+            {"name": "sales-eu", "schedule": "0 * * * *",
+             "inputs": ["//share/sales/eu/*.csv"], "output": "reports/sales_eu.xlsx",
+             "charts": "reports/sales_eu.png", "enrich": "enrich_eur.json"}
+        ]}
+
+    'inputs' are files, glob patterns or directories (all *.csv inside); 'charts' (an
+    overview image) and 'enrich' (a LookupEnricher file) are optional. Relative paths
+    are resolved against the definition file. A job runs the CsvImport ->
+    (LookupEnricher) -> SalesAnalyzer -> XlsxExport pipeline over all its inputs.
+
+    Change detection works in two steps: every input is fingerprinted by size and
+    modification time, and its SHA-256 is computed only when those differ from the
+    previous run (so a touched but identical file still counts as unchanged). A job
+    whose inputs, enrichment tables and parameters all fingerprint the same as at
+    its last successful run is skipped. Otherwise only the inputs whose content
+    changed are parsed: each file's revenue cube (SalesAnalyzer.get_revenue_cube) is
+    cached under its content hash and the report is rebuilt from the cubes.
+
+    State (fingerprints, cached cubes) lives in a state directory next to the
+    definition file; every run appends one JSON line per job to its run log.
+    """
+
+    # Bytes read at a time while hashing inputs
+    HASH_CHUNK = 1024 * 1024
+
+    # Longest sleep (seconds) between checks, so definition file edits are noticed
+    MAX_SLEEP = 60
+
+    def __init__(self, definition_path: str, state_dir: str = None, log_path: str = None):
+        """
+        Args:
+            definition_path (str): Job definition file.
+            state_dir (str, optional): Directory for fingerprints and cached aggregates.
+                Defaults to the file's "state_dir" or "<definition name>.state" next to it.
+            log_path (str, optional): Run log (JSON lines). Defaults to the file's "log"
+                or "runs.jsonl" in the state directory.
+
+        Raises:
+            FileNotFoundError: If the definition file does not exist.
+            ValueError: If the definition is invalid.
+        """
+        self.definition_path = os.path.abspath(definition_path)
+        self.base_dir = os.path.dirname(self.definition_path)
+        self._state_dir_override = state_dir
+        self._log_path_override = log_path
+
+        self.jobs = []
+        self._definition_mtime = None
+        self.reload()
+
+        self.analyzer = SalesAnalyzer()
+
+        # job name -> minute (datetime) it last ran at on schedule
+        self._last_scheduled = {}
+
+    # ------------------------------------------------------------------ definition
+
+    def reload(self) -> bool:
+        """
+        Re-reads the definition file if it changed since it was last read.
+
+        Returns:
+            bool: True if the jobs were (re)loaded.
+
+        Raises:
+            ValueError: If the definition is invalid (the previous jobs stay in effect).
+        """
+        mtime = os.stat(self.definition_path).st_mtime_ns
+        if mtime == self._definition_mtime:
+            return False
+
+        with open(self.definition_path, encoding="utf-8") as handle:
+            try:
+                definition = json.load(handle)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid job definition file: {e}") from e
+
+        if not isinstance(definition, dict) or not isinstance(definition.get("jobs"), list):
+            raise ValueError("Job definition file needs a \"jobs\" list.")
+
+        jobs = [self._parse_job(job, i) for i, job in enumerate(definition["jobs"])]
+        names = [job["name"] for job in jobs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate job names: {', '.join(duplicates)}")
+
+        stem = os.path.splitext(self.definition_path)[0]
+        self.state_dir = self._state_dir_override or self._resolve(definition.get("state_dir") or f"{stem}.state")
+        self.log_path = (
+            self._log_path_override
+            or (self._resolve(definition["log"]) if definition.get("log") else os.path.join(self.state_dir, "runs.jsonl"))
+        )
+
+        self.jobs = jobs
+        self._definition_mtime = mtime
+        return True
+
+    def _parse_job(self, job: dict, index: int) -> dict:
+        """Internal helper validating one job definition and resolving its paths."""
+        if not isinstance(job, dict):
+            raise ValueError(f"Job {index + 1} must be an object.")
+
+        name = job.get("name") or f"job{index + 1}"
+        missing = [field for field in ("schedule", "inputs", "output") if not job.get(field)]
+        if missing:
+            raise ValueError(f"Job '{name}' is missing: {', '.join(missing)}")
+
+        inputs = job["inputs"] if isinstance(job["inputs"], list) else [job["inputs"]]
+        return {
+            "name": name,
+            "schedule": CronSchedule(job["schedule"]),
+            "inputs": [self._resolve(pattern) for pattern in inputs],
+            "output": self._resolve(job["output"]),
+            "charts": self._resolve(job["charts"]) if job.get("charts") else None,
+            "enrich": self._resolve(job["enrich"]) if job.get("enrich") else None,
+        }
+
+    def _resolve(self, path: str) -> str:
+        """Internal helper resolving a path relative to the definition file."""
+        return os.path.normpath(os.path.join(self.base_dir, os.path.expanduser(path)))
+
+    # ------------------------------------------------------------------ running
+
+    def run(self, names: list = None, force: bool = False) -> list:
+        """
+        Runs jobs now, regardless of their schedules (unchanged jobs are still skipped).
+
+        Args:
+            names (list, optional): Job names to run. Defaults to all jobs.
+            force (bool): Rebuild even if nothing changed (cached aggregates are still reused).
+
+        Returns:
+            list: One run record per job (see run_job()).
+
+        Raises:
+            KeyError: If a requested job does not exist.
+        """
+        jobs = self.jobs
+        if names:
+            known = {job["name"]: job for job in self.jobs}
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise KeyError(f"Unknown job(s): {', '.join(unknown)}")
+            jobs = [known[name] for name in names]
+
+        return self._run_jobs(jobs, force)
+
+    def run_pending(self, now: datetime = None) -> list:
+        """
+        Runs the jobs whose schedule fires in the current minute (each at most once per minute).
+
+        Args:
+            now (datetime, optional): Current local time. Defaults to datetime.now().
+
+        Returns:
+            list: Run records of the jobs that were due.
+        """
+        minute = (now or datetime.now()).replace(second=0, microsecond=0)
+        due = [
+            job for job in self.jobs
+            if job["schedule"].matches(minute) and self._last_scheduled.get(job["name"]) != minute
+        ]
+        for job in due:
+            self._last_scheduled[job["name"]] = minute
+        return self._run_jobs(due, force=False)
+
+    def run_forever(self, stop_event: threading.Event = None, on_record=None) -> None:
+        """
+        Runs jobs on their schedules until stop_event is set (or the process is interrupted).
+
+        The definition file is re-read when it changes; an invalid edit is reported
+        through on_record and the previous jobs keep running.
+
+        Args:
+            stop_event (threading.Event, optional): Set it to stop the loop.
+            on_record (callable, optional): Receives every run record (and reload errors).
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                self.reload()
+            except (OSError, ValueError) as e:
+                if on_record is not None:
+                    on_record({"status": "error", "error": f"Job definition not reloaded: {e}"})
+
+            now = datetime.now()
+            upcoming = min((job["schedule"].next_after(now) for job in self.jobs), default=None)
+            wait = self.MAX_SLEEP if upcoming is None else min((upcoming - now).total_seconds(), self.MAX_SLEEP)
+            if stop_event.wait(max(wait, 0.0)):
+                break
+
+            for record in self.run_pending():
+                if on_record is not None:
+                    on_record(record)
+
+    def _run_jobs(self, jobs: list, force: bool) -> list:
+        """Internal helper running jobs one after another, then saving state and pruning caches."""
+        if not jobs:
+            return []
+
+        state = self._load_state()
+        records = [self.run_job(job, state, force) for job in jobs]
+        self._save_state(state)
+        self._prune_cubes(state)
+        return records
+
+    def run_job(self, job: dict, state: dict, force: bool = False) -> dict:
+        """
+        Runs one job against the given state (updated in place) and appends its run record to the log.
+
+        Returns:
+            dict: 'job', 'status' ("ok", "skipped" or "error"), 'started_at', 'seconds',
+                'stages' (seconds per stage), 'inputs', 'parsed' (files read), 'reused'
+                (files answered from cached aggregates), 'rows', 'total_revenue',
+                'outputs' and, on failure, 'error'.
+        """
+        started = time.perf_counter()
+        record = {
+            "job": job["name"],
+            "status": "ok",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": None,
+            "stages": {},
+            "inputs": 0,
+            "parsed": 0,
+            "reused": 0,
+            "rows": None,
+            "total_revenue": None,
+            "outputs": [],
+        }
+
+        try:
+            with profiler.span("ReportScheduler.run_job"):
+                self._execute(job, state, force, record)
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        self._append_log(record)
+        return record
+
+    def _execute(self, job: dict, state: dict, force: bool, record: dict) -> None:
+        """Internal helper: fingerprint, skip or rebuild from per-file aggregates, export."""
+        stage = time.perf_counter()
+        paths = self._expand(job["inputs"])
+        if not paths:
+            raise FileNotFoundError(f"No input files match {', '.join(job['inputs'])}")
+
+        hashes = [self._content_hash(path, state) for path in paths]
+        enricher = LookupEnricher.from_file(job["enrich"]) if job["enrich"] else None
+        enrichment = self._enrich_hash(job, enricher, state)
+        outputs = [job["output"]] + ([job["charts"]] if job["charts"] else [])
+        fingerprint = self._digest([enrichment] + outputs + [f"{path}\0{digest}" for path, digest in zip(paths, hashes)])
+
+        record["inputs"] = len(paths)
+        record["stages"]["fingerprint"] = round(time.perf_counter() - stage, 3)
+
+        previous = state["jobs"].get(job["name"], {})
+        if not force and previous.get("fingerprint") == fingerprint and all(os.path.exists(p) for p in outputs):
+            record.update(
+                status="skipped", rows=previous.get("rows"), total_revenue=previous.get("total_revenue"), outputs=outputs
+            )
+            return
+
+        stage = time.perf_counter()
+        cubes, keys, rows, total = [], [], 0, 0.0
+        for path, digest in zip(paths, hashes):
+            key = f"{digest[:32]}-{enrichment[:16]}"
+            entry = self._load_cube(key)
+            if entry is None:
+                entry = self._aggregate_file(path, enricher)
+                self._store_cube(key, entry)
+                record["parsed"] += 1
+            else:
+                record["reused"] += 1
+
+            cubes.append(entry["cube"])
+            keys.append(key)
+            rows += entry["rows"]
+            total += entry["total"]
+
+        report = self.analyzer.report_from_cubes(cubes)
+        record["stages"]["aggregate"] = round(time.perf_counter() - stage, 3)
+
+        stage = time.perf_counter()
+        for path in outputs:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        success, message = XlsxExport().save_report(report, job["output"])
+        if not success:
+            raise RuntimeError(message)
+        if job["charts"]:
+            render_charts(report, job["charts"])
+        record["stages"]["export"] = round(time.perf_counter() - stage, 3)
+
+        record.update(rows=rows, total_revenue=round(total, 2), outputs=outputs)
+        state["jobs"][job["name"]] = {
+            "fingerprint": fingerprint,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "cubes": keys,
+            "rows": rows,
+            "total_revenue": record["total_revenue"],
+        }
+
+    def _aggregate_file(self, path: str, enricher) -> dict:
+        """Internal helper parsing one input and reducing it to its revenue cube."""
+        df = CsvImport().load(path)
+        if enricher is not None:
+            df = enricher.enrich(df)
+        if "Revenue" not in df.columns:
+            raise ValueError(f"'{path}' has no 'Revenue' column.")
+
+        return {
+            "cube": self.analyzer.get_revenue_cube(df),
+            "rows": len(df),
+            "total": float(self.analyzer.calculate_total_revenue(df)),
+        }
+
+    # ------------------------------------------------------------------ fingerprints
+
+    def _expand(self, patterns: list) -> list:
+        """Internal helper expanding files, glob patterns and directories (sorted, no duplicates)."""
+        paths = []
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                paths.extend(sorted(glob.glob(os.path.join(pattern, "*.csv"))))
+            elif glob.has_magic(pattern):
+                paths.extend(sorted(glob.glob(pattern)))
+            else:
+                paths.append(pattern)
+        return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+    def _content_hash(self, path: str, state: dict) -> str:
+        """
+        Internal helper returning the SHA-256 of a file; reused from the state while
+        its size and modification time are unchanged.
+        """
+        stat = os.stat(path)
+        known = state["files"].get(path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(self.HASH_CHUNK), b""):
+                digest.update(chunk)
+
+        state["files"][path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+        return state["files"][path]["sha256"]
+
+    def _enrich_hash(self, job: dict, enricher, state: dict) -> str:
+        """
+        Internal helper fingerprinting what shapes the per-file aggregates besides the file
+        itself (the enrichment file and its tables), so jobs sharing inputs share cached cubes.
+        """
+        parts = []
+        if enricher is not None:
+            parts.append(self._content_hash(job["enrich"], state))
+            parts.extend(self._content_hash(path, state) for path in enricher.table_paths())
+        return self._digest(parts)
+
+    def _digest(self, parts: list) -> str:
+        """Internal helper hashing a list of strings."""
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------ state
+
+    def _load_state(self) -> dict:
+        """Internal helper reading the state file (a missing or damaged one starts fresh)."""
+        try:
+            with open(os.path.join(self.state_dir, "state.json"), encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("files", {})
+        state.setdefault("jobs", {})
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        """Internal helper writing the state file atomically."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = os.path.join(self.state_dir, "state.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+            json.dump(state, handle, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def _load_cube(self, key: str):
+        """Internal helper reading a cached per-file aggregate (None if missing or unreadable)."""
+        try:
+            with open(os.path.join(self.state_dir, "cubes", f"{key}.pkl"), "rb") as handle:
+                return pickle.load(handle)
+        except Exception:
+            return None
+
+    def _store_cube(self, key: str, entry: dict) -> None:
+        """Internal helper caching a per-file aggregate."""
+        directory = os.path.join(self.state_dir, "cubes")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{key}.pkl")
+        with open(f"{path}.tmp", "wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+
+    def _prune_cubes(self, state: dict) -> None:
+        """Internal helper deleting cached aggregates no job refers to any more."""
+        directory = os.path.join(self.state_dir, "cubes")
+        if not os.path.isdir(directory):
+            return
+
+        used = {key for job in state["jobs"].values() for key in job.get("cubes", [])}
+        for name in os.listdir(directory):
+            if name.endswith(".pkl") and name[:-4] not in used:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _append_log(self, record: dict) -> None:
+        """Internal helper appending a run record to the run log (JSON lines)."""
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record) + "\n")
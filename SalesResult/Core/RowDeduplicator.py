@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from Core.StageProfiler import profiler
+
+
+class RowDeduplicator:
+    """
+    Drops duplicate rows by their 64-bit hashes, within a file and across files.
+
+    Every row is reduced to one 64-bit hash (pd.util.hash_pandas_object over the
+    key columns, vectorized per column). Duplicates are then found on the hash
+    array alone: the hashes are sorted once, repeats within the batch are adjacent
+    and rows seen in earlier batches are looked up with a binary search in the
+    sorted array of hashes kept from those batches. Only that array (8 bytes per
+    unique row) survives between batches – never the rows themselves or Python tuples.
+
+    Two different rows share a hash with negligible probability (about 1 in 10^6
+    for 10 million rows), in which case the later one is dropped.
+    """
+
+    # Odd 64-bit constant spreading the per-column hashes before they are summed
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+
+    def __init__(self, key_columns=None):
+        """
+        Args:
+            key_columns (list, optional): Columns that identify a row (e.g., an order id).
+                Defaults to all columns of each batch (a column missing from a batch counts as null).
+        """
+        self.key_columns = list(key_columns) if key_columns else None
+
+        # Rows checked / dropped so far (over all batches)
+        self.rows_seen = 0
+        self.removed = 0
+
+        # Sorted hashes of every row kept so far
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def drop_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Removes rows that repeat a row of this batch or of any earlier batch.
+
+        Args:
+            df (pd.DataFrame): The next batch (e.g., one imported file).
+
+        Returns:
+            pd.DataFrame: The batch without duplicates (first occurrences kept, original order).
+
+        Raises:
+            KeyError: If the batch lacks one of the key columns named in the constructor.
+        """
+        with profiler.span("RowDeduplicator.drop_duplicates", len(df)):
+            hashes = self.row_hashes(df)
+
+            # Stable sort: among equal hashes the earliest row comes first
+            order = np.argsort(hashes, kind="stable")
+            ordered = hashes[order]
+
+            keep = np.ones(len(ordered), dtype=bool)
+            keep[1:] = ordered[1:] != ordered[:-1]
+
+            if len(self._seen):
+                positions = np.searchsorted(self._seen, ordered)
+                positions[positions == len(self._seen)] = 0
+                keep &= self._seen[positions] != ordered
+
+            # Both parts are sorted, so this is effectively a merge
+            self._seen = np.sort(np.concatenate([self._seen, ordered[keep]]), kind="stable")
+
+            mask = np.zeros(len(df), dtype=bool)
+            mask[order[keep]] = True
+
+            self.rows_seen += len(df)
+            self.removed += len(df) - int(keep.sum())
+
+            if mask.all():
+                return df
+            return df[mask].reset_index(drop=True)
+
+    def row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Computes one 64-bit hash per row over the key columns.
+
+        Each non-null value is hashed together with its column name and the results
+        are summed per row, so column order does not matter and a column a file
+        lacks counts the same as an all-null one: rows of files with different
+        column sets are compared as they appear after concatenation. Numeric columns
+        are hashed as float64, so 100 and 100.0 (e.g., an integer column in one file
+        and a column with gaps in another) count as equal.
+
+        Args:
+            df (pd.DataFrame): Rows to hash.
+
+        Returns:
+            np.ndarray: uint64 hashes aligned with the rows.
+
+        Raises:
+            KeyError: If a key column named in the constructor is missing.
+        """
+        columns = df.columns if self.key_columns is None else self.key_columns
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"Duplicate check columns not found: {', '.join(map(str, missing))}")
+
+        hashes = np.zeros(len(df), dtype=np.uint64)
+        for col in columns:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                values = values.astype("float64")
+
+            value_hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+            # Nulls are recognised by their hash (cheaper than notna() on text columns)
+            null = pd.util.hash_pandas_object(pd.Series([None], dtype=values.dtype), index=False).to_numpy()[0]
+            name = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+
+            mixed = value_hashes + name
+            mixed *= self._MIX
+            mixed ^= mixed >> np.uint64(29)
+            hashes += np.where(value_hashes != null, mixed, np.uint64(0))
+        return hashes
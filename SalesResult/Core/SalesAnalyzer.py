@@ -1,10 +1,27 @@
+import numpy as np
 import pandas as pd
 
+from Core.Dataset import Dataset
+from Core.StageProfiler import profiler
+
 class SalesAnalyzer:
     """
     Provides financial aggregation metrics across product and demographic dimensions.
+
+    Every method accepts either a pd.DataFrame or a Dataset handle. With a Dataset,
+    derived data (age buckets, the full report) is memoized on the handle and
+    filtered views only gather the columns an aggregation actually reads.
     """
 
+    AGE_BINS = [0, 25, 35, 45, 55, 100]
+    AGE_LABELS = ['<25', '25-35', '35-45', '45-55', '55+']
+
+    # Default number of histogram bins (integer columns may get fewer, whole-number wide bins)
+    HISTOGRAM_BINS = 30
+
+    # Report dimensions -> source column ('Age Group' is derived from 'Customer_Age')
+    DIMENSION_COLUMNS = {'Category': 'Product_Category', 'Country': 'Country', 'Age Group': 'Customer_Age'}
+
     def get_category_share(self, df: pd.DataFrame) -> pd.Series:
         """
         Calculates total revenue distribution per product category.
@@ -15,7 +32,8 @@ class SalesAnalyzer:
         Returns:
             pd.Series: Revenue sum indexed by category name.
         """
-        return df.groupby('Product_Category')['Revenue'].sum()
+        with profiler.span("SalesAnalyzer.get_category_share", len(df)):
+            return self._column(df, 'Revenue').groupby(self._column(df, 'Product_Category')).sum()
 
     def get_country_share(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -27,7 +45,8 @@ class SalesAnalyzer:
         Returns:
             pd.Series: Revenue sum indexed by country name.
         """
-        return df.groupby('Country')['Revenue'].sum()
+        with profiler.span("SalesAnalyzer.get_country_share", len(df)):
+            return self._column(df, 'Revenue').groupby(self._column(df, 'Country')).sum()
 
     def get_age_group_share(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -45,13 +64,256 @@ class SalesAnalyzer:
         if 'Customer_Age' not in df.columns:
             return pd.Series()
 
-        df_temp = df.copy()
-        bins = [0, 25, 35, 45, 55, 100]
-        labels = ['<25', '25-35', '35-45', '45-55', '55+']
-        
-        df_temp['Age_Group_Calc'] = pd.cut(df_temp['Customer_Age'], bins=bins, labels=labels)
+        with profiler.span("SalesAnalyzer.get_age_group_share", len(df)):
+            age_groups = self._age_groups(df).rename('Age_Group_Calc')
+
+            return self._column(df, 'Revenue').groupby(age_groups, observed=True).sum()
+
+    def get_full_report(self, df: pd.DataFrame) -> dict:
+        """
+        Computes every available revenue breakdown from a single grouping pass.
+
+        The raw rows are grouped once by all available dimensions (category,
+        country and age group). Each per-dimension share and the
+        Category x Country cross-tab are then rolled up from that small
+        intermediate result instead of rescanning the dataset.
+
+        Args:
+            df (pd.DataFrame): Sales data containing 'Revenue' and any of
+                'Product_Category', 'Country', 'Customer_Age'.
+
+        Returns:
+            dict: Report sections keyed by name ("Category", "Country",
+                  "Age Group", "Category x Country"). Shares are pd.Series,
+                  the cross-tab is a pd.DataFrame. Dimensions whose source
+                  column is missing are omitted.
+        """
+        with profiler.span("SalesAnalyzer.get_full_report", len(df)):
+            if isinstance(df, Dataset):
+                return df.derived('full_report', lambda: self._full_report(df))
+            return self._full_report(df)
+
+    def get_revenue_cube(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Sums revenue by every available dimension at once – the intermediate result of get_full_report().
+
+        Cubes of separate files (e.g. daily exports) can be cached and later combined
+        with report_from_cubes(), so a report over many files only re-reads the files
+        that changed.
+
+        Args:
+            df (pd.DataFrame): Sales data containing 'Revenue' and any of
+                'Product_Category', 'Country', 'Customer_Age'.
+
+        Returns:
+            pd.Series: Revenue indexed by ('Category', 'Country', 'Age Group') combinations
+                (available levels only; missing keys kept as NaN). Empty without dimensions.
+        """
+        with profiler.span("SalesAnalyzer.get_revenue_cube", len(df)):
+            keys = {
+                name: self._dimension(df, name)
+                for name, column in self.DIMENSION_COLUMNS.items() if column in df.columns
+            }
+            if not keys:
+                return pd.Series(dtype=float, name='Revenue')
+
+            return self._column(df, 'Revenue').groupby(
+                [key.rename(name) for name, key in keys.items()],
+                observed=True,
+                dropna=False,
+            ).sum()
+
+    def report_from_cubes(self, cubes: list) -> dict:
+        """
+        Builds the full report (see get_full_report()) from one or more revenue cubes.
+
+        Cubes with different dimensions (files with different columns) are reduced to
+        the dimensions they all share before they are added up.
+
+        Args:
+            cubes (list): Results of get_revenue_cube().
+
+        Returns:
+            dict: Report sections keyed by name, as returned by get_full_report().
+        """
+        cubes = [cube for cube in cubes if not cube.empty]
+        if not cubes:
+            return {}
+
+        names = [name for name in cubes[0].index.names if all(name in cube.index.names for cube in cubes)]
+        if not names:
+            return {}
+
+        if len(cubes) == 1 and len(names) == cubes[0].index.nlevels:
+            return self._roll_up(cubes[0])
+
+        combined = pd.concat([cube.groupby(level=names, observed=True, dropna=False).sum() for cube in cubes])
+        return self._roll_up(combined.groupby(level=names, observed=True, dropna=False).sum())
+
+    def _full_report(self, df: pd.DataFrame) -> dict:
+        """Internal helper performing the single grouping pass of get_full_report()."""
+        cube = self.get_revenue_cube(df)
+        if cube.empty:
+            return {}
+        return self._roll_up(cube)
+
+    def _roll_up(self, cube: pd.Series) -> dict:
+        """Internal helper deriving every report section from a revenue cube."""
+        names = list(cube.index.names)
+
+        report = {}
+        for name in names:
+            report[name] = cube.groupby(level=name, observed=True).sum().rename('Revenue')
+
+        if 'Category' in names and 'Country' in names:
+            report['Category x Country'] = (
+                cube.groupby(level=['Category', 'Country']).sum().unstack(fill_value=0)
+            )
+
+        return report
+
+    def get_histogram(self, df: pd.DataFrame, column: str = 'Revenue', by: str = None, bins: int = None) -> pd.DataFrame:
+        """
+        Counts the values of a numeric column in equal-width bins, optionally split by a dimension.
+
+        Bin positions are computed arithmetically for all rows at once and counted
+        with a single np.bincount over (group, bin) pairs, so the result is a small
+        table whatever the row count; charts draw it without seeing the raw values.
+
+        Args:
+            df (pd.DataFrame): Sales data containing `column` (and the `by` dimension's column).
+            column (str): Numeric column to bin, e.g. 'Revenue' or 'Customer_Age'.
+            by (str, optional): Report dimension ('Category', 'Country', 'Age Group')
+                giving one count column per group.
+            bins (int, optional): Number of bins. Defaults to HISTOGRAM_BINS.
+
+        Returns:
+            pd.DataFrame: Counts indexed by bin (pd.IntervalIndex, closed on the left;
+                the last bin also holds the maximum), one column per group (a single
+                column named `column` without `by`). Empty if a column is missing or
+                there are no values.
+        """
+        if isinstance(df, Dataset):
+            return df.derived(('histogram', column, by, bins), lambda: self._histogram(df, column, by, bins))
+        return self._histogram(df, column, by, bins)
+
+    def get_box_summary(self, df: pd.DataFrame, column: str = 'Revenue', by: str = 'Category') -> pd.DataFrame:
+        """
+        Computes the five-number summary (min, quartiles, median, max) of a column per group.
+
+        Rows are bucketed by group with one stable sort of the small-integer group
+        codes (a radix sort), each group's segment is sorted in place, and then every
+        quantile of every group is read at once (linearly interpolated, like
+        np.quantile) at computed positions of the segments.
+
+        Args:
+            df (pd.DataFrame): Sales data containing `column` and the `by` dimension's column.
+            column (str): Numeric column to summarize.
+            by (str): Report dimension ('Category', 'Country', 'Age Group').
+
+        Returns:
+            pd.DataFrame: Columns 'count', 'min', 'q1', 'median', 'q3', 'max', indexed
+                by group (groups without values are omitted). Empty if a column is missing.
+        """
+        if isinstance(df, Dataset):
+            return df.derived(('box_summary', column, by), lambda: self._box_summary(df, column, by))
+        return self._box_summary(df, column, by)
+
+    def _histogram(self, df: pd.DataFrame, column: str, by, bins) -> pd.DataFrame:
+        """Internal helper performing the single counting pass of get_histogram()."""
+        with profiler.span("SalesAnalyzer.get_histogram", len(df)):
+            if column not in df.columns or (by is not None and self.DIMENSION_COLUMNS[by] not in df.columns):
+                return pd.DataFrame()
+
+            values, codes, groups = self._grouped_values(df, column, by)
+            if not len(values):
+                return pd.DataFrame()
+
+            bins = bins or self.HISTOGRAM_BINS
+            low, high = values.min(), values.max()
+            if self._column(df, column).dtype.kind in 'iu':
+                # Whole-number bins, e.g. ages 18-70 -> width 2
+                width = max(1.0, float(np.ceil((high - low + 1) / bins)))
+                bins = int(np.ceil((high - low + 1) / width))
+            else:
+                width = (high - low) / bins or 1.0
+
+            positions = np.minimum(((values - low) / width).astype(np.int64), bins - 1)
+            counts = np.bincount(codes * bins + positions, minlength=len(groups) * bins).reshape(len(groups), bins)
+
+            edges = low + width * np.arange(bins + 1)
+            index = pd.IntervalIndex.from_breaks(edges, closed='left', name=column)
+            return pd.DataFrame(counts.T, index=index, columns=pd.Index(groups, name=by))
+
+    def _box_summary(self, df: pd.DataFrame, column: str, by: str) -> pd.DataFrame:
+        """Internal helper computing all groups' quantiles from per-group sorted segments."""
+        with profiler.span("SalesAnalyzer.get_box_summary", len(df)):
+            if column not in df.columns or self.DIMENSION_COLUMNS[by] not in df.columns:
+                return pd.DataFrame()
+
+            values, codes, groups = self._grouped_values(df, column, by)
+            counts = np.bincount(codes, minlength=len(groups))
+            present = counts > 0
+            if not present.any():
+                return pd.DataFrame()
+
+            # Group codes fit 16 bits for any realistic dimension -> NumPy uses a radix sort
+            key = codes.astype(np.int16) if len(groups) <= np.iinfo(np.int16).max else codes
+            ordered = values[np.argsort(key, kind='stable')]
+            ends = np.cumsum(counts)
+            for start, end in zip(ends - counts, ends):
+                ordered[start:end].sort()
+
+            starts = (ends - counts)[present]
+            sizes = counts[present]
+
+            summary = {'count': sizes}
+            for name, q in (('min', 0.0), ('q1', 0.25), ('median', 0.5), ('q3', 0.75), ('max', 1.0)):
+                position = starts + q * (sizes - 1)
+                below = np.floor(position).astype(np.int64)
+                above = np.ceil(position).astype(np.int64)
+                summary[name] = ordered[below] + (position - below) * (ordered[above] - ordered[below])
+
+            return pd.DataFrame(summary, index=pd.Index(np.asarray(groups, dtype=object)[present], name=by))
+
+    def _grouped_values(self, df: pd.DataFrame, column: str, by) -> tuple:
+        """
+        Internal helper returning (float64 values, group codes, group labels) for rows where
+        both the value and the group are present. Without `by`, every row is in one group named `column`.
+        """
+        values = self._column(df, column).to_numpy(dtype=np.float64, na_value=np.nan)
+        if by is None:
+            codes, groups = np.zeros(len(values), dtype=np.int64), [column]
+        else:
+            codes, uniques = pd.factorize(self._dimension(df, by), sort=True)
+            groups = list(uniques)
+
+        valid = ~np.isnan(values) & (codes >= 0)
+        if not valid.all():
+            values, codes = values[valid], codes[valid]
+        return values, codes.astype(np.int64, copy=False), groups
+
+    def _dimension(self, df: pd.DataFrame, name: str) -> pd.Series:
+        """Internal helper returning the grouping key of a report dimension."""
+        if name == 'Age Group':
+            return self._age_groups(df)
+        return self._column(df, self.DIMENSION_COLUMNS[name])
+
+    def _age_groups(self, df: pd.DataFrame) -> pd.Series:
+        """Internal helper mapping 'Customer_Age' onto the standard age buckets (memoized on a Dataset)."""
+        if isinstance(df, Dataset):
+            return df.derived('age_groups', lambda: self._cut_ages(df.column('Customer_Age')))
+        return self._cut_ages(df['Customer_Age'])
+
+    def _cut_ages(self, ages: pd.Series) -> pd.Series:
+        """Internal helper assigning each age to its bucket label."""
+        return pd.cut(ages, bins=self.AGE_BINS, labels=self.AGE_LABELS)
 
-        return df_temp.groupby('Age_Group_Calc', observed=True)['Revenue'].sum()
+    def _column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        """Internal helper reading one column from a DataFrame or a Dataset (views gather only that column)."""
+        if isinstance(df, Dataset):
+            return df.column(name)
+        return df[name]
 
     def calculate_total_revenue(self, df: pd.DataFrame) -> float:
         """
@@ -61,6 +323,16 @@ class SalesAnalyzer:
             df (pd.DataFrame): Sales data containing a numeric 'Revenue' column.
 
         Returns:
-            float: The sum of all revenue entries.
+            float: The sum of all revenue entries. For a Dataset with a memoized
+                'total_revenue' (e.g. computed in SQL) or already profiled by
+                ColumnProfiler the stored sum is returned without rescanning.
         """
-        return df['Revenue'].sum()
\ No newline at end of file
+        with profiler.span("SalesAnalyzer.calculate_total_revenue", len(df)):
+            if isinstance(df, Dataset):
+                total = df.cached('total_revenue')
+                if total is not None:
+                    return total
+                stats = (df.cached('column_profile') or {}).get('Revenue')
+                if stats is not None and stats['sum'] is not None:
+                    return stats['sum']
+            return self._column(df, 'Revenue').sum()
\ No newline at end of file
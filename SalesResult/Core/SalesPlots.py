@@ -1,11 +1,25 @@
 from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
 
+from Core.StageProfiler import profiler
+
+
 class SalesPlots:
     """
     Manages the rendering of financial visualizations onto a provided Matplotlib Figure.
+
+    Distribution charts (histograms, box plots) are drawn from summaries computed by
+    SalesAnalyzer (bin counts, five-number summaries), never from raw rows, so their
+    rendering cost does not depend on the size of the dataset.
     """
 
+    # Chart types drawn from distribution summaries instead of revenue shares
+    DISTRIBUTION_CHARTS = ("Histogram", "Box Plot")
+
+    # Histograms with more groups than this skip the legend (it would cover the bars)
+    MAX_LEGEND_ENTRIES = 12
+
     def __init__(self, figure: Figure):
         """
         Args:
@@ -13,26 +27,105 @@ class SalesPlots:
         """
         self.figure = figure
 
+        # Multi-panel state: grid shape, axes per panel and the key each panel was drawn with
+        self._grid = None
+        self._panel_axes = []
+        self._panel_keys = []
+
     def draw(self, data: pd.Series, chart_type: str, title_suffix: str, color: str, rotate_x: int):
         """
         Orchestrates the plotting process: clears the canvas and renders the requested chart.
 
         Args:
-            data (pd.Series): The dataset to visualize (Index = Labels, Values = Numeric).
-            chart_type (str): Visualization mode. Supported: "Pie Chart", "Bar Chart".
+            data (pd.Series | pd.DataFrame): The dataset to visualize (Index = Labels, Values = Numeric).
+                Histograms take SalesAnalyzer.get_histogram() output, box plots
+                SalesAnalyzer.get_box_summary() output.
+            chart_type (str): Visualization mode. Supported: "Pie Chart", "Bar Chart",
+                "Histogram", "Box Plot".
             title_suffix (str): Text appended to the chart title for context (e.g., "by Country").
             color (str): Hex code or color name (applies to Bar Chart).
             rotate_x (int): Degree of rotation for x-axis labels (applies to Bar Chart).
         """
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        with profiler.span("SalesPlots.draw", len(data)):
+            self.figure.clear()
+            self._grid = None
+            ax = self.figure.add_subplot(111)
+
+            self._draw_chart(ax, data, chart_type, title_suffix, color, rotate_x)
+        
+            self.figure.tight_layout()
+
+    def draw_panels(self, panels: list, rows: int, cols: int) -> int:
+        """
+        Renders several charts on a rows x cols grid, redrawing only the panels that changed.
+
+        Each panel is a dict with the same arguments as draw() ('data', 'chart_type',
+        'title_suffix', 'color', 'rotate_x') plus a hashable 'key' identifying its
+        inputs. A panel whose key matches the one it was last drawn with keeps its
+        existing artists; changing the grid shape redraws everything.
+
+        Args:
+            panels (list): Panel definitions in row-major order (at most rows * cols).
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+
+        Returns:
+            int: Number of panels actually redrawn.
+        """
+        with profiler.span("SalesPlots.draw_panels", len(panels)):
+            if self._grid != (rows, cols, len(panels)):
+                self.figure.clear()
+                self._grid = (rows, cols, len(panels))
+                self._panel_axes = [self.figure.add_subplot(rows, cols, i + 1) for i in range(len(panels))]
+                self._panel_keys = [None] * len(panels)
+
+            redrawn = 0
+            for i, panel in enumerate(panels):
+                if self._panel_keys[i] == panel['key']:
+                    continue
+
+                ax = self._panel_axes[i]
+                ax.clear()
+                data = panel['data']
+
+                if data is None or data.empty:
+                    ax.set_axis_off()
+                    ax.text(0.5, 0.5, f"No data {panel['title_suffix']}", ha='center', va='center')
+                else:
+                    ax.set_axis_on()
+                    self._draw_chart(ax, data, panel['chart_type'], panel['title_suffix'],
+                                     panel['color'], panel['rotate_x'])
+
+                    # Panels are small; keep titles from overlapping their neighbours
+                    ax.title.set_fontsize(9)
+
+                self._panel_keys[i] = panel['key']
+                redrawn += 1
+
+            if redrawn:
+                self.figure.tight_layout()
+            return redrawn
+
+    def rasterize(self):
+        """
+        Renders the figure to pixels immediately on its attached canvas.
+
+        GUI canvases normally rasterize lazily (draw_idle); this forces the work
+        to happen now, e.g. so its cost can be measured.
+        """
+        with profiler.span("SalesPlots.rasterize"):
+            self.figure.canvas.draw()
 
+    def _draw_chart(self, ax, data, chart_type, title_suffix, color, rotate_x):
+        """Internal helper dispatching to the renderer of a chart type."""
         if chart_type == "Pie Chart":
             self._draw_pie(ax, data, title_suffix)
         elif chart_type == "Bar Chart":
             self._draw_bar(ax, data, title_suffix, color, rotate_x)
-        
-        self.figure.tight_layout()
+        elif chart_type == "Histogram":
+            self._draw_histogram(ax, data, title_suffix, color)
+        elif chart_type == "Box Plot":
+            self._draw_box(ax, data, title_suffix, color, rotate_x)
 
     def _draw_pie(self, ax, data, title_suffix):
         """Internal helper to render a percentage-based pie chart."""
@@ -55,4 +148,41 @@ class SalesPlots:
                         xy=(bar.get_x() + bar.get_width() / 2, height),
                         xytext=(0, 3),
                         textcoords="offset points",
-                        ha='center', va='bottom', fontsize=8)
\ No newline at end of file
+                        ha='center', va='bottom', fontsize=8)
+
+    def _draw_histogram(self, ax, data, title_suffix, color):
+        """Internal helper to render pre-binned counts as (stacked) bars – one bar per bin and group."""
+        left = data.index.left.to_numpy(dtype=float)
+        width = data.index.length.to_numpy(dtype=float)
+        bottom = np.zeros(len(data))
+
+        single = data.shape[1] == 1
+        for group in data.columns:
+            counts = data[group].to_numpy(dtype=float)
+            ax.bar(left, counts, width=width, bottom=bottom, align='edge',
+                   color=color if single else None, edgecolor='white', linewidth=0.5, label=str(group))
+            bottom += counts
+
+        label = str(data.index.name).replace("_", " ")
+        ax.set_title(f"{label} Distribution {title_suffix}")
+        ax.set_xlabel(label)
+        ax.set_ylabel("Orders")
+        ax.ticklabel_format(style='plain', axis='both')
+        if not single and data.shape[1] <= self.MAX_LEGEND_ENTRIES:
+            ax.legend(fontsize=7, title_fontsize=7, title=data.columns.name)
+
+    def _draw_box(self, ax, data, title_suffix, color, rotate_x):
+        """Internal helper to render five-number summaries as box plots (whiskers at min / max)."""
+        stats = [
+            {'label': str(group), 'whislo': row['min'], 'q1': row['q1'], 'med': row['median'],
+             'q3': row['q3'], 'whishi': row['max']}
+            for group, row in data.iterrows()
+        ]
+        boxes = ax.bxp(stats, showfliers=False, patch_artist=True)
+        for box in boxes['boxes']:
+            box.set_facecolor(color)
+
+        ax.set_title(f"Revenue Spread {title_suffix}")
+        ax.set_ylabel("Revenue ($)")
+        ax.ticklabel_format(style='plain', axis='y')
+        ax.tick_params(axis='x', rotation=rotate_x)
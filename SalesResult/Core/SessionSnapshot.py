@@ -0,0 +1,430 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Core.BackgroundJobs import JobCancelled
+from Core.Dataset import Dataset
+from Core.StageProfiler import profiler
+from Core.TableIndex import TableIndex
+
+
+class SessionSnapshot:
+    """
+    Saves a working session (data, aggregates, column profile, view settings) into a single file and reopens it instantly.
+
+    The file is columnar: every column is one contiguous, 64-byte aligned buffer,
+    followed by a JSON footer describing the buffers. Reopening memory-maps the
+    file, so numeric and datetime columns are used in place without being read or
+    parsed; text columns are stored dictionary-encoded (int codes + the distinct
+    values), and only the distinct values have to be decoded. The dictionary codes
+    and any sort orders computed for the preview also seed the TableIndex, so
+    searching and sorting a restored session does not start from scratch.
+
+    Layout: MAGIC | buffers ... | JSON footer | footer length (uint64 LE) | MAGIC
+    """
+
+    # File extension offered in the save/open dialogs
+    EXTENSION = ".srsession"
+
+    # Marks the start and end of the file
+    MAGIC = b"SRSESS01"
+
+    # Version of the footer layout
+    FORMAT_VERSION = 1
+
+    # Alignment of every buffer (bytes)
+    ALIGNMENT = 64
+
+    # Joins the distinct values of a text column; values containing it fall back to offsets
+    _SEPARATOR = "\x00"
+
+    def save(self, path: str, dataset, report: dict = None, state: dict = None,
+             table_index: TableIndex = None, progress=None, cancel_event=None) -> int:
+        """
+        Writes a session snapshot.
+
+        The file is written under a temporary name and moved into place at the end,
+        so an existing snapshot is replaced atomically and never left half-written.
+        A snapshot the data itself is memory-mapped from (a session opened from that
+        file) cannot be overwritten – Windows refuses to replace a mapped file – so
+        saving onto it is rejected up front.
+
+        Args:
+            path (str): Target file.
+            dataset (Dataset | pd.DataFrame): The data.
+            report (dict, optional): Computed aggregates (e.g., SalesAnalyzer.get_full_report()),
+                name -> pd.Series / pd.DataFrame.
+            state (dict, optional): JSON-serializable UI state (dashboard, preview settings, ...).
+            table_index (TableIndex, optional): Preview index whose cached sort orders are kept.
+            progress (callable, optional): Receives the fraction (0.0-1.0) written after each column.
+            cancel_event (threading.Event, optional): When set, writing stops before the next column.
+
+        Returns:
+            int: Size of the written file in bytes.
+
+        Raises:
+            ValueError: If the data (or the preview index) is memory-mapped from `path`.
+            PermissionError: If the target is in use by another mapping or process.
+            JobCancelled: If cancel_event was set; the target file is left untouched.
+        """
+        if not isinstance(dataset, Dataset):
+            dataset = Dataset(dataset)
+        df = dataset.frame
+
+        if self._maps_file(df, table_index, path):
+            raise ValueError(
+                f"{os.path.basename(path)} is the session file the current data is read from; "
+                f"save the session to a different file."
+            )
+
+        tmp_path = f"{path}.tmp"
+        with profiler.span("SessionSnapshot.save", len(df)):
+            try:
+                with open(tmp_path, "wb") as handle:
+                    writer = _BufferWriter(handle, self.MAGIC, self.ALIGNMENT)
+
+                    columns = []
+                    for i, col in enumerate(df.columns):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise JobCancelled()
+
+                        meta = self._encode_column(writer, df[col])
+                        meta["name"] = col
+                        columns.append(meta)
+
+                        if progress is not None:
+                            progress((i + 1) / (len(df.columns) + 1))
+
+                    sort_orders = {}
+                    if table_index is not None:
+                        for col, (order, valid) in table_index.sort_orders().items():
+                            sort_orders[str(col)] = {"column": col, "order": writer.add(order), "valid": valid}
+
+                    footer = {
+                        "format": self.FORMAT_VERSION,
+                        "created_at": datetime.now().isoformat(timespec="seconds"),
+                        "name": dataset.name,
+                        "source": dataset.source,
+                        "rows": len(df),
+                        "columns": columns,
+                        "report": {key: self._encode_result(writer, value) for key, value in (report or {}).items()},
+                        "sort_orders": list(sort_orders.values()),
+                        "profile": dataset.cached("column_profile"),
+                        "state": state or {},
+                    }
+                    writer.finish(json.dumps(footer).encode("utf-8"))
+
+                try:
+                    os.replace(tmp_path, path)
+                except PermissionError as e:
+                    raise PermissionError(
+                        f"Cannot replace {path}: the file is in use (e.g., open in another session)."
+                    ) from e
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        if progress is not None:
+            progress(1.0)
+        return os.path.getsize(path)
+
+    def load(self, path: str) -> dict:
+        """
+        Reopens a snapshot written by save().
+
+        Args:
+            path (str): Snapshot file.
+
+        Returns:
+            dict: {"dataset": Dataset (with the report memoized), "report": dict,
+                "state": dict, "table_index": TableIndex (pre-seeded), "created_at": str}.
+
+        Raises:
+            ValueError: If the file is not a session snapshot (or uses a newer format).
+        """
+        with profiler.span("SessionSnapshot.load") as span:
+            footer = self._read_footer(path)
+            buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+            codes = {}
+            columns = {}
+            for meta in footer["columns"]:
+                columns[meta["name"]] = self._decode_column(buffer, meta, codes)
+
+            df = pd.DataFrame(columns, copy=False)
+            if not columns:
+                df = pd.DataFrame(index=pd.RangeIndex(footer["rows"]))
+            span.set_rows(len(df))
+
+            report = {key: self._decode_result(buffer, meta) for key, meta in footer["report"].items()}
+
+            dataset = Dataset(df, name=footer["name"], source=footer["source"])
+            if report:
+                dataset.derived("full_report", lambda: report)
+
+            profile = footer.get("profile")
+            if profile:
+                # JSON turns the (value, count) pairs of ColumnProfiler into lists
+                profile = {col: dict(stats, top=[tuple(pair) for pair in stats["top"]]) for col, stats in profile.items()}
+                dataset.derived("column_profile", lambda: profile)
+
+            sort_orders = {
+                entry["column"]: (self._view(buffer, entry["order"]), entry["valid"])
+                for entry in footer["sort_orders"]
+                if entry["column"] in df.columns
+            }
+            index = dataset.derived("table_index", lambda: TableIndex(df))
+            index.preload(codes=codes, sort_orders=sort_orders)
+
+        return {
+            "dataset": dataset,
+            "report": report,
+            "state": footer["state"],
+            "table_index": index,
+            "created_at": footer["created_at"],
+        }
+
+    # ------------------------------------------------------------------ columns
+
+    def _encode_column(self, writer, values: pd.Series) -> dict:
+        """Internal helper writing one column and returning its footer entry."""
+        dtype = values.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            return {
+                "kind": "categorical",
+                "codes": writer.add(self._narrow_codes(values.cat.codes.to_numpy())),
+                "categories": self._encode_column(writer, pd.Series(dtype.categories)),
+                "ordered": bool(dtype.ordered),
+            }
+
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            return {
+                "kind": "datetime_tz",
+                "data": writer.add(values.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()),
+                "tz": str(dtype.tz),
+            }
+
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            return {"kind": "array", "data": writer.add(values.to_numpy())}
+
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype) and hasattr(values.array, "_mask"):
+            # Nullable Int64 / Float64 / boolean: values + missing-value mask
+            numpy_dtype = dtype.numpy_dtype
+            return {
+                "kind": "masked",
+                "data": writer.add(values.to_numpy(dtype=numpy_dtype, na_value=numpy_dtype.type(0))),
+                "mask": writer.add(values.isna().to_numpy()),
+                "pandas_dtype": str(dtype),
+            }
+
+        return self._encode_text(writer, values)
+
+    def _encode_text(self, writer, values) -> dict:
+        """Internal helper dictionary-encoding a text (or mixed object) column."""
+        # "str": the default text dtype of the running pandas version (inferred again on load)
+        if isinstance(values.dtype, pd.StringDtype) and values.dtype.na_value is pd.NA:
+            text_dtype = "string"
+        else:
+            text_dtype = "object" if values.dtype == object else "str"
+
+        try:
+            codes, uniques = pd.factorize(values, sort=True)
+        except TypeError:
+            # Mixed types (e.g. numbers and text in one column) – stored as text
+            codes, uniques = pd.factorize(values.astype(str).where(values.notna()), sort=True)
+
+        uniques = [str(value) for value in uniques]
+        meta = {"kind": "text", "text_dtype": text_dtype, "codes": writer.add(self._narrow_codes(codes))}
+
+        joined = self._SEPARATOR.join(uniques)
+        if joined.count(self._SEPARATOR) != max(len(uniques) - 1, 0):
+            encoded = [value.encode("utf-8") for value in uniques]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            meta["offsets"] = writer.add(offsets)
+            meta["values"] = writer.add(np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        else:
+            meta["count"] = len(uniques)
+            meta["values"] = writer.add(np.frombuffer(joined.encode("utf-8"), dtype=np.uint8))
+        return meta
+
+    def _decode_column(self, buffer, meta: dict, codes_out: dict = None):
+        """Internal helper rebuilding a column from its footer entry (numeric buffers are not copied)."""
+        kind = meta["kind"]
+
+        if kind == "array":
+            return pd.Series(self._view(buffer, meta["data"]), copy=False)
+
+        if kind == "datetime_tz":
+            utc = pd.Series(self._view(buffer, meta["data"]), copy=False)
+            return utc.dt.tz_localize("UTC").dt.tz_convert(meta["tz"])
+
+        if kind == "masked":
+            data = self._view(buffer, meta["data"])
+            mask = self._view(buffer, meta["mask"])
+            array_type = pd.api.types.pandas_dtype(meta["pandas_dtype"]).construct_array_type()
+            return pd.Series(array_type(np.array(data), np.array(mask)))
+
+        codes = self._view(buffer, meta["codes"])
+
+        if kind == "categorical":
+            categories = pd.Index(self._decode_column(buffer, meta["categories"]))
+            return pd.Series(pd.Categorical.from_codes(codes, categories, ordered=meta["ordered"]))
+
+        uniques = self._decode_strings(buffer, meta)
+        if codes_out is not None and "name" in meta:
+            codes_out[meta["name"]] = (codes, pd.Series(uniques, dtype=object).astype(str))
+
+        # Code -1 (missing) picks the NaN appended at the end
+        lookup = np.empty(len(uniques) + 1, dtype=object)
+        lookup[:-1] = uniques
+        lookup[-1] = np.nan
+        dtype = {"object": object, "string": "string"}.get(meta["text_dtype"])
+        return pd.Series(lookup.take(codes), dtype=dtype)
+
+    def _decode_strings(self, buffer, meta: dict) -> list:
+        """Internal helper decoding the distinct values of a text column."""
+        text = self._view(buffer, meta["values"]).tobytes().decode("utf-8")
+        if "offsets" not in meta:
+            return text.split(self._SEPARATOR) if meta["count"] else []
+
+        raw = text.encode("utf-8")
+        offsets = self._view(buffer, meta["offsets"]).tolist()
+        return [raw[start:stop].decode("utf-8") for start, stop in zip(offsets[:-1], offsets[1:])]
+
+    # ------------------------------------------------------------------ aggregates
+
+    def _encode_result(self, writer, value) -> dict:
+        """Internal helper writing an aggregate (Series or DataFrame) with its index."""
+        index = value.index
+        levels = [self._encode_column(writer, pd.Series(index.get_level_values(i))) for i in range(index.nlevels)]
+
+        if isinstance(value, pd.DataFrame):
+            return {
+                "type": "frame",
+                "index": levels,
+                "index_names": list(index.names),
+                "columns": [self._encode_column(writer, value.iloc[:, i]) for i in range(value.shape[1])],
+                "column_labels": self._encode_column(writer, pd.Series(value.columns)),
+                "columns_name": value.columns.name,
+            }
+        return {
+            "type": "series",
+            "index": levels,
+            "index_names": list(index.names),
+            "values": self._encode_column(writer, value),
+            "name": value.name,
+        }
+
+    def _decode_result(self, buffer, meta: dict):
+        """Internal helper rebuilding an aggregate written by _encode_result()."""
+        levels = [self._decode_column(buffer, level) for level in meta["index"]]
+        if len(levels) == 1:
+            index = pd.Index(levels[0].array, name=meta["index_names"][0])
+        else:
+            index = pd.MultiIndex.from_arrays([level.array for level in levels], names=meta["index_names"])
+
+        if meta["type"] == "frame":
+            labels = pd.Index(self._decode_column(buffer, meta["column_labels"]).array, name=meta["columns_name"])
+            data = {i: self._decode_column(buffer, column).to_numpy() for i, column in enumerate(meta["columns"])}
+            frame = pd.DataFrame(data, index=index)
+            frame.columns = labels
+            return frame
+
+        values = self._decode_column(buffer, meta["values"])
+        return pd.Series(values.array, index=index, name=meta["name"])
+
+    # ------------------------------------------------------------------ buffers
+
+    def _maps_file(self, df: pd.DataFrame, table_index, path: str) -> bool:
+        """Internal helper: True if a column or cached preview array is memory-mapped from `path`."""
+        if not os.path.exists(path):
+            return False
+
+        arrays = [df[col].to_numpy() for col in df.columns if isinstance(df[col].dtype, np.dtype)]
+        if table_index is not None:
+            arrays += [order for order, _ in table_index.sort_orders().values()]
+            arrays += [codes for codes, _ in table_index.cached_codes().values()]
+
+        for array in arrays:
+            base = array
+            while base is not None:
+                filename = getattr(base, "filename", None) if isinstance(base, np.memmap) else None
+                if filename and os.path.exists(filename) and os.path.samefile(filename, path):
+                    return True
+                base = getattr(base, "base", None)
+        return False
+
+    def _read_footer(self, path: str) -> dict:
+        """Internal helper validating the file and parsing its JSON footer."""
+        magic = len(self.MAGIC)
+        with open(path, "rb") as handle:
+            head = handle.read(magic)
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            if head != self.MAGIC or size < 2 * magic + 8:
+                raise ValueError(f"{path} is not a SalesResult session file.")
+
+            handle.seek(size - magic - 8)
+            tail = handle.read(magic + 8)
+            length = int.from_bytes(tail[:8], "little")
+            if tail[8:] != self.MAGIC or length > size - 2 * magic - 8:
+                raise ValueError(f"{path} is truncated or damaged.")
+
+            handle.seek(size - magic - 8 - length)
+            footer = json.loads(handle.read(length).decode("utf-8"))
+
+        if footer.get("format", 0) > self.FORMAT_VERSION:
+            raise ValueError(f"{path} was written by a newer version of SalesResult.")
+        return footer
+
+    def _view(self, buffer, ref: list) -> np.ndarray:
+        """Internal helper returning a zero-copy array over a buffer written by _BufferWriter.add()."""
+        offset, nbytes, dtype = ref
+        return buffer[offset:offset + nbytes].view(np.dtype(dtype))
+
+    def _narrow_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Internal helper storing dictionary codes in the smallest signed integer type."""
+        top = int(codes.max(initial=-1))
+        for dtype in (np.int8, np.int16, np.int32):
+            if top <= np.iinfo(dtype).max:
+                return codes.astype(dtype, copy=False)
+        return codes.astype(np.int64, copy=False)
+
+
+class _BufferWriter:
+    """
+    Internal helper appending aligned buffers to an open snapshot file.
+    """
+
+    def __init__(self, handle, magic: bytes, alignment: int):
+        self.handle = handle
+        self.magic = magic
+        self.alignment = alignment
+        handle.write(magic)
+        self.offset = len(magic)
+
+    def add(self, array: np.ndarray) -> list:
+        """Writes an array and returns its reference: [offset, nbytes, dtype]."""
+        padding = -self.offset % self.alignment
+        if padding:
+            self.handle.write(b"\0" * padding)
+            self.offset += padding
+
+        array = np.ascontiguousarray(array).reshape(-1)
+        self.handle.write(array.view(np.uint8).data)
+
+        ref = [self.offset, array.nbytes, array.dtype.str]
+        self.offset += array.nbytes
+        return ref
+
+    def finish(self, footer: bytes) -> None:
+        """Writes the footer and the closing marker."""
+        self.handle.write(footer)
+        self.handle.write(len(footer).to_bytes(8, "little"))
+        self.handle.write(self.magic)
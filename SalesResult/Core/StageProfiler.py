@@ -0,0 +1,275 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+class StageProfiler:
+    """
+    Records timing spans around pipeline stages: wall time, rows processed and peak allocation.
+
+    Profiling is off by default. While disabled, span() returns a shared no-op
+    context manager, so instrumented code pays for one attribute check per stage.
+    When enabled, every span records its duration and – if memory tracing is on –
+    the peak amount of memory allocated above the level at which the span started
+    (measured with tracemalloc, so it includes NumPy/pandas buffers).
+
+    Spans may be nested and may run on worker threads. tracemalloc is process-wide,
+    so the peak of a span includes allocations made concurrently by other threads.
+    """
+
+    # Oldest spans are dropped once this many have been recorded
+    MAX_SPANS = 10_000
+
+    def __init__(self):
+        self.enabled = False
+        self.spans = deque(maxlen=self.MAX_SPANS)
+
+        # Incremented on every recorded span; lets the UI refresh its summary only on change
+        self.version = 0
+
+        self._lock = threading.Lock()
+        self._active = []
+        self._owns_tracemalloc = False
+        self._origin = time.perf_counter()
+
+    def enable(self, trace_memory: bool = True):
+        """
+        Starts recording spans.
+
+        Args:
+            trace_memory (bool): Also measure peak allocations. Starts tracemalloc
+                unless it is already running; this slows allocation-heavy code down
+                noticeably while profiling is on.
+        """
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self.enabled = True
+
+    def disable(self):
+        """Stops recording spans (already recorded spans are kept)."""
+        self.enabled = False
+        if self._owns_tracemalloc and not self._active:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def clear(self):
+        """Discards all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+            self.version += 1
+
+    def span(self, name: str, rows: int = None):
+        """
+        Returns a context manager timing one stage.
+
+        The returned object's set_rows() can be used inside the block when the
+        number of rows is only known at the end (e.g., after parsing).
+
+        Args:
+            name (str): Stage name, conventionally "Class.method".
+            rows (int, optional): Number of rows the stage processes.
+
+        Returns:
+            A context manager (a no-op one while profiling is disabled).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, rows)
+
+    def summary(self) -> dict:
+        """
+        Aggregates recorded spans per stage.
+
+        Returns:
+            dict: Stage name -> {'count', 'total_seconds', 'last_seconds', 'last_rows', 'peak_mb'},
+                  where 'peak_mb' is the largest peak seen for the stage (None without memory tracing).
+        """
+        stages = {}
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            stage = stages.setdefault(span["name"], {
+                "count": 0, "total_seconds": 0.0, "last_seconds": 0.0, "last_rows": None, "peak_mb": None,
+            })
+            stage["count"] += 1
+            stage["total_seconds"] += span["seconds"]
+            stage["last_seconds"] = span["seconds"]
+            stage["last_rows"] = span["rows"]
+            if span["peak_bytes"] is not None:
+                peak_mb = span["peak_bytes"] / 2**20
+                stage["peak_mb"] = peak_mb if stage["peak_mb"] is None else max(stage["peak_mb"], peak_mb)
+
+        return stages
+
+    def status_text(self, limit: int = 3) -> str:
+        """
+        Formats the most recently finished stages as a one-line summary.
+
+        Args:
+            limit (int): Maximum number of stages listed (newest first).
+
+        Returns:
+            str: e.g. "CsvImport.parse 0.42 s · 2,000,000 rows · 118 MB | ..."; empty if nothing was recorded.
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        parts = []
+        seen = set()
+        for span in reversed(spans):
+            if span["name"] in seen:
+                continue
+            seen.add(span["name"])
+
+            text = f"{span['name']} {span['seconds']:.3f} s"
+            if span["rows"] is not None:
+                text += f" · {span['rows']:,} rows"
+            if span["peak_bytes"] is not None:
+                text += f" · {span['peak_bytes'] / 2**20:.1f} MB"
+            parts.append(text)
+
+            if len(parts) >= limit:
+                break
+
+        return " | ".join(parts)
+
+    def save_chrome_trace(self, file_path: str) -> tuple[bool, str]:
+        """
+        Writes the recorded spans in the Chrome trace event format.
+
+        The file can be opened in chrome://tracing, Perfetto (ui.perfetto.dev)
+        or any other viewer understanding the format.
+
+        Args:
+            file_path (str): Destination .json file.
+
+        Returns:
+            tuple[bool, str]: Success flag and a status message or error description.
+        """
+        try:
+            with self._lock:
+                spans = list(self.spans)
+
+            pid = os.getpid()
+            events = []
+            threads = {}
+            for span in spans:
+                threads[span["tid"]] = span["thread"]
+                args = {"rows": span["rows"]}
+                if span["peak_bytes"] is not None:
+                    args["peak_mb"] = round(span["peak_bytes"] / 2**20, 3)
+
+                events.append({
+                    "name": span["name"],
+                    "cat": span["name"].split(".", 1)[0],
+                    "ph": "X",
+                    "ts": round(span["start"] * 1e6, 1),
+                    "dur": round(span["seconds"] * 1e6, 1),
+                    "pid": pid,
+                    "tid": span["tid"],
+                    "args": args,
+                })
+
+            for tid, thread_name in threads.items():
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                               "args": {"name": thread_name}})
+
+            with open(file_path, "w", encoding="utf-8") as handle:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+
+            return True, f"Saved {len(spans)} spans."
+
+        except Exception as e:
+            return False, str(e)
+
+    def _enter(self, span):
+        """Internal helper: registers a starting span and its memory baseline."""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                # Resetting the peak for the new span must not lose the peak of the enclosing ones
+                for active in self._active:
+                    active.peak = max(active.peak, peak)
+                tracemalloc.reset_peak()
+                span.base = span.peak = current
+            self._active.append(span)
+        span.start = time.perf_counter()
+
+    def _exit(self, span):
+        """Internal helper: records a finished span."""
+        end = time.perf_counter()
+        with self._lock:
+            peak_bytes = None
+            if span.base is not None and tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                for active in self._active:
+                    active.peak = max(active.peak, peak)
+                tracemalloc.reset_peak()
+                peak_bytes = max(span.peak - span.base, 0)
+            self._active.remove(span)
+
+            thread = threading.current_thread()
+            self.spans.append({
+                "name": span.name,
+                "start": span.start - self._origin,
+                "seconds": end - span.start,
+                "rows": span.rows,
+                "peak_bytes": peak_bytes,
+                "tid": thread.ident,
+                "thread": thread.name,
+            })
+            self.version += 1
+
+        if not self.enabled and self._owns_tracemalloc and not self._active:
+            self.disable()
+
+
+class _Span:
+    """A span being timed; created by StageProfiler.span()."""
+
+    __slots__ = ("profiler", "name", "rows", "start", "base", "peak")
+
+    def __init__(self, profiler: StageProfiler, name: str, rows: int):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.start = 0.0
+        self.base = None
+        self.peak = 0
+
+    def set_rows(self, rows: int):
+        self.rows = rows
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._exit(self)
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span returned while profiling is disabled."""
+
+    __slots__ = ()
+
+    def set_rows(self, rows: int):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# Process-wide profiler used by the instrumented Core and Ui modules
+profiler = StageProfiler()
@@ -0,0 +1,195 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class TableIndex:
+    """
+    Maintains cached sort permutations and search masks for paging through a DataFrame.
+
+    Views are expressed as arrays of row positions into the original frame, so
+    sorting and filtering never copy the data; the caller fetches only the rows
+    it displays via `df.iloc[positions[start:stop]]`.
+    """
+
+    # Queries made only of these characters can match the text form of a number
+    _NUMERIC_QUERY = re.compile(r"^[0-9.,eE+\-]+$")
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df (pd.DataFrame): The dataset to index. It must not be mutated afterwards.
+        """
+        self.df = df
+
+        # column -> (ascending permutation, number of non-null values)
+        self._sort_cache = {}
+
+        # column -> (codes, text of unique values) used to sort and search non-numeric columns
+        self._codes_cache = {}
+
+        # (lower-cased query, boolean row mask) of the most recent search
+        self._last_search = None
+
+    def sort_order(self, column, ascending: bool = True) -> np.ndarray:
+        """
+        Returns the row positions ordering the frame by a column (nulls always last).
+
+        The ascending permutation is computed once per column with a stable sort
+        and cached; the descending order is derived from it by reversing the
+        non-null part. Numeric columns are argsorted directly, other columns are
+        argsorted by their sorted dictionary codes.
+
+        Args:
+            column: Column label to sort by.
+            ascending (bool): Sort direction.
+
+        Returns:
+            np.ndarray: Row positions (int64) in sorted order.
+        """
+        if column not in self._sort_cache:
+            values = self.df[column]
+            if self._is_numeric(values):
+                keys = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                codes, _ = self._codes(column)
+                # Nulls have code -1; move them past every real value
+                keys = np.where(codes < 0, np.iinfo(codes.dtype).max, codes)
+
+            order = np.argsort(keys, kind="stable").astype(np.int64, copy=False)
+            self._sort_cache[column] = (order, int(values.notna().sum()))
+
+        order, valid = self._sort_cache[column]
+        if ascending:
+            return order
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Finds rows where any column contains the query text (case-insensitive).
+
+        Matching uses vectorized pandas string operations per column. When the new
+        query extends the previous one (typing ahead), only the previous matches
+        are re-checked. Numeric columns are skipped for queries that cannot match
+        a number.
+
+        Args:
+            query (str): Text to look for. Empty text matches every row.
+
+        Returns:
+            np.ndarray: Boolean mask aligned with the frame rows.
+        """
+        needle = query.strip().lower()
+        if not needle:
+            return np.ones(len(self.df), dtype=bool)
+
+        candidates = None
+        if self._last_search is not None and needle.startswith(self._last_search[0]):
+            candidates = np.flatnonzero(self._last_search[1])
+
+        numeric_query = bool(self._NUMERIC_QUERY.match(needle))
+
+        found = np.zeros(len(self.df) if candidates is None else len(candidates), dtype=bool)
+        for column in self.df.columns:
+            if not numeric_query and self._is_numeric(self.df[column]):
+                continue
+
+            # Match against the distinct values only, then broadcast through the codes
+            codes, uniques = self._codes(column)
+            unique_hits = uniques.str.contains(needle, case=False, regex=False).to_numpy(dtype=bool)
+            unique_hits = np.append(unique_hits, False)  # code -1 (null) never matches
+
+            found |= unique_hits[codes if candidates is None else codes[candidates]]
+
+        if candidates is None:
+            mask = found
+        else:
+            mask = np.zeros(len(self.df), dtype=bool)
+            mask[candidates[found]] = True
+
+        self._last_search = (needle, mask)
+        return mask
+
+    def view(self, sort_column=None, ascending: bool = True, query: str = "", limit: int = None) -> np.ndarray:
+        """
+        Builds the row positions for a sorted and/or filtered preview.
+
+        Args:
+            sort_column: Column label to sort by, or None to keep file order.
+            ascending (bool): Sort direction.
+            query (str): Search text; empty keeps all rows.
+            limit (int, optional): Maximum number of positions to return.
+
+        Returns:
+            np.ndarray: Row positions into the original frame.
+        """
+        if sort_column is not None:
+            positions = self.sort_order(sort_column, ascending)
+            if query.strip():
+                positions = positions[self.search(query)[positions]]
+        elif query.strip():
+            positions = np.flatnonzero(self.search(query))
+        else:
+            positions = np.arange(len(self.df), dtype=np.int64)
+
+        if limit is not None:
+            positions = positions[:limit]
+        return positions
+
+    def sort_orders(self) -> dict:
+        """
+        Returns the ascending sort permutations computed so far.
+
+        Returns:
+            dict: column -> (row positions, number of non-null values).
+        """
+        return dict(self._sort_cache)
+
+    def cached_codes(self) -> dict:
+        """
+        Returns the dictionary encodings computed (or preloaded) so far.
+
+        Returns:
+            dict: column -> (codes, text of unique values), as accepted by preload().
+        """
+        return dict(self._codes_cache)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the cached permutations, codes and search mask (not the frame)."""
+        total = sum(order.nbytes for order, _ in self._sort_cache.values())
+        total += sum(codes.nbytes + int(uniques.memory_usage(index=False)) for codes, uniques in self._codes_cache.values())
+        if self._last_search is not None:
+            total += self._last_search[1].nbytes
+        return total
+
+    def preload(self, codes: dict = None, sort_orders: dict = None) -> None:
+        """
+        Seeds the caches with results computed earlier (e.g., restored from a session file).
+
+        Args:
+            codes (dict, optional): column -> (codes, text of unique values), where the
+                codes index the values sorted ascending and -1 marks nulls.
+            sort_orders (dict, optional): column -> (ascending permutation, non-null count),
+                as returned by sort_orders().
+        """
+        self._codes_cache.update(codes or {})
+        self._sort_cache.update(sort_orders or {})
+
+    def _codes(self, column) -> tuple:
+        """Internal helper caching the sorted dictionary encoding of a column."""
+        if column not in self._codes_cache:
+            values = self.df[column]
+            try:
+                codes, uniques = pd.factorize(values, sort=True)
+            except TypeError:
+                # Mixed types (e.g. numbers and text in one column) – compare as text
+                codes, uniques = pd.factorize(values.astype(str).where(values.notna()), sort=True)
+
+            self._codes_cache[column] = (codes, pd.Series(uniques).astype(str))
+        return self._codes_cache[column]
+
+    def _is_numeric(self, values: pd.Series) -> bool:
+        """Internal helper; booleans are treated as text so 'true' can be searched."""
+        return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
@@ -1,12 +1,18 @@
+import os
+
 import pandas as pd
 import openpyxl 
+from openpyxl.chart import BarChart, PieChart, Reference
+
+from Core.BackgroundJobs import JobCancelled
+from Core.StageProfiler import profiler
 
 class XlsxExport:
     """
     Handles the export of analytical results to multi-sheet Excel workbooks.
     """
 
-    def save(self, data: pd.Series, file_path: str) -> tuple[bool, str]:
+    def save(self, data: pd.Series, file_path: str, progress=None, cancel_event=None) -> tuple[bool, str]:
         """
         Exports the dataset to Excel, splitting views into Percentage and Absolute Revenue sheets.
 
@@ -16,12 +22,21 @@ class XlsxExport:
         Args:
             data (pd.Series): The data to export. The Series name is used for sheet naming.
             file_path (str): The destination path for the .xlsx file.
+            progress (callable, optional): Receives the completed fraction (0.0-1.0)
+                after each sheet is written.
+            cancel_event (threading.Event, optional): When set, the export stops
+                before the next sheet.
+
+        The workbook is written to a temporary file next to file_path and moved into
+        place only when complete, so a cancelled or failed export leaves an existing
+        file untouched.
 
         Returns:
             tuple[bool, str]: A tuple containing:
                 - Success flag (True/False)
                 - Status message or error description
         """
+        tmp_path = self._temp_path(file_path)
         try:
             base_name = str(data.name) if data.name else "Data"
             
@@ -34,15 +49,157 @@ class XlsxExport:
             
             df_bar = data.to_frame(name="Revenue")
             
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+            self._check_cancelled(cancel_event)
+
+            with profiler.span("XlsxExport.save", len(data)), \
+                    pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
                 # Excel restricts sheet names to 31 characters
                 sheet_name_pie = f"{base_name} Pie"[:31]
                 sheet_name_bar = f"{base_name} Bar"[:31]
                 
                 df_pie.to_excel(writer, sheet_name=sheet_name_pie)
+                self._report_progress(progress, 0.5)
+
+                self._check_cancelled(cancel_event)
                 df_bar.to_excel(writer, sheet_name=sheet_name_bar)
-                
+                self._report_progress(progress, 1.0)
+
+            os.replace(tmp_path, file_path)
             return True, "File saved successfully."
+
+        except JobCancelled:
+            return False, "Export cancelled."
             
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+        finally:
+            self._discard(tmp_path)
+
+    def save_report(self, report: dict, file_path: str, progress=None, cancel_event=None) -> tuple[bool, str]:
+        """
+        Exports a full analysis report into a single workbook, one sheet per section.
+
+        Each revenue share sheet holds the absolute revenue and percentage columns
+        together with native Excel pie and bar charts. Cross-tab sections
+        (pd.DataFrame) are written as a matrix with a stacked bar chart. Charts
+        are stored as Excel chart objects referencing the sheet cells, so the
+        file stays small and Excel renders them itself.
+
+        Args:
+            report (dict): Section name -> pd.Series or pd.DataFrame, as returned
+                by SalesAnalyzer.get_full_report.
+            file_path (str): The destination path for the .xlsx file.
+            progress (callable, optional): Receives the completed fraction (0.0-1.0)
+                after each section is written.
+            cancel_event (threading.Event, optional): When set, the export stops
+                before the next section.
+
+        As in save(), the workbook only replaces file_path once it is complete.
+
+        Returns:
+            tuple[bool, str]: A tuple containing:
+                - Success flag (True/False)
+                - Status message or error description
+        """
+        tmp_path = self._temp_path(file_path)
+        try:
+            if not report:
+                return False, "Report contains no data."
+
+            self._check_cancelled(cancel_event)
+
+            rows = sum(len(data) for data in report.values())
+            with profiler.span("XlsxExport.save_report", rows), \
+                    pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
+                for i, (name, data) in enumerate(report.items(), start=1):
+                    # Excel restricts sheet names to 31 characters
+                    sheet_name = str(name)[:31]
+
+                    if isinstance(data, pd.DataFrame):
+                        # Column axis name would otherwise add an extra header row
+                        data = data.rename_axis(columns=None)
+                        data.to_excel(writer, sheet_name=sheet_name)
+                        self._add_crosstab_chart(writer.sheets[sheet_name], data, name)
+                    else:
+                        total = data.sum()
+                        share = (data / total * 100).round(1) if total != 0 else data * 0
+                        frame = pd.DataFrame({"Revenue": data, "Percentage": share})
+                        frame.index.name = name
+
+                        frame.to_excel(writer, sheet_name=sheet_name)
+                        self._add_share_charts(writer.sheets[sheet_name], len(frame), name)
+
+                    self._report_progress(progress, i / len(report))
+
+                    if i < len(report):
+                        self._check_cancelled(cancel_event)
+
+            os.replace(tmp_path, file_path)
+            return True, "Report saved successfully."
+
+        except JobCancelled:
+            return False, "Export cancelled."
+
+        except Exception as e:
+            return False, str(e)
+
+        finally:
+            self._discard(tmp_path)
+
+    def _check_cancelled(self, cancel_event):
+        """Internal helper aborting the export once cancellation was requested."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise JobCancelled()
+
+    def _report_progress(self, progress, fraction: float):
+        """Internal helper forwarding progress to an optional callback."""
+        if progress is not None:
+            progress(fraction)
+
+    def _temp_path(self, file_path: str) -> str:
+        """Internal helper naming the temporary file an export is written to (same folder and extension)."""
+        root, ext = os.path.splitext(file_path)
+        return f"{root}.tmp{ext}"
+
+    def _discard(self, tmp_path: str):
+        """Internal helper removing the temporary file of a cancelled or failed export (if any is left)."""
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def _add_share_charts(self, sheet, rows: int, name: str):
+        """Internal helper anchoring native pie and bar charts next to a share table."""
+        labels = Reference(sheet, min_col=1, min_row=2, max_row=rows + 1)
+        revenue = Reference(sheet, min_col=2, min_row=1, max_row=rows + 1)
+
+        pie = PieChart()
+        pie.title = f"Revenue Share by {name}"
+        pie.add_data(revenue, titles_from_data=True)
+        pie.set_categories(labels)
+        sheet.add_chart(pie, "E2")
+
+        bar = BarChart()
+        bar.title = f"Revenue Amount by {name}"
+        bar.y_axis.title = "Revenue ($)"
+        bar.legend = None
+        bar.add_data(revenue, titles_from_data=True)
+        bar.set_categories(labels)
+        sheet.add_chart(bar, "E18")
+
+    def _add_crosstab_chart(self, sheet, data: pd.DataFrame, name: str):
+        """Internal helper anchoring a native stacked bar chart next to a cross-tab matrix."""
+        rows, cols = data.shape
+        labels = Reference(sheet, min_col=1, min_row=2, max_row=rows + 1)
+        values = Reference(sheet, min_col=2, max_col=cols + 1, min_row=1, max_row=rows + 1)
+
+        bar = BarChart()
+        bar.type = "col"
+        bar.grouping = "stacked"
+        bar.overlap = 100
+        bar.title = f"Revenue {name}"
+        bar.y_axis.title = "Revenue ($)"
+        bar.add_data(values, titles_from_data=True)
+        bar.set_categories(labels)
+        sheet.add_chart(bar, sheet.cell(row=1, column=cols + 3).coordinate)
\ No newline at end of file
@@ -1,5 +1,12 @@
-from Ui.MainWindow import MainWindow
+import sys
 
 if __name__ == "__main__":
+    # Any command-line arguments -> headless batch mode (Tk is never imported)
+    if len(sys.argv) > 1:
+        from SalesResultCli import main
+        sys.exit(main(sys.argv[1:]))
+
+    from Ui.MainWindow import MainWindow
+
     app = MainWindow()
     app.mainloop()
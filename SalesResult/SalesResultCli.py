@@ -0,0 +1,156 @@
+import argparse
+import glob
+import json
+import os
+import sys
+
+
+def _expand_inputs(patterns: list) -> list:
+    """Expands glob patterns and directories (Windows shells do not expand globs)."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "*.csv"))))
+            continue
+
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Defines the sub-commands. Core modules are imported lazily by each command."""
+    parser = argparse.ArgumentParser(
+        prog="SalesResultCli",
+        description="SalesResult batch analytics without the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="Generate Excel reports (and charts) for CSV files.")
+    report.add_argument("inputs", nargs="+", help="CSV files, glob patterns or directories.")
+    report.add_argument("-o", "--output", default="reports", help="Output directory (default: reports).")
+    report.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count).")
+    report.add_argument("--no-charts", action="store_true", help="Skip the overview PNG per file.")
+    report.add_argument("--enrich", default=None, metavar="FILE",
+                        help="Enrichment file (JSON list of lookup CSVs) applied to every input, "
+                             "e.g. FX rates or a category mapping.")
+    report.add_argument("--summary", default=None,
+                        help="Also write the JSON summary to this file (it is always printed to stdout).")
+
+    serve = commands.add_parser("serve", help="Run the local HTTP/JSON analytics service.")
+    serve.add_argument("inputs", nargs="*", help="CSV files, glob patterns or directories to preload.")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765).")
+    serve.add_argument("-w", "--workers", type=int, default=None,
+                       help="Worker threads for parsing and aggregation (default: CPU count).")
+    serve.add_argument("--cache-size", type=int, default=256,
+                       help="Cached query results kept in memory (default: 256).")
+    serve.add_argument("--memory-budget", type=int, default=None, metavar="MB",
+                       help="Dataset memory before the least recently used are spilled to disk "
+                            "(default: $SALESRESULT_MEMORY_BUDGET_MB or 2048).")
+
+    schedule = commands.add_parser("schedule", help="Regenerate reports on cron-like schedules, skipping unchanged inputs.")
+    schedule.add_argument("jobs", help="Job definition file (JSON).")
+    schedule.add_argument("--once", action="store_true",
+                          help="Run the jobs now (unchanged ones are skipped) and exit instead of waiting for schedules.")
+    schedule.add_argument("--force", action="store_true",
+                          help="With --once: rebuild even if nothing changed.")
+    schedule.add_argument("--job", action="append", default=None, metavar="NAME",
+                          help="With --once: run only this job (repeatable).")
+    schedule.add_argument("--state-dir", default=None,
+                          help="Directory for fingerprints, cached aggregates and the run log "
+                               "(default: <jobs file>.state).")
+
+    return parser
+
+
+def _run_report(args) -> int:
+    """Runs the batch report pipeline and prints the JSON summary."""
+    from Core.BatchReport import BatchReport
+
+    paths = _expand_inputs(args.inputs)
+    summary = BatchReport(args.output, workers=args.workers, charts=not args.no_charts, enrich=args.enrich).run(paths)
+
+    text = json.dumps(summary, indent=2)
+    print(text)
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as handle:
+            handle.write(text)
+
+    return 0 if summary["ok"] else 1
+
+
+def _run_serve(args) -> int:
+    """Runs the analytics service until interrupted (Ctrl+C)."""
+    import asyncio
+    from Core.AnalyticsServer import AnalyticsServer
+
+    paths = _expand_inputs(args.inputs)
+    preload = {os.path.splitext(os.path.basename(path))[0]: path for path in paths}
+
+    budget = args.memory_budget * 1024 ** 2 if args.memory_budget else None
+    server = AnalyticsServer(args.host, args.port, workers=args.workers, cache_size=args.cache_size,
+                             memory_budget=budget)
+
+    async def serve():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}/ (Ctrl+C to stop)", file=sys.stderr)
+        await server.serve_forever(preload)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run_schedule(args) -> int:
+    """Runs scheduled report jobs, printing one JSON run record per job to stdout."""
+    from Core.ReportScheduler import ReportScheduler
+
+    scheduler = ReportScheduler(args.jobs, state_dir=args.state_dir)
+
+    def show(record):
+        print(json.dumps(record), flush=True)
+
+    if args.once:
+        try:
+            records = scheduler.run(args.job, force=args.force)
+        except KeyError as e:
+            print(e.args[0], file=sys.stderr)
+            return 2
+        for record in records:
+            show(record)
+        return 0 if all(record["status"] != "error" for record in records) else 1
+
+    print(f"Running {len(scheduler.jobs)} job(s) from {scheduler.definition_path} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        scheduler.run_forever(on_record=show)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None) -> int:
+    """
+    Parses arguments and runs the requested command.
+
+    Returns:
+        int: Process exit code – 0 on success, 1 if any input failed, 2 on usage errors.
+    """
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "report":
+        return _run_report(args)
+    if args.command == "serve":
+        return _run_serve(args)
+    if args.command == "schedule":
+        return _run_schedule(args)
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
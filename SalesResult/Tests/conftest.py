@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Core modules are imported as in the application: "from Core.X import X"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,59 @@
+import pytest
+
+from Core.CsvImport import CsvImport
+from Core.RowDeduplicator import RowDeduplicator
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def overlapping_files(tmp_path):
+    """Two exports sharing rows; the first has an extra column and the second a different column order."""
+    with_age = _write(
+        tmp_path / "with_age.csv",
+        "Date,Product_Category,Country,Customer_Age,Revenue\n"
+        "2024-01-01,Bikes,Poland,30,100\n"
+        "2024-01-02,Bikes,France,40,200\n"
+        "2024-01-02,Bikes,France,40,200\n",
+    )
+    without_age = _write(
+        tmp_path / "without_age.csv",
+        "Country,Date,Product_Category,Revenue\n"
+        "Spain,2024-01-03,Bikes,50\n"
+        "Spain,2024-01-03,Bikes,50.0\n"
+        "France,2024-01-02,Bikes,200\n",
+    )
+    return with_age, without_age
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_files_with_different_columns_are_deduplicated_as_concatenated(overlapping_files, reverse):
+    paths = list(overlapping_files)[::-1] if reverse else list(overlapping_files)
+    deduplicator = RowDeduplicator()
+
+    df = CsvImport().load_many(paths, deduplicator)
+
+    # One repeat in each file; the France row with an age differs from the one without (age is null there)
+    assert deduplicator.removed == 2
+    assert len(df) == 4
+    assert len(df.drop_duplicates()) == len(df)
+    assert sorted(df.columns) == ["Country", "Customer_Age", "Date", "Product_Category", "Revenue"]
+
+
+def test_named_key_columns_ignore_other_columns(overlapping_files):
+    deduplicator = RowDeduplicator(["Date", "Country"])
+
+    df = CsvImport().load_many(list(overlapping_files), deduplicator)
+
+    assert deduplicator.removed == 3
+    assert sorted(df["Country"]) == ["France", "Poland", "Spain"]
+
+
+def test_named_key_column_missing_from_a_file_raises(overlapping_files):
+    deduplicator = RowDeduplicator(["Date", "Customer_Age"])
+
+    with pytest.raises(KeyError, match="Customer_Age"):
+        CsvImport().load_many(list(overlapping_files), deduplicator)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnWidthEstimator:
+    """
+    Szybkie szacowanie szerokości kolumn tabeli (Treeview) na podstawie fontu.
+
+    Zamiast wołać font.measure(...) dla każdej komórki (każde wywołanie to
+    osobny round-trip do Tk), korzystamy z:
+    - długości tekstów liczonych wektorowo w pandas (str.len),
+    - tablicy szerokości znaków (cache: znak -> px), uzupełnianej leniwie.
+
+    Szerokość w px liczymy tylko dla kilku najdłuższych „kandydatów” w każdej kolumnie.
+    """
+
+    def __init__(self, font, padding: int = 24, min_width: int = 110, max_width: int = 420,
+                 sample_rows: int = 200, candidates: int = 3):
+        """
+        Args:
+            font: obiekt tkfont.Font (tworzony raz przez widok)
+            padding: margines doliczany do szerokości tekstu (px)
+            min_width / max_width: ograniczenia szerokości kolumny (px)
+            sample_rows: ile pierwszych wierszy bierzemy do próbki
+            candidates: ilu najdłuższych tekstów na kolumnę mierzymy dokładnie
+        """
+        self.font = font
+        self.padding = padding
+        self.min_width = min_width
+        self.max_width = max_width
+        self.sample_rows = sample_rows
+        self.candidates = candidates
+
+        # Cache szerokości znaków: font.measure wołamy raz na znak
+        self._char_widths = {}
+
+    def text_width(self, text: str) -> int:
+        """
+        Szerokość tekstu (px) jako suma szerokości znaków z cache.
+        """
+        widths = self._char_widths
+        total = 0
+        for ch in text:
+            w = widths.get(ch)
+            if w is None:
+                w = widths[ch] = self.font.measure(ch)
+            total += w
+
+            # Dalsze liczenie nic nie zmieni – kolumna i tak zostanie przycięta
+            if total >= self.max_width:
+                break
+        return total
+
+    def estimate(self, df: pd.DataFrame) -> dict:
+        """
+        Wylicza szerokości wszystkich kolumn na podstawie nagłówka i próbki wierszy.
+
+        Returns:
+            dict: nazwa kolumny -> szerokość w px (już ograniczona do min/max)
+        """
+        sample = df.head(self.sample_rows)
+        widths = {}
+
+        for col_i, col in enumerate(df.columns):
+            width = self.text_width(str(col)) + self.padding
+
+            if len(sample):
+                # Długości wszystkich tekstów w próbce – wektorowo, bez Tk
+                texts = sample.iloc[:, col_i].astype(str)
+                lengths = texts.str.len().to_numpy()
+
+                # Szerokość w px liczymy tylko dla kilku najdłuższych kandydatów
+                top = np.argsort(-lengths, kind="stable")[:self.candidates]
+                for text in texts.iloc[top]:
+                    width = max(width, self.text_width(text) + self.padding)
+
+            widths[col] = min(max(width, self.min_width), self.max_width)
+
+        return widths
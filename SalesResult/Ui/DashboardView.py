@@ -1,12 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import pandas as pd
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Warstwa logiki (Core) – zakładamy, że jest w PYTHONPATH
+from Core.Dataset import Dataset
 from Core.SalesAnalyzer import SalesAnalyzer
 from Core.SalesPlots import SalesPlots
 from Core.XlsxExport import XlsxExport
+from Core.ExportRegistry import ExportRegistry
+from Core.BackgroundJobs import BackgroundJobs, JobCancelled
+from Core.StageProfiler import profiler
 
 
 class DashboardView(tk.Frame):
@@ -38,6 +43,45 @@ class DashboardView(tk.Frame):
     FONT_BODY = ("Segoe UI", 10)
     FONT_KPI = ("Segoe UI", 18, "bold")
 
+    # Jak często (ms) odbieramy wyniki zadań w tle na wątku UI
+    JOB_POLL_MS = 100
+
+    # Opóźnienie (ms) odświeżenia po zmianie w comboboxach – szybkie zmiany łączymy w jedną
+    REFRESH_DELAY_MS = 150
+
+    # Parametry rysowania per widok: (sufiks tytułu, kolor słupków, obrót etykiet osi X)
+    VIEW_STYLES = {
+        "Category": ("by Product Category", "#60a5fa", 45),   # delikatny niebieski
+        "Country": ("by Country", "#22c55e", 45),              # delikatny zielony
+        "Age Group": ("by Age Group", "#fb923c", 0),           # delikatny pomarańcz
+    }
+
+    # Typy wykresów: udziały przychodu (Pie/Bar) oraz rozkłady (SalesPlots.DISTRIBUTION_CHARTS)
+    CHART_TYPES = ("Pie Chart", "Bar Chart", "Histogram", "Box Plot")
+
+    # Kolumna histogramu per widok (domyślnie Revenue – wartości zamówień)
+    HISTOGRAM_COLUMNS = {"Age Group": "Customer_Age"}
+
+    # Układy dashboardu: None = jeden wykres wg comboboxów, albo (wiersze, kolumny, panele).
+    # Panel = (widok, typ wykresu); typ None oznacza “zgodnie z comboboxem Chart type”.
+    # Panele Pie/Bar korzystają z jednej wspólnej agregacji (SalesAnalyzer.get_full_report),
+    # rozkłady – z policzonych raz histogramów / podsumowań pięcioliczbowych.
+    PANEL_LAYOUTS = {
+        "Single chart": None,
+        "Overview (1×3)": (1, 3, [("Category", None), ("Country", None), ("Age Group", None)]),
+        "Detailed (2×3)": (2, 3, [
+            ("Category", "Pie Chart"), ("Country", "Pie Chart"), ("Age Group", "Pie Chart"),
+            ("Category", "Bar Chart"), ("Country", "Bar Chart"), ("Age Group", "Bar Chart"),
+        ]),
+        "Distributions (2×2)": (2, 2, [
+            ("Category", "Box Plot"), ("Country", "Box Plot"),
+            ("Category", "Histogram"), ("Age Group", "Histogram"),
+        ]),
+    }
+
+    # Klucz w cache oznaczający pełny raport (wszystkie widoki z jednego przebiegu)
+    FULL_REPORT = "*"
+
     def __init__(self, parent):
         super().__init__(parent, bg=self.BG_APP)
 
@@ -51,9 +95,25 @@ class DashboardView(tk.Frame):
         # exporter: zapis do Excel
         self.xlsx_export = XlsxExport()
 
+        # exporters: wybór formatu eksportu po rozszerzeniu pliku (xlsx/csv/parquet/jsonl/arrow)
+        self.exporters = ExportRegistry.default()
+
+        # jobs: kolejka eksportów w tle (1 worker -> eksporty wykonują się po kolei)
+        self.jobs = BackgroundJobs(max_workers=1)
+        self._cancelled_exports = 0       # anulowane eksporty od ostatniego komunikatu (jeden komunikat na "Cancel")
+
         # -------------------- Stan widoku --------------------
-        self.current_df = None            # aktualny DataFrame z danymi
+        self.dataset = None               # aktualne dane (Dataset – niezmienny uchwyt z numerem wersji)
         self.current_chart_data = None    # aktualna agregacja (do exportu)
+        self.aggregates = {}              # cache agregacji dla dataset: view_mode -> Series
+
+        # Odświeżanie wykresu: debounce + agregacje liczone w tle
+        self.compute_jobs = BackgroundJobs(max_workers=1)
+        self._refresh_after_id = None     # zaplanowane odświeżenie (after)
+        self._refresh_needs_data = False  # czy od ostatniego odświeżenia zmieniono “Group by”
+        self._refresh_generation = 0      # numer najnowszego zlecenia agregacji
+        self._pending_view = None         # widok, którego agregacja jest właśnie liczona
+        self._aggregation_job = None
 
         # Konfigurujemy style + budujemy UI
         self._configure_styles()
@@ -63,6 +123,9 @@ class DashboardView(tk.Frame):
         self._set_export_enabled(False)
         self._show_empty_state(True)
 
+        # Pętla odbierająca wyniki zadań w tle (callbacki wykonują się na wątku Tk)
+        self.after(self.JOB_POLL_MS, self._poll_jobs)
+
     # ====================================================================
     #                               STYLE
     # ====================================================================
@@ -185,11 +248,29 @@ class DashboardView(tk.Frame):
             textvariable=self.chart_type_var,
             state="readonly",
             width=18,
-            values=("Pie Chart", "Bar Chart"),
+            values=self.CHART_TYPES,
             style="Pro.TCombobox",
         )
         self.combo_chart.pack(anchor="w", pady=(4, 0))
-        self.combo_chart.bind("<<ComboboxSelected>>", self.refresh_chart)
+        self.combo_chart.bind("<<ComboboxSelected>>", self.on_chart_type_change)
+
+        # Wybór układu (jeden wykres / siatka paneli)
+        lay = tk.Frame(controls, bg=self.BG_CARD)
+        lay.pack(side=tk.LEFT, padx=(0, 14))
+
+        tk.Label(lay, text="Layout", font=self.FONT_BODY, bg=self.BG_CARD, fg=self.MUTED).pack(anchor="w")
+
+        self.layout_var = tk.StringVar(value="Single chart")
+        self.combo_layout = ttk.Combobox(
+            lay,
+            textvariable=self.layout_var,
+            state="readonly",
+            width=18,
+            values=tuple(self.PANEL_LAYOUTS),
+            style="Pro.TCombobox",
+        )
+        self.combo_layout.pack(anchor="w", pady=(4, 0))
+        self.combo_layout.bind("<<ComboboxSelected>>", self.refresh_chart)
 
         # -------------------- Actions (po prawej) --------------------
         actions = tk.Frame(self.toolbar, bg=self.BG_CARD)
@@ -198,12 +279,48 @@ class DashboardView(tk.Frame):
         # Przycisk exportu (na starcie disabled)
         self.btn_export = ttk.Button(
             actions,
-            text="⬇ Export to Excel",
+            text="⬇ Export",
             command=self.export_click,
             style="Primary.TButton",
         )
         self.btn_export.pack(side=tk.RIGHT, padx=(8, 0))
 
+        # Eksport pełnego raportu (wszystkie wymiary w jednym pliku)
+        self.btn_export_report = ttk.Button(
+            actions,
+            text="⬇ Full report",
+            command=self.export_report_click,
+            style="Ghost.TButton",
+        )
+        self.btn_export_report.pack(side=tk.RIGHT, padx=(8, 0))
+
+        # Wskaźnik postępu eksportu w tle (widoczny tylko gdy trwa eksport)
+        self.job_panel = tk.Frame(actions, bg=self.BG_CARD)
+        self._job_panel_visible = False
+
+        self.lbl_job = tk.Label(
+            self.job_panel,
+            text="",
+            font=self.FONT_BODY,
+            bg=self.BG_CARD,
+            fg=self.MUTED,
+        )
+        self.lbl_job.pack(anchor="w")
+
+        job_row = tk.Frame(self.job_panel, bg=self.BG_CARD)
+        job_row.pack(anchor="w", pady=(4, 0))
+
+        self.job_progress = ttk.Progressbar(job_row, mode="determinate", length=140, maximum=1.0)
+        self.job_progress.pack(side=tk.LEFT)
+
+        self.btn_job_cancel = ttk.Button(
+            job_row,
+            text="✕ Cancel",
+            command=self.cancel_exports_click,
+            style="Ghost.TButton",
+        )
+        self.btn_job_cancel.pack(side=tk.LEFT, padx=(8, 0))
+
         # ===================== Plot card =====================
         self.plot_card = tk.Frame(
             self.container,
@@ -231,21 +348,23 @@ class DashboardView(tk.Frame):
         self.empty_state = tk.Frame(self.canvas_host, bg=self.BG_CARD)
         self.empty_state.place(relx=0.5, rely=0.5, anchor="center")
 
-        tk.Label(
+        self.lbl_empty_title = tk.Label(
             self.empty_state,
             text="No data yet",
             font=self.FONT_H1,
             bg=self.BG_CARD,
             fg=self.TEXT,
-        ).pack(pady=(0, 6))
+        )
+        self.lbl_empty_title.pack(pady=(0, 6))
 
-        tk.Label(
+        self.lbl_empty_text = tk.Label(
             self.empty_state,
             text="Import a CSV in the Home tab to generate charts.",
             font=self.FONT_BODY,
             bg=self.BG_CARD,
             fg=self.MUTED,
-        ).pack()
+        )
+        self.lbl_empty_text.pack()
 
         # -------------------- Matplotlib embed --------------------
         # Dopasowujemy tło figury do karty (estetyka)
@@ -261,25 +380,75 @@ class DashboardView(tk.Frame):
     #                              PUBLIC API
     # ====================================================================
 
-    def render(self, df):
+    def render(self, dataset, report=None):
         """
         Publiczna metoda wywoływana z MainWindow po imporcie danych.
         Ustawia:
-        - current_df,
+        - dataset (Dataset albo DataFrame – ten drugi zostaje opakowany),
+        - raport policzony już w tle przy imporcie (zapamiętany w Dataset),
         - KPI (total revenue),
         - rysuje wykres.
+
+        Zbiór bez kolumny Revenue (np. inna tabela z biblioteki) nie ma KPI ani wykresów:
+        dashboard czyści poprzednie dane i pokazuje komunikat “No Revenue column”.
         """
-        self.current_df = df
+        if not isinstance(dataset, Dataset):
+            dataset = Dataset(dataset)
+        if report:
+            dataset.derived("full_report", lambda: report)
+
+        # Nowe dane -> nowy cache agregacji; wyniki liczone dla starych danych są odrzucane
+        self.aggregates = dict(report or {})
+        self._refresh_generation += 1
+        self._pending_view = None
+
+        if "Revenue" not in dataset.columns:
+            self.dataset = None
+            self.current_chart_data = None
+            self.lbl_revenue.config(text="—")
+            self._set_export_enabled(False)
+            self._show_empty_state(
+                True,
+                title="No Revenue column",
+                text="This dataset has no Revenue column, so there is nothing to chart.",
+            )
+            return
+
+        self.dataset = dataset
 
         # Liczymy przychód łączny (KPI)
-        total_rev = self.analyzer.calculate_total_revenue(df)
+        total_rev = self.analyzer.calculate_total_revenue(dataset)
         self.lbl_revenue.config(text=f"${total_rev:,.0f}")
 
         # Ukrywamy “empty state”, bo mamy dane
         self._show_empty_state(False)
 
-        # Rysujemy wykres zgodnie z aktualnymi ustawieniami comboboxów
-        self.draw_plot()
+        # Rysujemy wykres zgodnie z aktualnymi ustawieniami comboboxów (bez opóźnienia)
+        self.request_refresh(data_changed=True, delay_ms=0)
+
+    def session_state(self) -> dict:
+        """
+        Ustawienia dashboardu zapisywane w pliku sesji (SessionSnapshot).
+        """
+        return {
+            "data_view": self.data_view_var.get(),
+            "chart_type": self.chart_type_var.get(),
+            "layout": self.layout_var.get(),
+        }
+
+    def apply_session_state(self, state: dict) -> None:
+        """
+        Przywraca ustawienia z pliku sesji (przed render – wykres od razu rysuje się w zapisanym układzie).
+        Nieznane wartości (np. z innej wersji aplikacji) są pomijane.
+        """
+        for key, var, allowed in (
+            ("data_view", self.data_view_var, self.VIEW_STYLES),
+            ("chart_type", self.chart_type_var, self.CHART_TYPES),
+            ("layout", self.layout_var, self.PANEL_LAYOUTS),
+        ):
+            value = state.get(key)
+            if value in allowed:
+                var.set(value)
 
     # ====================================================================
     #                              INTERNALS
@@ -287,11 +456,18 @@ class DashboardView(tk.Frame):
 
     def refresh_chart(self, event=None):
         """
-        Callback od comboboxów:
-        po zmianie “Group by” lub “Chart type” odświeżamy wykres.
+        Callback od comboboxa “Group by”:
+        zmiana danych -> planujemy odświeżenie (ew. nowa agregacja w tle).
         """
-        if self.current_df is not None:
-            self.draw_plot()
+        self.request_refresh(data_changed=True)
+
+    def on_chart_type_change(self, event=None):
+        """
+        Callback od comboboxa “Chart type”:
+        - Pie/Bar: zmiana tylko prezentacji -> przerysowanie z cache, bez ponownej agregacji,
+        - Histogram/Box Plot: potrzebne podsumowanie rozkładu (liczone raz, potem z cache).
+        """
+        self.request_refresh(data_changed=self.chart_type_var.get() in SalesPlots.DISTRIBUTION_CHARTS)
 
     def _set_export_enabled(self, enabled: bool) -> None:
         """
@@ -305,11 +481,21 @@ class DashboardView(tk.Frame):
         except Exception:
             pass
 
-    def _show_empty_state(self, show: bool) -> None:
+        # Raport zależy tylko od danych, nie od bieżącej agregacji
+        report_state = "normal" if self.dataset is not None else "disabled"
+        try:
+            self.btn_export_report.configure(state=report_state)
+        except Exception:
+            pass
+
+    def _show_empty_state(self, show: bool, title: str = "No data yet",
+                          text: str = "Import a CSV in the Home tab to generate charts.") -> None:
         """
-        Pokazuje/ukrywa ekran “No data yet” w obszarze wykresu.
+        Pokazuje/ukrywa ekran “No data yet” w obszarze wykresu (albo inny komunikat, np. brak Revenue).
         """
         if show:
+            self.lbl_empty_title.config(text=title)
+            self.lbl_empty_text.config(text=text)
             self.empty_state.lift()
             self.empty_state.place(relx=0.5, rely=0.5, anchor="center")
         else:
@@ -317,46 +503,252 @@ class DashboardView(tk.Frame):
 
     def draw_plot(self):
         """
-        Główna metoda “renderowania wykresu”:
-        1) wybiera agregację (Category / Country / Age Group),
-        2) ustawia parametry rysowania (kolor, obrót etykiet),
-        3) aktualizuje stan current_chart_data (do exportu),
-        4) deleguje rysowanie do SalesPlots.draw(...)
+        Synchroniczne “renderowanie wykresu” (bez debounce):
+        1) bierze agregacje z cache albo liczy je od razu (Category / Country / Age Group),
+        2) deleguje prezentację do _present_current() (jeden wykres lub panele).
         """
-        view_mode = self.data_view_var.get()
-        chart_type = self.chart_type_var.get()
-
         # Jeśli nie mamy danych, nie renderujemy nic
-        if self.current_df is None:
+        if self.dataset is None:
             self._set_export_enabled(False)
             self._show_empty_state(True)
             return
 
-        # -------------------- Wybór agregacji --------------------
+        view_mode = self._required_view()
+        if view_mode == self.FULL_REPORT:
+            self._store_report(self._aggregate(self.dataset, view_mode))
+        elif view_mode is not None:
+            self.aggregates[view_mode] = self._aggregate(self.dataset, view_mode)
+
+        self._present_current()
+
+    # ====================================================================
+    #                     ODŚWIEŻANIE (debounce + tło)
+    # ====================================================================
+
+    def request_refresh(self, data_changed: bool, delay_ms: int = None) -> None:
+        """
+        Planuje odświeżenie wykresu z opóźnieniem (debounce).
+        Kolejne wywołania w tym czasie są łączone w jedno – liczy się tylko
+        ostatni wybór w comboboxach.
+
+        data_changed:
+          - True  – zmiana “Group by” (może wymagać nowej agregacji),
+          - False – zmiana “Chart type” (tylko prezentacja, bez agregacji).
+        """
+        if self.dataset is None:
+            return
+
+        self._refresh_needs_data = self._refresh_needs_data or data_changed
+
+        if self._refresh_after_id is not None:
+            self.after_cancel(self._refresh_after_id)
+
+        delay = self.REFRESH_DELAY_MS if delay_ms is None else delay_ms
+        self._refresh_after_id = self.after(delay, self._run_refresh)
+
+    def _run_refresh(self) -> None:
+        """
+        Wykonuje zaplanowane odświeżenie:
+        - agregacja w cache -> od razu rysujemy (zmiana typu wykresu nigdy nie liczy danych),
+        - brak agregacji -> liczymy ją w tle, a wynik rysujemy po powrocie na wątek UI.
+        """
+        self._refresh_after_id = None
+        needs_data, self._refresh_needs_data = self._refresh_needs_data, False
+
+        if self.dataset is None:
+            return
+
+        view_mode = self._required_view()
+        if view_mode is None:
+            self._present_current()
+            return
+
+        # Sama zmiana prezentacji nigdy nie uruchamia agregacji; a jeśli ten widok
+        # jest już liczony w tle, jego wynik narysuje się z aktualnym typem wykresu
+        if not needs_data or self._pending_view == view_mode:
+            return
+
+        self._submit_aggregation(view_mode)
+
+    def _submit_aggregation(self, view_mode: str) -> None:
+        """
+        Liczy agregację w tle. Każde zlecenie dostaje numer generacji – wynik
+        starszego zlecenia (inny wybór / inne dane) jest odrzucany jako nieaktualny.
+        """
+        if self._aggregation_job is not None:
+            self._aggregation_job.cancel()
+
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        dataset = self.dataset
+
+        self._pending_view = view_mode
+        self._aggregation_job = self.compute_jobs.submit(
+            lambda job: self._aggregate(dataset, view_mode),
+            title=f"Aggregating {' '.join(view_mode) if isinstance(view_mode, tuple) else view_mode}",
+            on_done=lambda data: self._on_aggregation_done(generation, dataset, view_mode, data),
+            on_error=lambda e: self._on_aggregation_error(generation, e),
+        )
+
+    def _on_aggregation_done(self, generation: int, dataset, view_mode: str, data) -> None:
+        """
+        Wynik agregacji z tła (na wątku UI). Nieaktualne wyniki pomijamy.
+        Układ paneli może potrzebować kilku agregacji – liczymy je po kolei.
+        """
+        if self.dataset is None or dataset.version != self.dataset.version:
+            return
+
+        # Agregacja dla tych samych danych zawsze jest poprawna – zachowujemy ją w cache
+        if view_mode == self.FULL_REPORT:
+            self._store_report(data)
+        else:
+            self.aggregates[view_mode] = data
+
+        if generation != self._refresh_generation:
+            return
+
+        self._pending_view = None
+        self._aggregation_job = None
+
+        missing = self._required_view()
+        if missing is None:
+            self._present_current()
+        else:
+            self._submit_aggregation(missing)
+
+    def _on_aggregation_error(self, generation: int, error: Exception) -> None:
+        if generation != self._refresh_generation:
+            return
+
+        self._pending_view = None
+        self._aggregation_job = None
+        messagebox.showerror("Error", f"Failed to compute chart data:\n{error}")
+
+    def _required_view(self):
+        """
+        Zwraca agregację, której brakuje do narysowania bieżącego układu:
+        - None – wszystko jest w cache,
+        - klucz agregacji (_aggregate_key) – tryb jednego wykresu albo brakujący rozkład panelu,
+        - FULL_REPORT – brakujące udziały w trybie paneli (jeden przebieg liczy wszystkie widoki naraz).
+        """
+        chart_type = self.chart_type_var.get()
+        layout = self.PANEL_LAYOUTS.get(self.layout_var.get())
+        if layout is None:
+            key = self._aggregate_key(self.data_view_var.get(), chart_type)
+            return None if key in self.aggregates else key
+
+        keys = [self._aggregate_key(view, panel_chart or chart_type) for view, panel_chart in layout[2]]
+        missing = [key for key in keys if key not in self.aggregates]
+        if not missing:
+            return None
+        if any(key in self.VIEW_STYLES for key in missing):
+            return self.FULL_REPORT
+        return missing[0]
+
+    def _aggregate_key(self, view: str, chart_type: str):
+        """
+        Klucz agregacji w cache: nazwa widoku dla udziałów (Pie/Bar),
+        (typ wykresu, widok) dla rozkładów (Histogram/Box Plot).
+        """
+        if chart_type in SalesPlots.DISTRIBUTION_CHARTS:
+            return (chart_type, view)
+        return view
+
+    def _store_report(self, report: dict) -> None:
+        """
+        Zapisuje pełny raport w cache. Widoki, których nie da się policzyć
+        (np. brak kolumny Customer_Age), zapisujemy jako puste – panel pokaże “No data”.
+        """
+        self.aggregates.update(report)
+        for view in self.VIEW_STYLES:
+            self.aggregates.setdefault(view, pd.Series(dtype=float))
+
+    def _present_current(self) -> None:
+        """
+        Rysuje bieżący układ z cache: jeden wykres albo siatkę paneli.
+        """
+        layout = self.PANEL_LAYOUTS.get(self.layout_var.get())
+        view_mode = self.data_view_var.get()
+
+        if layout is None:
+            self._present_plot(view_mode, self.aggregates[self._aggregate_key(view_mode, self.chart_type_var.get())])
+        else:
+            self._present_panels(*layout)
+
+    def _present_panels(self, rows: int, cols: int, specs: list) -> None:
+        """
+        Rysuje siatkę paneli. Każdy panel ma klucz (dane, widok, typ wykresu) –
+        SalesPlots przerysowuje tylko panele, których klucz się zmienił.
+        """
+        chart_type = self.chart_type_var.get()
+        panels = []
+        for view, panel_chart in specs:
+            title_suffix, color, rotate_x = self.VIEW_STYLES[view]
+            panel_chart = panel_chart or chart_type
+            panels.append({
+                "key": (self.dataset.version, view, panel_chart),
+                "data": self.aggregates.get(self._aggregate_key(view, panel_chart)),
+                "chart_type": panel_chart,
+                "title_suffix": title_suffix,
+                "color": color,
+                "rotate_x": rotate_x,
+            })
+
+        self.plot_title.config(text="Sales Overview")
+
+        # Eksport dotyczy widoku wybranego w “Group by”
+        data = self.aggregates.get(self.data_view_var.get())
+        self.current_chart_data = data if data is not None and not data.empty else None
+        self._set_export_enabled(self.current_chart_data is not None)
+        self._show_empty_state(False)
+
+        if self.plotter.draw_panels(panels, rows, cols):
+            self._redraw_canvas()
+
+    def _redraw_canvas(self) -> None:
+        """
+        Odświeża canvas. Normalnie draw_idle (łączy kilka odświeżeń w jedno);
+        przy włączonym profilowaniu rasteryzujemy od razu, żeby zmierzyć koszt.
+        """
+        if profiler.enabled:
+            self.plotter.rasterize()
+        else:
+            self.canvas.draw_idle()
+
+    def _aggregate(self, dataset, view_mode: str):
+        """
+        Czysta agregacja (bez dostępu do widgetów – może działać w tle).
+        Pełny raport, rozkłady i przedziały wieku są zapamiętywane w Dataset.
+        """
+        if view_mode == self.FULL_REPORT:
+            return self.analyzer.get_full_report(dataset)
+        if isinstance(view_mode, tuple):
+            chart_type, view = view_mode
+            if chart_type == "Histogram":
+                return self.analyzer.get_histogram(dataset, self.HISTOGRAM_COLUMNS.get(view, "Revenue"), by=view)
+            return self.analyzer.get_box_summary(dataset, "Revenue", by=view)
         if view_mode == "Category":
-            data = self.analyzer.get_category_share(self.current_df)
-            title_suffix = "by Product Category"
-            color = "#60a5fa"  # delikatny niebieski
-            rotate_x = 45
-
-        elif view_mode == "Country":
-            data = self.analyzer.get_country_share(self.current_df)
-            title_suffix = "by Country"
-            color = "#22c55e"  # delikatny zielony
-            rotate_x = 45
-
-        else:  # "Age Group"
-            data = self.analyzer.get_age_group_share(self.current_df)
-            title_suffix = "by Age Group"
-            color = "#fb923c"  # delikatny pomarańcz
-            rotate_x = 0
-
-            # Jeśli brak danych (np. brak kolumny Customer_Age) – komunikat i brak exportu
-            if data is None or getattr(data, "empty", True):
-                messagebox.showwarning("No Data", "Column 'Customer_Age' not found or empty.")
-                self.current_chart_data = None
-                self._set_export_enabled(False)
-                return
+            return self.analyzer.get_category_share(dataset)
+        if view_mode == "Country":
+            return self.analyzer.get_country_share(dataset)
+        return self.analyzer.get_age_group_share(dataset)
+
+    def _present_plot(self, view_mode: str, data) -> None:
+        """
+        Prezentacja gotowej agregacji:
+        1) ustawia parametry rysowania (kolor, obrót etykiet),
+        2) aktualizuje stan current_chart_data (do exportu),
+        3) deleguje rysowanie do SalesPlots.draw(...)
+        """
+        chart_type = self.chart_type_var.get()
+        title_suffix, color, rotate_x = self.VIEW_STYLES.get(view_mode, self.VIEW_STYLES["Age Group"])
+
+        # Jeśli brak danych (np. brak kolumny Customer_Age) – komunikat i brak exportu
+        if view_mode == "Age Group" and (data is None or getattr(data, "empty", True)):
+            messagebox.showwarning("No Data", "Column 'Customer_Age' not found or empty.")
+            self.current_chart_data = None
+            self._set_export_enabled(False)
+            return
 
         # Jeśli agregacja jest pusta – pokaż empty state i zablokuj export
         if data is None or getattr(data, "empty", True):
@@ -368,11 +760,12 @@ class DashboardView(tk.Frame):
         # -------------------- Aktualizacja UI --------------------
         self.plot_title.config(text=f"Sales Analysis {title_suffix}")
 
-        # Zapisujemy aktualną agregację do exportu
-        self.current_chart_data = data
+        # Zapisujemy aktualną agregację do exportu (eksport dotyczy udziałów – nie rozkładów)
+        distribution = chart_type in SalesPlots.DISTRIBUTION_CHARTS
+        self.current_chart_data = None if distribution else data
 
         # Skoro mamy dane → export dostępny + ukrywamy empty state
-        self._set_export_enabled(True)
+        self._set_export_enabled(not distribution)
         self._show_empty_state(False)
 
         # -------------------- Rysowanie wykresu --------------------
@@ -380,33 +773,157 @@ class DashboardView(tk.Frame):
         self.plotter.draw(data, chart_type, title_suffix, color, rotate_x)
 
         # Odświeżamy canvas w Tkinter
-        self.canvas.draw()
+        self._redraw_canvas()
 
     def export_click(self):
         """
         Obsługa eksportu:
-        - zapisuje aktualną agregację (current_chart_data) do pliku .xlsx
+        - zapisuje aktualną agregację (current_chart_data) do pliku (.xlsx / .csv / .parquet / .jsonl / .arrow)
         - jeśli brak danych -> ostrzeżenie
         """
         if self.current_chart_data is None or getattr(self.current_chart_data, "empty", True):
             messagebox.showwarning("Export", "No data available to export.")
             return
 
-        # Okno wyboru ścieżki do zapisu
+        # Okno wyboru ścieżki do zapisu (format wynika z rozszerzenia)
         file_path = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            filetypes=self.exporters.filetypes() + [("All files", "*.*")],
             title="Save Analysis",
         )
 
         if not file_path:
             return
 
-        # Zapis przez warstwę Core (XlsxExport)
-        success, message = self.xlsx_export.save(self.current_chart_data, file_path)
+        exporter = self.exporters.exporter_for(file_path)
+        if exporter is None:
+            messagebox.showerror("Error", f"Unsupported file type:\n{file_path}")
+            return
+
+        # Zapis przez warstwę Core – w tle, UI pozostaje responsywne
+        data = self.current_chart_data
+        self._submit_export(
+            lambda job: exporter.save(
+                data, file_path, progress=job.set_progress, cancel_event=job.cancel_event
+            ),
+            title=f"Exporting {data.name or 'data'}",
+        )
 
-        # Komunikat po zapisie
+    def export_report_click(self):
+        """
+        Eksport pełnego raportu:
+        - liczy wszystkie agregacje (Category / Country / Age Group + cross-tab) w jednym przebiegu,
+        - zapisuje je do jednego pliku .xlsx z natywnymi wykresami Excela.
+        """
+        if self.dataset is None:
+            messagebox.showwarning("Export", "No data available to export.")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            title="Save Full Report",
+        )
+
+        if not file_path:
+            return
+
+        dataset = self.dataset
+
+        def work(job):
+            # Raport z importu jest zapamiętany w Dataset – liczony tylko, jeśli go brak
+            report = self.analyzer.get_full_report(dataset)
+            return self.xlsx_export.save_report(
+                report, file_path, progress=job.set_progress, cancel_event=job.cancel_event
+            )
+
+        self._submit_export(work, title="Exporting full report")
+
+    def cancel_exports_click(self):
+        """
+        Anuluje wszystkie eksporty (bieżący i oczekujące w kolejce).
+        """
+        self.jobs.cancel_all()
+        self.lbl_job.config(text="Cancelling...")
+
+    # ====================================================================
+    #                           BACKGROUND JOBS
+    # ====================================================================
+
+    def _submit_export(self, work, title: str) -> None:
+        """
+        Kolejkuje eksport w tle.
+        Wynik (success, message) wraca na wątek UI przez _poll_jobs.
+        """
+        def run(job):
+            success, message = work(job)
+            # Eksport przerwany przez użytkownika to nie błąd – zgłaszamy jako anulowanie
+            if not success and job.cancelled:
+                raise JobCancelled()
+            return success, message
+
+        job = self.jobs.submit(
+            run,
+            title=title,
+            on_done=self._on_export_done,
+            on_error=self._on_export_error,
+            on_progress=lambda fraction: self._on_export_progress(job, fraction),
+            on_cancel=self._on_export_cancelled,
+        )
+        self._update_job_indicator()
+
+    def _poll_jobs(self) -> None:
+        """
+        Odbiera zdarzenia zadań w tle (postęp / wynik) i planuje kolejne sprawdzenie.
+        """
+        self.compute_jobs.poll()
+        if self.jobs.poll() or self._job_panel_visible:
+            self._update_job_indicator()
+        self.after(self.JOB_POLL_MS, self._poll_jobs)
+
+    def _update_job_indicator(self) -> None:
+        """
+        Pokazuje/ukrywa pasek postępu w zależności od liczby zadań w kolejce.
+        """
+        jobs = self.jobs.active_jobs()
+        if not jobs:
+            self.job_panel.pack_forget()
+            self.job_progress.configure(value=0)
+            self._job_panel_visible = False
+            return
+
+        queued = len(jobs) - 1
+        text = jobs[0].title if not jobs[0].cancelled else "Cancelling..."
+        if queued:
+            text += f" (+{queued} queued)"
+
+        self.lbl_job.config(text=text)
+        self.job_progress.configure(value=jobs[0].progress)
+        if not self._job_panel_visible:
+            self.job_panel.pack(side=tk.RIGHT, padx=(8, 0))
+            self._job_panel_visible = True
+
+    def _on_export_progress(self, job, fraction: float) -> None:
+        # Pasek pokazuje tylko zadanie opisane w panelu (pierwsze w kolejce)
+        jobs = self.jobs.active_jobs()
+        if jobs and jobs[0] is job:
+            self.job_progress.configure(value=fraction)
+
+    def _on_export_done(self, result) -> None:
+        success, message = result
         if success:
             messagebox.showinfo("Success", message)
         else:
             messagebox.showerror("Error", f"Failed to save file:\n{message}")
+
+    def _on_export_error(self, error: Exception) -> None:
+        messagebox.showerror("Error", f"Failed to save file:\n{error}")
+
+    def _on_export_cancelled(self) -> None:
+        # "Cancel" anuluje całą kolejkę – jeden komunikat, gdy skończy się ostatni anulowany eksport
+        self._cancelled_exports += 1
+        if any(job.cancelled for job in self.jobs.active_jobs()):
+            return
+
+        count, self._cancelled_exports = self._cancelled_exports, 0
+        messagebox.showinfo("Export", "Export cancelled." if count == 1 else f"{count} exports cancelled.")
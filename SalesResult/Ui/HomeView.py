@@ -1,8 +1,24 @@
+import os
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import tkinter.font as tkfont
 
 from Core.CsvImport import CsvImport
+from Core.ColumnProfiler import ColumnProfiler
+from Core.RowDeduplicator import RowDeduplicator
+from Core.LookupEnricher import LookupEnricher
+from Core.Dataset import Dataset
+from Core.SalesAnalyzer import SalesAnalyzer
+from Core.BackgroundJobs import BackgroundJobs, JobCancelled
+from Core.ExportRegistry import ExportRegistry
+from Core.TableIndex import TableIndex
+from Core.MemoryGovernor import MemoryGovernor
+from Core.DatasetStore import DatasetStore, StoredTable
+from Core.SessionSnapshot import SessionSnapshot
+from Core.StageProfiler import profiler
+from Ui.ColumnWidthEstimator import ColumnWidthEstimator
+from Ui.StoredDatasetsDialog import StoredDatasetsDialog
 
 
 class HomeView(tk.Frame):
@@ -28,19 +44,89 @@ class HomeView(tk.Frame):
     FONT_BODY = ("Segoe UI", 10)
     FONT_BODY_B = ("Segoe UI", 10, "bold")
 
+    # Jak często (ms) odbieramy wyniki zadań w tle na wątku UI
+    JOB_POLL_MS = 100
+
+    # ===================== Wirtualizacja tabeli =====================
+    ROW_HEIGHT = 26        # wysokość wiersza Treeview (px) – musi zgadzać się ze stylem
+    ROW_BUFFER = 2         # dodatkowe wiersze ponad widoczne okno (częściowo widoczny dół)
+
+    # Jak często (ms) odświeżamy licznik pamięci w pasku statusu
+    MEMORY_POLL_MS = 2000
+
+    # Opóźnienie (ms) wyszukiwania po wpisaniu znaku – nie liczymy przy każdym klawiszu
+    SEARCH_DELAY_MS = 300
+
+    # Opcje “Show rows”
+    ROW_LIMITS = ("10", "100", "1000", "All")
+
+    # Kolumny panelu “Column profile”: (klucz, nagłówek, szerokość px)
+    PROFILE_COLUMNS = [
+        ("column", "Column", 160),
+        ("dtype", "Type", 80),
+        ("nulls", "Nulls", 110),
+        ("distinct", "Distinct", 90),
+        ("min", "Min", 120),
+        ("max", "Max", 120),
+        ("mean", "Mean", 100),
+        ("top", "Top values", 360),
+    ]
+
+    # Wysokość (w wierszach) panelu “Column profile”
+    PROFILE_ROWS = 5
+
     def __init__(self, parent, on_data_loaded_callback):
         """
         Args:
             parent: Kontener nadrzędny (np. Notebook lub Frame)
-            on_data_loaded_callback: callback wywoływany po wczytaniu danych (df)
+            on_data_loaded_callback: callback wywoływany po wczytaniu danych (dataset, report)
         """
         super().__init__(parent, bg=self.BG_APP)
 
         # Callback do przekazania danych dalej (np. do Dashboardu)
         self.on_data_loaded = on_data_loaded_callback
 
-        # Przechowujemy pełny DataFrame po imporcie
+        # Dane po imporcie: uchwyt Dataset (wersja + zapamiętane pochodne) i jego DataFrame
+        self.dataset = None
         self.full_data = None
+        self.source_path = None    # plik (albo zbiór z biblioteki), z którego pochodzą dane
+
+        # Biblioteka zbiorów w SQLite (tworzona przy pierwszym użyciu)
+        self.store = None
+        self.stored_table = None   # stronicowany podgląd zbioru z biblioteki (do czasu wczytania całości)
+
+        # Wirtualizacja podglądu: Treeview trzyma tylko widoczne okno wierszy
+        self.view_data = None      # DataFrame aktualnie przeglądany w tabeli
+        self.view_positions = None # pozycje wierszy view_data po sortowaniu/wyszukiwaniu (None = wszystkie)
+        self.view_offset = 0       # pozycja pierwszego widocznego wiersza
+        self.visible_rows = 20     # ile wierszy mieści się w tabeli (przeliczane przy resize)
+        self._row_items = []       # pula identyfikatorów wierszy Treeview (reużywanych)
+        self._grid_columns = []    # kolumny aktualnie ustawione w Treeview
+
+        # Sortowanie / wyszukiwanie: indeks z cache permutacji (tworzony po imporcie)
+        self.table_index = None
+        self.sort_column = None
+        self.sort_ascending = True
+        self._search_after_id = None
+
+        # Eksport surowych wierszy (csv/parquet/jsonl/arrow) wykonywany w tle
+        self.exporters = ExportRegistry.default()
+        self.jobs = BackgroundJobs(max_workers=1)
+        self._export_jobs = set()  # eksporty wierszy w kolejce / w toku (przycisk "Cancel")
+
+        # Wersja profilera, dla której pokazano podsumowanie (odświeżamy tylko po zmianie)
+        self._profile_version = None
+
+        # Import CSV w tle: osobna kolejka, żeby eksport nie blokował importu
+        self.analyzer = SalesAnalyzer()
+        self.column_profiler = ColumnProfiler()
+        self.import_jobs = BackgroundJobs(max_workers=1)
+        self._import_job = None    # aktualny (najnowszy) import – starsze są anulowane
+
+        # Budżet pamięci: zbiory ponad limit są zrzucane do pliku i mapowane z dysku
+        self.memory = MemoryGovernor()
+        self._memory_text = None
+        self._memory_polled = 0.0
 
         # Konfigurujemy style TTK (ładniejszy wygląd)
         self._configure_styles()
@@ -51,6 +137,14 @@ class HomeView(tk.Frame):
         # Stan początkowy (status + “pusty ekran” w tabeli)
         self._set_status("Ready to load data...", kind="info")
         self._show_table_empty_state(True)
+        self.btn_export_rows.configure(state="disabled")
+        self.btn_cancel_export.configure(state="disabled")
+        self.btn_save_dataset.configure(state="disabled")
+        self.btn_enrich.configure(state="disabled")
+        self.btn_save_trace.configure(state="disabled")
+
+        # Pętla odbierająca wyniki zadań w tle (callbacki wykonują się na wątku Tk)
+        self.after(self.JOB_POLL_MS, self._poll_jobs)
 
     # ====================================================================
     #                               STYLE
@@ -86,7 +180,7 @@ class HomeView(tk.Frame):
         style.configure(
             "Pro.Treeview",
             font=self.FONT_BODY,
-            rowheight=26,
+            rowheight=self.ROW_HEIGHT,
             background="#ffffff",
             fieldbackground="#ffffff",
             borderwidth=0,
@@ -175,6 +269,20 @@ class HomeView(tk.Frame):
         )
         self.btn_import.pack(side=tk.LEFT)
 
+        # Usuwanie powtórzonych wierszy przy imporcie (np. nakładające się eksporty miesięczne)
+        self.dedup_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            controls,
+            text="Drop duplicates",
+            variable=self.dedup_var,
+            bg=self.BG_CARD,
+            activebackground=self.BG_CARD,
+            fg=self.MUTED,
+            font=self.FONT_BODY,
+            bd=0,
+            highlightthickness=0,
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
         # Odstęp wizualny
         tk.Frame(controls, bg=self.BG_CARD, width=18).pack(side=tk.LEFT)
 
@@ -193,12 +301,126 @@ class HomeView(tk.Frame):
             textvariable=self.row_limit_var,
             state="readonly",
             width=10,
-            values=["10", "100", "1000", "All"],
+            values=self.ROW_LIMITS,
             style="Pro.TCombobox",
         )
         self.combo_rows.pack(side=tk.LEFT, padx=(8, 0))
         self.combo_rows.bind("<<ComboboxSelected>>", self.on_row_limit_change)
 
+        # Odstęp wizualny
+        tk.Frame(controls, bg=self.BG_CARD, width=18).pack(side=tk.LEFT)
+
+        # Wyszukiwanie w podglądzie (filtr po wszystkich kolumnach)
+        tk.Label(
+            controls,
+            text="Search:",
+            bg=self.BG_CARD,
+            fg=self.MUTED,
+            font=self.FONT_BODY,
+        ).pack(side=tk.LEFT)
+
+        self.search_var = tk.StringVar(value="")
+        self.entry_search = ttk.Entry(controls, textvariable=self.search_var, width=24, font=self.FONT_BODY)
+        self.entry_search.pack(side=tk.LEFT, padx=(8, 0))
+        self.entry_search.bind("<KeyRelease>", self.on_search_change)
+        self.entry_search.bind("<Return>", lambda e: self.apply_search())
+        self.entry_search.bind("<Escape>", lambda e: self.clear_search())
+
+        # Eksport wszystkich wierszy do formatów „maszynowych” (po prawej)
+        self.btn_export_rows = ttk.Button(
+            controls,
+            text="⬇ Export rows",
+            command=self.export_rows_click,
+            style="Ghost.TButton",
+        )
+        self.btn_export_rows.pack(side=tk.RIGHT)
+
+        # Anulowanie eksportu wierszy (aktywny tylko, gdy eksport trwa)
+        self.btn_cancel_export = ttk.Button(
+            controls,
+            text="✕ Cancel",
+            command=self.cancel_export_click,
+            style="Ghost.TButton",
+        )
+        self.btn_cancel_export.pack(side=tk.RIGHT, padx=(0, 8))
+
+        # Biblioteka zbiorów (SQLite): zapis bieżących danych + lista zapisanych
+        self.btn_save_dataset = ttk.Button(
+            controls,
+            text="💾 Save",
+            command=self.save_dataset_click,
+            style="Ghost.TButton",
+        )
+        self.btn_save_dataset.pack(side=tk.RIGHT, padx=(0, 8))
+
+        self.btn_library = ttk.Button(
+            controls,
+            text="📚 Library",
+            command=self.library_click,
+            style="Ghost.TButton",
+        )
+        self.btn_library.pack(side=tk.RIGHT, padx=(0, 8))
+
+        # Wzbogacanie danych tabelami słownikowymi (kursy walut, mapowanie kategorii)
+        self.btn_enrich = ttk.Button(
+            controls,
+            text="🔗 Enrich",
+            command=self.enrich_click,
+            style="Ghost.TButton",
+        )
+        self.btn_enrich.pack(side=tk.RIGHT, padx=(0, 8))
+
+        # ===================== Column profile card =====================
+        # Pokazywana po wczytaniu danych (pack przed kartą tabeli – patrz _show_profile)
+        self.profile_card = tk.Frame(
+            self.container,
+            bg=self.BG_CARD,
+            highlightbackground=self.BORDER,
+            highlightthickness=1,
+        )
+
+        profile_header = tk.Frame(self.profile_card, bg=self.BG_CARD)
+        profile_header.pack(fill=tk.X, padx=14, pady=(10, 6))
+
+        tk.Label(
+            profile_header,
+            text="Column profile",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.BG_CARD,
+            fg=self.TEXT,
+        ).pack(side=tk.LEFT)
+
+        self.btn_profile_toggle = ttk.Button(
+            profile_header,
+            text="Hide",
+            command=self.toggle_profile_click,
+            style="Ghost.TButton",
+        )
+        self.btn_profile_toggle.pack(side=tk.RIGHT)
+
+        # Podsumowanie typu "5 columns · 12 nulls"
+        self.lbl_profile_info = tk.Label(
+            profile_header,
+            text="",
+            font=self.FONT_BODY,
+            bg=self.BG_CARD,
+            fg=self.MUTED,
+        )
+        self.lbl_profile_info.pack(side=tk.RIGHT, padx=(0, 12))
+
+        self.profile_tree = ttk.Treeview(
+            self.profile_card,
+            columns=[key for key, _, _ in self.PROFILE_COLUMNS],
+            show="headings",
+            height=self.PROFILE_ROWS,
+            selectmode="none",
+            style="Pro.Treeview",
+        )
+        for key, title, width in self.PROFILE_COLUMNS:
+            self.profile_tree.heading(key, text=title, anchor=tk.W)
+            self.profile_tree.column(key, width=width, minwidth=60, anchor=tk.W, stretch=(key == "top"))
+        self.profile_tree.pack(fill=tk.X, padx=14, pady=(0, 12))
+
         # ===================== Table card =====================
         self.table_card = tk.Frame(
             self.container,
@@ -244,9 +466,10 @@ class HomeView(tk.Frame):
         self.scroll_x = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL)
 
         # Treeview (tabela)
+        # Pionowy scroll NIE jest podpięty do tree.yview: Treeview zawiera tylko widoczne
+        # okno wierszy, a pozycję w całym zbiorze liczymy sami (wirtualizacja).
         self.tree = ttk.Treeview(
             table_frame,
-            yscrollcommand=self.scroll_y.set,
             xscrollcommand=self.scroll_x.set,
             style="Pro.Treeview",
         )
@@ -259,9 +482,28 @@ class HomeView(tk.Frame):
         self.scroll_y.grid(row=0, column=1, sticky="ns")
         self.scroll_x.grid(row=1, column=0, sticky="ew")
 
+        # Zebra striping (naprzemienne tła wierszy) – konfigurowane raz
+        self.tree.tag_configure("oddrow", background="#ffffff")
+        self.tree.tag_configure("evenrow", background="#f3f4f6")
+
+        # Font tabeli + estymator szerokości kolumn (cache szerokości znaków) – tworzone raz
+        self.tree_font = tkfont.Font(family="Segoe UI", size=10)
+        self.width_estimator = ColumnWidthEstimator(self.tree_font)
+
         # Podpinamy “sterowanie” scrollbary → tabela
-        self.scroll_y.config(command=self.tree.yview)
+        self.scroll_y.config(command=self._on_scroll_y)
         self.scroll_x.config(command=self.tree.xview)
+        self.scroll_y.set(0.0, 1.0)
+
+        # Przewijanie kółkiem / klawiaturą przesuwa okno danych, a nie elementy Treeview
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        self.tree.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_rows(3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_rows(-self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self._scroll_rows(self.visible_rows))
+        self.tree.bind("<Control-Home>", lambda e: self._scroll_to(0))
+        self.tree.bind("<Control-End>", lambda e: self._scroll_to(self._view_len()))
 
         # ===================== Empty state overlay =====================
         # Pokazywany gdy brak danych.
@@ -293,15 +535,62 @@ class HomeView(tk.Frame):
         )
         self.status_bar.pack(fill=tk.X, pady=(12, 0))
 
+        self.status_row = tk.Frame(self.status_bar, bg="#eef2ff")
+        self.status_row.pack(fill=tk.X)
+
+        # Profilowanie etapów (po prawej): zapis śladu + przełącznik
+        self.btn_save_trace = ttk.Button(
+            self.status_row,
+            text="Save trace",
+            command=self.save_trace_click,
+            style="Ghost.TButton",
+        )
+        self.btn_save_trace.pack(side=tk.RIGHT, padx=(0, 8), pady=4)
+
+        self.profiling_var = tk.BooleanVar(value=False)
+        self.chk_profiling = tk.Checkbutton(
+            self.status_row,
+            text="⏱ Profile",
+            variable=self.profiling_var,
+            command=self.on_profiling_toggle,
+            bg="#eef2ff",
+            activebackground="#eef2ff",
+            fg=self.MUTED,
+            font=self.FONT_BODY,
+            bd=0,
+            highlightthickness=0,
+        )
+        self.chk_profiling.pack(side=tk.RIGHT, padx=(0, 8))
+
+        # Zużycie pamięci przez dane (budżet MemoryGovernor)
+        self.lbl_memory = tk.Label(
+            self.status_row,
+            text="",
+            bg="#eef2ff",
+            fg=self.MUTED,
+            font=self.FONT_BODY,
+        )
+        self.lbl_memory.pack(side=tk.RIGHT, padx=(0, 12))
+
         self.lbl_status = tk.Label(
-            self.status_bar,
+            self.status_row,
             text="",
             bg="#eef2ff",
             fg=self.TEXT,
             font=self.FONT_BODY,
             anchor="w",
         )
-        self.lbl_status.pack(fill=tk.X, padx=12, pady=8)
+        self.lbl_status.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=12, pady=8)
+
+        # Podsumowanie ostatnich etapów (widoczne tylko przy włączonym profilowaniu)
+        self.lbl_profile = tk.Label(
+            self.status_bar,
+            text="",
+            bg="#eef2ff",
+            fg=self.MUTED,
+            font=self.FONT_BODY,
+            anchor="w",
+        )
 
     # ====================================================================
     #                              UX HELPERS
@@ -341,6 +630,9 @@ class HomeView(tk.Frame):
         icon = icon_map.get(kind, "")
 
         self.status_bar.config(bg=bg)
+        self.status_row.config(bg=bg)
+        self.chk_profiling.config(bg=bg, activebackground=bg)
+        self.lbl_profile.config(bg=bg)
         self.lbl_status.config(text=f"{icon}{text}", bg=bg, fg=fg)
 
     def _show_table_empty_state(self, show: bool) -> None:
@@ -359,100 +651,887 @@ class HomeView(tk.Frame):
 
     def import_click(self):
         """
-        1) Otwiera okno wyboru pliku CSV,
-        2) Ładuje dane przez CsvImport(),
-        3) Aktualizuje tabelę,
-        4) Wywołuje callback (przekazanie df do innych widoków).
+        1) Otwiera okno wyboru plików CSV (można zaznaczyć kilka – zostaną połączone),
+        2) Uruchamia import w tle (CsvImport + opcjonalnie usuwanie duplikatów + wstępne agregacje)
+           – UI nie blokuje się,
+        3) Po zakończeniu (_on_import_done, na wątku UI) aktualizuje tabelę
+           i wywołuje callback (przekazanie df do innych widoków).
+
+        Rozpoczęcie kolejnego importu anuluje poprzedni (jego wynik jest pomijany).
         """
-        path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
-        if not path:
+        paths = list(filedialog.askopenfilenames(filetypes=[("CSV Files", "*.csv")]))
+        if not paths:
             return
 
-        try:
-            # Blokujemy przycisk, żeby user nie kliknął 2x
-            self.btn_import.configure(state="disabled")
+        # Źródłem danych jest pierwszy plik; "N files" służy tylko do komunikatów
+        path = paths[0]
+        label = path if len(paths) == 1 else f"{len(paths)} files"
+        dedup = self.dedup_var.get()
 
-            # Status + odświeżenie UI (żeby komunikat się pokazał od razu)
-            self._set_status("Loading data...", kind="info")
-            self.update_idletasks()
+        # Poprzedni import (jeśli jeszcze trwa) przestaje być potrzebny
+        if self._import_job is not None:
+            self._import_job.cancel()
 
-            # Import danych
-            df = CsvImport().load(path)
-            self.full_data = df
+        self._set_status("Loading data...", kind="info")
 
-            # Odśwież tabelę
-            self.refresh_table_view()
+        def on_done(result):
+            self._on_import_done(job, path, result, label)
 
-            # Przekaż dane do reszty aplikacji (np. Dashboard)
-            self.on_data_loaded(df)
+        def on_error(error):
+            self._on_import_error(job, error)
 
-            # Komunikat o sukcesie
-            rows_count = len(df)
-            self._set_status(f"Loaded {rows_count:,} rows from {path}", kind="ok")
+        def on_progress(fraction):
+            if job is self._import_job:
+                self._set_status(f"Loading data... {fraction:.0%}", kind="info")
+
+        job = self.import_jobs.submit(
+            lambda j: self._import_worker(j, paths, dedup),
+            title=f"Importing {label}",
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=on_progress,
+        )
+        self._import_job = job
+
+    def _import_worker(self, job, paths: list, dedup: bool = False):
+        """
+        Praca wykonywana w tle (bez dostępu do widgetów Tk!):
+        - parsowanie CSV (z postępem i możliwością anulowania),
+        - kilka plików -> jeden zbiór; przy dedup powtórzone wiersze są usuwane
+          przyrostowo (po hashach wierszy, plik po pliku),
+        - profil kolumn (nulle, wartości unikalne, zakresy – zapamiętany w Dataset),
+        - wstępne agregacje dla dashboardu (jeden przebieg po danych).
+        """
+        deduplicator = RowDeduplicator() if dedup else None
+        df = CsvImport().load_many(
+            paths, deduplicator, progress=job.set_progress, cancel_event=job.cancel_event
+        )
+        if job.cancelled:
+            raise JobCancelled()
+
+        name = os.path.basename(paths[0])
+        if len(paths) > 1:
+            name += f" (+{len(paths) - 1} more)"
+
+        dataset = Dataset(df, name=name, source=paths[0])
+        if deduplicator is not None:
+            dataset.derived("duplicates_removed", lambda: deduplicator.removed)
+        self.column_profiler.profile(dataset)
+        report = self.analyzer.get_full_report(dataset) if "Revenue" in df.columns else {}
+        return dataset, report
+
+    def _on_import_error(self, job, error: Exception) -> None:
+        """
+        Błąd importu (wywoływane na wątku UI). Błędy starszych importów pomijamy.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        messagebox.showerror("Import Error", f"Failed to load CSV:\n{str(error)}")
+        self._set_status("Error loading data.", kind="err")
+
+    def _on_import_done(self, job, path: str, result, label: str = None) -> None:
+        """
+        Wynik importu (wywoływane na wątku UI): aktualizacja tabeli i przekazanie danych dalej.
+        Wyniki nieaktualnych (zastąpionych) importów są pomijane.
+        `path` zostaje źródłem danych, `label` (domyślnie path) trafia tylko do komunikatu.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        dataset, report = result
+
+        try:
+            self._show_dataset(dataset, report, path)
+
+            # Komunikat o sukcesie (+ liczba usuniętych duplikatów)
+            rows_count = len(dataset)
+            message = f"Loaded {rows_count:,} rows from {label or path}"
+            removed = dataset.cached("duplicates_removed")
+            if removed is not None:
+                message += f" ({removed:,} duplicate rows removed)"
+            self._set_status(message, kind="ok")
 
         except Exception as e:
             # Błąd importu
             messagebox.showerror("Import Error", f"Failed to load CSV:\n{str(e)}")
             self._set_status("Error loading data.", kind="err")
 
-        finally:
-            # Zawsze odblokuj przycisk na końcu
-            self.btn_import.configure(state="normal")
+    def _show_dataset(self, dataset, report, path: str, sort_column=None, sort_ascending: bool = True,
+                      notify: bool = True) -> None:
+        """
+        Ustawia nowe dane w widoku (import, biblioteka, sesja):
+        tabela podglądu + przekazanie Dataset i agregacji do reszty aplikacji
+        (notify=False – reszta aplikacji ma już ten Dataset, np. po wczytaniu zbioru z biblioteki).
+        """
+        df = dataset.frame
+
+        self.dataset = dataset
+        self.full_data = df
+        self.source_path = path
+        self._close_stored_table()
 
-    def on_row_limit_change(self, event=None):
+        # Indeks sortowania/wyszukiwania należy do tej wersji danych + stan podglądu (domyślnie bez sortowania)
+        self.table_index = dataset.derived("table_index", lambda: TableIndex(df))
+        self.sort_column = sort_column if sort_column in df.columns else None
+        self.sort_ascending = sort_ascending
+
+        # Odśwież tabelę
+        self.refresh_table_view()
+        self._update_sort_headings()
+        self.btn_export_rows.configure(state="normal")
+        self.btn_save_dataset.configure(state="normal")
+        self.btn_enrich.configure(state="normal")
+
+        # Profil kolumn (zwykle policzony już przy imporcie)
+        self._show_profile(dataset)
+
+        # Przekaż dane do reszty aplikacji (np. Dashboard) razem z gotowymi agregacjami
+        if notify:
+            self.on_data_loaded(dataset, report)
+
+        # Nowe dane liczą się do budżetu pamięci (ponad limit -> zrzut na dysk w tle)
+        self.memory.register(dataset)
+        self._enforce_memory_budget()
+
+    def _enforce_memory_budget(self) -> None:
         """
-        Zmiana liczby wierszy do podglądu.
-        W przypadku "All" ostrzegamy przy dużym zbiorze (żeby nie zamrozić UI).
+        Jeśli dane przekraczają budżet pamięci, zrzuca najdawniej używane zbiory do plików
+        (w tle). Zbiór po zrzucie czyta kolumny z pliku mapowanego w pamięci – podgląd
+        przełączamy na nowy DataFrame (te same wartości, ten sam indeks sortowania).
+        """
+        if not self.memory.over_budget():
+            return
+
+        def on_done(spilled):
+            dataset = self.dataset
+            if dataset is None or not any(item is dataset for item in spilled):
+                return
+
+            previous = self.full_data
+            self.full_data = dataset.frame
+            self.table_index = dataset.derived("table_index", lambda: TableIndex(dataset.frame))
+            if self.view_data is previous:
+                self.view_data = self.full_data
+            self._render_window()
+            self._update_memory_status(force=True)
+
+        self.jobs.submit(
+            lambda job: self.memory.enforce(cancel_event=job.cancel_event),
+            title="Spilling data to disk",
+            on_done=on_done,
+            on_error=lambda e: self._set_status(f"Memory budget: spilling failed ({e})", kind="warn"),
+        )
+
+    def _update_memory_status(self, force: bool = False) -> None:
+        """
+        Odświeża licznik pamięci w pasku statusu (co MEMORY_POLL_MS, tylko przy zmianie tekstu).
+        """
+        now = time.monotonic()
+        if not force and (now - self._memory_polled) * 1000 < self.MEMORY_POLL_MS:
+            return
+        self._memory_polled = now
+
+        text = self.memory.status_text() if self.dataset is not None else ""
+        if text != self._memory_text:
+            self._memory_text = text
+            self.lbl_memory.config(text=text)
+
+    def _show_profile(self, dataset) -> None:
+        """
+        Wypełnia panel “Column profile”. Profil jest zapamiętany w Dataset; jeśli jeszcze go nie ma
+        (biblioteka, sesja), liczymy go w tle i pokazujemy po zakończeniu.
+        """
+        profile = dataset.cached("column_profile")
+        if profile is not None:
+            self._render_profile(profile, len(dataset))
+            return
+
+        self.profile_tree.delete(*self.profile_tree.get_children())
+        self.lbl_profile_info.config(text="Profiling columns...")
+
+        def on_done(result):
+            if dataset is self.dataset:
+                self._render_profile(result, len(dataset))
+
+        self.jobs.submit(
+            lambda job: self.column_profiler.profile(dataset),
+            title=f"Profiling {len(dataset):,} rows",
+            on_done=on_done,
+            on_error=lambda e: self.lbl_profile_info.config(text=f"Profiling failed: {e}"),
+        )
+
+    def _render_profile(self, profile: dict, rows: int) -> None:
+        """
+        Wstawia statystyki kolumn (ColumnProfiler) do panelu.
+        """
+        self.profile_tree.delete(*self.profile_tree.get_children())
+
+        for col, stats in profile.items():
+            nulls = stats["nulls"]
+            if stats["distinct_approx"]:
+                distinct = f"≈{stats['distinct']:,}"
+            else:
+                distinct = f"{stats['distinct']:,}"
+
+            if stats["distinct"] and stats["distinct"] == stats["count"] and not stats["distinct_approx"]:
+                top = "all values distinct"
+            else:
+                top = ", ".join(f"{self._profile_value(value)} ({count:,})" for value, count in stats["top"])
+
+            self.profile_tree.insert("", "end", values=[
+                col,
+                stats["dtype"],
+                f"{nulls:,} ({nulls / rows:.1%})" if rows and nulls else "0",
+                distinct,
+                self._profile_value(stats["min"]),
+                self._profile_value(stats["max"]),
+                self._profile_value(stats["mean"]),
+                top,
+            ])
+
+        total_nulls = sum(stats["nulls"] for stats in profile.values())
+        self.lbl_profile_info.config(text=f"{len(profile)} columns · {total_nulls:,} nulls")
+
+        if not self.profile_card.winfo_manager():
+            self.profile_card.pack(fill=tk.X, pady=(0, 12), before=self.table_card)
+
+    def _profile_value(self, value) -> str:
+        """
+        Formatuje wartość statystyki do wyświetlenia (liczby z separatorem tysięcy).
+        """
+        if value is None:
+            return ""
+        if isinstance(value, float):
+            return f"{value:,.2f}"
+        if isinstance(value, int) and not isinstance(value, bool):
+            return f"{value:,}"
+        return str(value)
+
+    def toggle_profile_click(self):
+        """
+        Zwija/rozwija tabelę profilu kolumn (nagłówek z podsumowaniem zostaje).
+        """
+        if self.profile_tree.winfo_manager():
+            self.profile_tree.pack_forget()
+            self.btn_profile_toggle.config(text="Show")
+        else:
+            self.profile_tree.pack(fill=tk.X, padx=14, pady=(0, 12))
+            self.btn_profile_toggle.config(text="Hide")
+
+    def export_rows_click(self):
+        """
+        Eksport wszystkich zaimportowanych wierszy (Dataset):
+        - format wybierany po rozszerzeniu (csv / parquet / jsonl / arrow),
+        - zapis w tle, postęp pokazywany w pasku statusu
+          (zbiór z biblioteki jest wczytywany do pandas dopiero w tym zadaniu),
+        - eksport można przerwać przyciskiem "Cancel" (istniejący plik pozostaje bez zmian).
+        """
+        if self.dataset is None:
+            messagebox.showwarning("Export", "No data available to export.")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=self.exporters.filetypes(rows=True) + [("All files", "*.*")],
+            title="Export Rows",
+        )
+        if not file_path:
+            return
+
+        exporter = self.exporters.exporter_for(file_path, rows=True)
+        if exporter is None:
+            messagebox.showerror("Export Error", f"Unsupported file type:\n{file_path}")
+            return
+
+        dataset = self.dataset
+
+        job = self.jobs.submit(
+            lambda j: exporter.save(dataset.frame, file_path, progress=j.set_progress, cancel_event=j.cancel_event),
+            title=f"Exporting {len(dataset):,} rows",
+            on_done=lambda result: self._on_export_done(job, result, file_path),
+            on_error=lambda e: self._on_export_done(job, (False, str(e)), file_path),
+            on_progress=lambda f: self._set_status(f"Exporting rows... {f:.0%}", kind="info"),
+            on_cancel=lambda: self._on_export_done(job, (False, "Export cancelled."), file_path),
+        )
+        self._export_jobs.add(job)
+        self.btn_cancel_export.configure(state="normal")
+        self._set_status("Exporting rows...", kind="info")
+
+    def cancel_export_click(self):
+        """
+        Anuluje eksport wierszy (bieżący i oczekujące w kolejce).
+        Zapis do pliku tymczasowego jest porzucany – docelowy plik nie jest ruszany.
+        """
+        for job in self._export_jobs:
+            job.cancel()
+        self._set_status("Cancelling export...", kind="info")
+
+    def save_dataset_click(self):
+        """
+        Zapisuje bieżące dane do biblioteki (SQLite) w tle.
+        Po zapisie zbiór można otworzyć w kolejnej sesji bez ponownego importu CSV.
         """
         if self.full_data is None:
+            messagebox.showwarning("Library", "No data available to save.")
+            return
+
+        store = self._dataset_store()
+        if store is None:
+            return
+
+        df = self.full_data
+        source = self.source_path
+        name = os.path.splitext(os.path.basename(source))[0] if source else "Dataset"
+
+        self.jobs.submit(
+            lambda job: store.save(df, name, source, progress=job.set_progress, cancel_event=job.cancel_event),
+            title=f"Saving {len(df):,} rows to the library",
+            on_done=lambda dataset_id: self._set_status(f"Saved “{name}” to the library ({len(df):,} rows)", kind="ok"),
+            on_error=self._on_save_dataset_error,
+            on_progress=lambda f: self._set_status(f"Saving to the library... {f:.0%}", kind="info"),
+        )
+        self._set_status("Saving to the library...", kind="info")
+
+    def _on_save_dataset_error(self, error: Exception) -> None:
+        """
+        Błąd zapisu do biblioteki (wywoływane na wątku UI).
+        """
+        messagebox.showerror("Library Error", f"Failed to save dataset:\n{error}")
+        self._set_status("Error saving dataset.", kind="err")
+
+    def library_click(self):
+        """
+        Pokazuje listę zbiorów zapisanych w bibliotece.
+        """
+        store = self._dataset_store()
+        if store is not None:
+            StoredDatasetsDialog(self, store, self.open_stored_dataset)
+
+    def open_stored_dataset(self, record: dict):
+        """
+        Otwiera zbiór z biblioteki bez wczytywania całej tabeli do pandas:
+        1) od razu pokazuje podgląd – wiersze stronicowane prosto z SQLite,
+        2) w tle liczy agregacje zapytaniami GROUP BY (dashboard dostaje je jak po imporcie),
+        3) pełny DataFrame jest wczytywany dopiero, gdy jest potrzebny: sortowanie, wyszukiwanie
+           (_load_stored_dataset), eksport wierszy, wzbogacanie, zapis sesji, wykresy rozkładów.
+        """
+        store = self._dataset_store()
+        if store is None:
+            return
+
+        # Poprzedni import (jeśli jeszcze trwa) przestaje być potrzebny
+        if self._import_job is not None:
+            self._import_job.cancel()
+
+        try:
+            table = store.table(record["id"])
+        except Exception as e:
+            messagebox.showerror("Library Error", f"Failed to open dataset:\n{e}")
+            return
+
+        # Natychmiastowy podgląd: kolumny/szerokości z pierwszej strony, reszta dociągana przy przewijaniu
+        self._close_stored_table()
+        self.stored_table = table
+        self.dataset = None
+        self.full_data = None
+        self.table_index = None
+        self.sort_column = None
+        self.btn_export_rows.configure(state="disabled")
+        self.btn_save_dataset.configure(state="disabled")
+        self.btn_enrich.configure(state="disabled")
+        self.profile_card.pack_forget()
+
+        self.update_grid(table.head(200))
+        self.view_data = table
+        self.view_positions = None
+        self.view_offset = 0
+        self._render_window()
+        self._show_table_empty_state(len(table) == 0)
+        self.lbl_rows_info.config(text=f"Showing {len(table):,} stored rows")
+
+        self._set_status(f"Opened “{record['name']}” – computing aggregates...", kind="info")
+
+        columns = list(table.columns)
+
+        def work(job):
+            report = store.get_full_report(record["id"])
+            total = store.calculate_total_revenue(record["id"]) if "Revenue" in columns else None
+            if job.cancelled:
+                raise JobCancelled()
+            return report, total
+
+        job = self.import_jobs.submit(
+            work,
+            title=f"Opening {record['name']}",
+            on_done=lambda result: self._on_stored_dataset_ready(job, record, table, result),
+            on_error=lambda error: self._on_stored_dataset_error(job, error),
+        )
+        self._import_job = job
+
+    def _on_stored_dataset_ready(self, job, record: dict, table, result) -> None:
+        """
+        Agregacje zbioru z biblioteki gotowe (na wątku UI): Dataset z odroczonym wczytaniem
+        (dane czyta dopiero pierwsze użycie DataFrame) + raport i suma z SQL trafiają do dashboardu.
+        Dashboard dostaje każdy zbiór – bez kolumny Revenue pokazuje swój pusty stan.
+        Podgląd dalej stronicuje wiersze z SQLite.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        report, total = result
+        store = self.store
+        dataset_id = record["id"]
+
+        dataset = Dataset.deferred(
+            lambda: store.load(dataset_id), table.columns, len(table),
+            name=record["name"], source=record["source_path"],
+        )
+        dataset.derived("full_report", lambda: report)
+        if total is not None:
+            dataset.derived("total_revenue", lambda: total)
+
+        self.dataset = dataset
+        self.source_path = record["source_path"]
+        self.btn_export_rows.configure(state="normal")
+        self.btn_enrich.configure(state="normal")
+
+        self.on_data_loaded(dataset, report)
+        self._set_status(
+            f"Opened “{record['name']}” ({len(table):,} rows) – sorting or searching loads it into memory",
+            kind="ok",
+        )
+
+    def _on_stored_dataset_error(self, job, error: Exception) -> None:
+        """
+        Błąd otwierania / wczytywania zbioru z biblioteki (na wątku UI). Błędy starszych zadań pomijamy.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        messagebox.showerror("Library Error", f"Failed to open dataset:\n{error}")
+        self._set_status("Error opening dataset.", kind="err")
+
+    def _is_stored_preview(self) -> bool:
+        """
+        True, gdy podgląd stronicuje zbiór z biblioteki, który nie jest jeszcze wczytany do pandas.
+        """
+        return self.full_data is None and self.dataset is not None and self.stored_table is not None
+
+    def _load_stored_dataset(self, then=None) -> None:
+        """
+        Wczytuje w tle do pandas zbiór otwarty z biblioteki (dotąd stronicowany z SQLite).
+        Potem podgląd przechodzi na DataFrame + TableIndex jak po imporcie i wykonuje `then`
+        (np. sortowanie, które o wczytanie poprosiło). Dashboard ma już ten sam Dataset.
+        """
+        dataset = self.dataset
+
+        # Poprzednie zadanie (import albo wczytywanie) przestaje być potrzebne
+        if self._import_job is not None:
+            self._import_job.cancel()
+
+        def work(job):
+            df = dataset.frame
+            if job.cancelled:
+                raise JobCancelled()
+            return df
+
+        def on_done(_):
+            if job is not self._import_job:
+                return
+            self._import_job = None
+            if dataset is not self.dataset:
+                return
+
+            self._show_dataset(
+                dataset, dataset.cached("full_report"), self.source_path,
+                self.sort_column, self.sort_ascending, notify=False,
+            )
+            self._set_status(f"Loaded {len(dataset):,} rows into memory", kind="ok")
+            if then is not None:
+                then()
+
+        job = self.import_jobs.submit(
+            work,
+            title=f"Loading {len(dataset):,} rows from the library",
+            on_done=on_done,
+            on_error=lambda error: self._on_stored_dataset_error(job, error),
+        )
+        self._import_job = job
+        self._set_status(f"Loading {len(dataset):,} rows into memory...", kind="info")
+
+    def enrich_click(self):
+        """
+        Wzbogaca bieżące dane według pliku wzbogacania (.json z listą tabel słownikowych CSV):
+        np. przelicza Revenue na EUR kursami walut albo mapuje kategorie na kategorie raportowe.
+        Wynik to nowy Dataset (nowa wersja) – tabela, profil i dashboard odświeżają się jak po imporcie.
+        """
+        if self.dataset is None:
+            messagebox.showwarning("Enrich", "No data available to enrich.")
+            return
+
+        spec_path = filedialog.askopenfilename(
+            filetypes=[("Enrichment files", "*.json"), ("All files", "*.*")],
+            title="Open Enrichment File",
+        )
+        if not spec_path:
             return
 
-        if self.row_limit_var.get() == "All":
-            n = len(self.full_data)
+        # Poprzedni import (jeśli jeszcze trwa) przestaje być potrzebny
+        if self._import_job is not None:
+            self._import_job.cancel()
 
-            # Ostrzeżenie, bo renderowanie tysięcy wierszy w Treeview może przyciąć aplikację
-            if n > 5000:
-                res = messagebox.askyesno(
-                    "Large dataset",
-                    f"You are about to render ALL rows ({n:,}).\n"
-                    "This may freeze the UI.\n\nContinue?",
-                )
-                if not res:
-                    self.row_limit_var.set("1000" if n > 1000 else "100")
-                    return
+        dataset = self.dataset
+        path = self.source_path
+
+        def work(job):
+            enricher = LookupEnricher.from_file(spec_path)
+            enriched = enricher.enrich(dataset)
+            if job.cancelled:
+                raise JobCancelled()
+
+            self.column_profiler.profile(enriched)
+            report = self.analyzer.get_full_report(enriched) if "Revenue" in enriched.columns else {}
+            return enriched, report, enricher.unmatched
+
+        job = self.import_jobs.submit(
+            work,
+            title=f"Enriching {len(dataset):,} rows",
+            on_done=lambda result: self._on_enrich_done(job, path, spec_path, result),
+            on_error=lambda error: self._on_enrich_error(job, error),
+        )
+        self._import_job = job
+        self._set_status("Enriching data...", kind="info")
+
+    def _on_enrich_done(self, job, path: str, spec_path: str, result) -> None:
+        """
+        Wynik wzbogacania (na wątku UI): pokazuje nowe dane + liczbę wierszy bez dopasowania.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        dataset, report, unmatched = result
+        self._show_dataset(dataset, report, path, self.sort_column, self.sort_ascending)
+
+        message = f"Enriched {len(dataset):,} rows using {os.path.basename(spec_path)}"
+        if unmatched:
+            details = "; ".join(
+                f"{target}: {info['rows']:,} rows without a match (e.g. {', '.join(info['keys'])})"
+                for target, info in unmatched.items()
+            )
+            self._set_status(f"{message} – {details}", kind="warn")
+        else:
+            self._set_status(message, kind="ok")
+
+    def _on_enrich_error(self, job, error: Exception) -> None:
+        """
+        Błąd wzbogacania (wywoływane na wątku UI) – dane pozostają bez zmian.
+        """
+        if job is not self._import_job:
+            return
+        self._import_job = None
+
+        messagebox.showerror("Enrich Error", f"Failed to enrich data:\n{error}")
+        self._set_status("Error enriching data.", kind="err")
+
+    def session_state(self) -> dict:
+        """
+        Ustawienia podglądu zapisywane w pliku sesji (SessionSnapshot).
+        """
+        return {
+            "row_limit": self.row_limit_var.get(),
+            "search": self.search_var.get(),
+            "sort_column": self.sort_column,
+            "sort_ascending": self.sort_ascending,
+        }
+
+    def save_session(self, path: str, state: dict) -> None:
+        """
+        Zapisuje sesję (dane + agregacje + indeksy podglądu + stan UI) do jednego pliku, w tle.
+
+        Args:
+            path: Plik sesji (.srsession).
+            state: Stan UI zebrany przez MainWindow (dashboard, aktywna zakładka, ...).
+        """
+        if self.dataset is None:
+            messagebox.showwarning("Session", "No data available to save.")
+            return
+
+        dataset = self.dataset
+        index = self.table_index
+        state = dict(state, home=self.session_state())
+
+        def work(job):
+            # Raport jest zapamiętany w Dataset od importu – tu zwykle nic się nie liczy
+            report = self.analyzer.get_full_report(dataset) if "Revenue" in dataset.columns else {}
+            return SessionSnapshot().save(
+                path, dataset, report, state, index,
+                progress=job.set_progress, cancel_event=job.cancel_event,
+            )
+
+        self.jobs.submit(
+            work,
+            title=f"Saving session ({len(dataset):,} rows)",
+            on_done=lambda size: self._set_status(f"Saved session to {path} ({size / 1e6:.1f} MB)", kind="ok"),
+            on_error=self._on_save_session_error,
+            on_progress=lambda f: self._set_status(f"Saving session... {f:.0%}", kind="info"),
+        )
+        self._set_status("Saving session...", kind="info")
+
+    def _on_save_session_error(self, error: Exception) -> None:
+        """
+        Błąd zapisu sesji (wywoływane na wątku UI).
+        """
+        messagebox.showerror("Session Error", f"Failed to save session:\n{error}")
+        self._set_status("Error saving session.", kind="err")
+
+    def restore_session(self, snapshot: dict) -> None:
+        """
+        Pokazuje dane z pliku sesji (wynik SessionSnapshot.load – pamięć mapowana, bez parsowania):
+        przywraca ustawienia podglądu (liczba wierszy, wyszukiwanie, sortowanie) i przekazuje
+        Dataset z zapisanymi agregacjami dalej, jak po imporcie.
+        """
+        # Poprzedni import (jeśli jeszcze trwa) przestaje być potrzebny
+        if self._import_job is not None:
+            self._import_job.cancel()
+            self._import_job = None
+
+        dataset = snapshot["dataset"]
+        state = snapshot["state"].get("home", {})
+
+        if state.get("row_limit") in self.ROW_LIMITS:
+            self.row_limit_var.set(state["row_limit"])
+        self.search_var.set(state.get("search", ""))
+
+        self._show_dataset(
+            dataset,
+            snapshot["report"],
+            dataset.source,
+            sort_column=state.get("sort_column"),
+            sort_ascending=state.get("sort_ascending", True),
+        )
+        self._set_status(f"Restored session: {len(dataset):,} rows from {dataset.source or dataset.name}", kind="ok")
+
+    def _dataset_store(self):
+        """
+        Zwraca bibliotekę zbiorów (tworzoną przy pierwszym użyciu) albo None po błędzie.
+        """
+        if self.store is None:
+            try:
+                self.store = DatasetStore()
+            except Exception as e:
+                messagebox.showerror("Library Error", f"Failed to open the dataset library:\n{e}")
+                return None
+        return self.store
+
+    def _close_stored_table(self) -> None:
+        """
+        Zamyka stronicowany podgląd zbioru z biblioteki (połączenie SQLite).
+        """
+        if self.stored_table is not None:
+            self.stored_table.close()
+            self.stored_table = None
+
+    def _on_export_done(self, job, result, file_path: str) -> None:
+        """
+        Wynik eksportu wierszy (success, message) – wywoływany na wątku UI.
+        Anulowanie przez użytkownika nie jest błędem (tylko komunikat w pasku statusu).
+        """
+        self._export_jobs.discard(job)
+        if not self._export_jobs:
+            self.btn_cancel_export.configure(state="disabled")
+
+        success, message = result
+        if not success and job.cancelled:
+            self._set_status("Export cancelled.", kind="info")
+        elif success:
+            self._set_status(f"Exported rows to {file_path}", kind="ok")
+        else:
+            messagebox.showerror("Export Error", f"Failed to save file:\n{message}")
+            self._set_status("Error exporting data.", kind="err")
+
+    def _poll_jobs(self) -> None:
+        """
+        Odbiera zdarzenia zadań w tle i planuje kolejne sprawdzenie.
+        """
+        self.import_jobs.poll()
+        self.jobs.poll()
+        self._update_profile_summary()
+        self._update_memory_status()
+        self.after(self.JOB_POLL_MS, self._poll_jobs)
+
+    def on_profiling_toggle(self):
+        """
+        Włącza/wyłącza pomiar etapów (czas, liczba wierszy, szczyt alokacji pamięci).
+        Przy wyłączonym profilowaniu instrumentacja praktycznie nic nie kosztuje.
+        """
+        if self.profiling_var.get():
+            profiler.clear()
+            profiler.enable()
+            self.lbl_profile.config(text="Waiting for the next import, chart or export...")
+            self.lbl_profile.pack(fill=tk.X, padx=12, pady=(0, 8))
+            self._set_status("Profiling enabled.", kind="info")
+        else:
+            profiler.disable()
+            self.lbl_profile.pack_forget()
+            self._set_status("Profiling disabled.", kind="info")
+
+    def save_trace_click(self):
+        """
+        Zapisuje zarejestrowane etapy do pliku JSON w formacie Chrome trace
+        (do otwarcia w chrome://tracing lub ui.perfetto.dev).
+        """
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile="salesresult_trace.json",
+            filetypes=[("Chrome trace", "*.json")],
+        )
+        if not file_path:
+            return
+
+        success, message = profiler.save_chrome_trace(file_path)
+        if success:
+            self._set_status(f"{message} Trace written to {file_path}", kind="ok")
+        else:
+            messagebox.showerror("Trace Error", f"Failed to save trace:\n{message}")
+            self._set_status("Error saving trace.", kind="err")
+
+    def _update_profile_summary(self) -> None:
+        """
+        Pokazuje w pasku statusu ostatnie zmierzone etapy (tylko gdy pojawiły się nowe).
+        """
+        if profiler.version == self._profile_version:
+            return
+        self._profile_version = profiler.version
+
+        self.btn_save_trace.configure(state="normal" if profiler.spans else "disabled")
+        if self.profiling_var.get():
+            summary = profiler.status_text()
+            if summary:
+                self.lbl_profile.config(text=f"⏱ {summary}")
+
+    def on_row_limit_change(self, event=None):
+        """
+        Zmiana liczby wierszy do podglądu.
+        Tabela jest wirtualizowana, więc "All" jest tak samo tanie jak 100 wierszy.
+        """
+        if self.full_data is None:
+            return
 
         self.refresh_table_view()
 
     def refresh_table_view(self):
         """
-        Wyświetla wybraną liczbę wierszy:
-        - 10 / 100 / 1000 = head(limit),
-        - All = wszystkie wiersze.
+        Wyświetla wybraną liczbę wierszy (po sortowaniu i wyszukiwaniu):
+        - 10 / 100 / 1000 = pierwsze `limit` wierszy wyniku,
+        - All = wszystkie wiersze wyniku.
+
+        Sortowanie i filtr liczy TableIndex jako tablicę pozycji – do Treeview
+        trafia tylko widoczne okno wierszy.
         """
         if self.full_data is None:
             self._show_table_empty_state(True)
             return
 
         limit_str = self.row_limit_var.get()
+        limit = None if limit_str == "All" else int(limit_str)
+        query = self.search_var.get()
 
-        if limit_str == "All":
-            data_to_show = self.full_data
-        else:
-            limit = int(limit_str)
-            data_to_show = self.full_data.head(limit)
+        positions = self.table_index.view(self.sort_column, self.sort_ascending, query, limit)
+
+        # Kolumny / szerokości przebudowujemy tylko przy zmianie danych
+        if self.view_data is not self.full_data:
+            self.update_grid(self.full_data)
 
-        self.update_grid(data_to_show)
+        self.view_positions = positions
+        self.view_offset = 0
+        self._render_window()
 
         # Aktualizujemy label z informacją ile pokazujemy
         total = len(self.full_data)
-        shown = len(data_to_show)
-        self.lbl_rows_info.config(text=f"Showing {shown:,} of {total:,} rows")
+        shown = len(positions)
+        suffix = " (filtered)" if query.strip() else ""
+        self.lbl_rows_info.config(text=f"Showing {shown:,} of {total:,} rows{suffix}")
+
+    def on_sort_click(self, column):
+        """
+        Kliknięcie w nagłówek kolumny:
+        - pierwsze kliknięcie sortuje rosnąco,
+        - kolejne przełącza rosnąco / malejąco.
+        Permutacje sortowania są cache'owane w TableIndex (drugie sortowanie jest natychmiastowe).
+        Zbiór z biblioteki jest najpierw wczytywany do pandas (w tle).
+        """
+        if self._is_stored_preview():
+            self._load_stored_dataset(then=lambda: self.on_sort_click(column))
+            return
+        if self.full_data is None:
+            return
+
+        if self.sort_column == column:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column
+            self.sort_ascending = True
+
+        self._set_status(f"Sorting by {column}...", kind="info")
+        self.update_idletasks()
+
+        self._update_sort_headings()
+        self.refresh_table_view()
+
+        direction = "ascending" if self.sort_ascending else "descending"
+        self._set_status(f"Sorted by {column} ({direction})", kind="ok")
+
+    def on_search_change(self, event=None):
+        """
+        Zmiana tekstu wyszukiwania – odkładamy filtrowanie o SEARCH_DELAY_MS,
+        żeby nie liczyć przy każdym wciśniętym klawiszu.
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """
+        Filtruje podgląd po tekście z pola wyszukiwania (wszystkie kolumny, bez rozróżniania wielkości liter).
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
+        if self.full_data is not None:
+            self.refresh_table_view()
+        elif self._is_stored_preview() and self.search_var.get().strip():
+            # Zbiór z biblioteki: po wczytaniu _show_dataset odświeża podgląd z aktualnym wyszukiwaniem
+            self._load_stored_dataset()
+
+    def clear_search(self):
+        """
+        Czyści pole wyszukiwania i pokazuje wszystkie wiersze.
+        """
+        self.search_var.set("")
+        self.apply_search()
+
+    def _update_sort_headings(self) -> None:
+        """
+        Dodaje strzałkę ▲/▼ do nagłówka kolumny, po której sortujemy.
+        """
+        for col in self._grid_columns:
+            text = str(col)
+            if col == self.sort_column:
+                text += " ▲" if self.sort_ascending else " ▼"
+            self.tree.heading(col, text=text)
 
     def update_grid(self, df):
         """
         Przebudowuje tabelę:
         - ustawia kolumny na podstawie df.columns,
-        - wstawia wiersze,
+        - wstawia tylko widoczne okno wierszy (reszta jest dociągana przy przewijaniu),
         - ustawia zebra-striping,
         - automatycznie dobiera szerokości kolumn (na podstawie nagłówka i próbki wierszy).
 
@@ -460,45 +1539,133 @@ class HomeView(tk.Frame):
         stretch=False w kolumnach jest celowe -> gdy okno jest mniejsze niż tabela,
         poziomy scrollbar działa poprawnie (kolumny nie “ściskają się” na siłę).
         """
-        # Czyścimy poprzednią zawartość tabeli
-        self.tree.delete(*self.tree.get_children())
+        with profiler.span("HomeView.update_grid", len(df)):
+            # Czyścimy poprzednią zawartość tabeli
+            self.tree.delete(*self.tree.get_children())
+            self._row_items = []
 
-        # Ustawiamy kolumny
-        cols = list(df.columns)
-        self.tree["columns"] = cols
-        self.tree["show"] = "headings"
+            # Ustawiamy kolumny
+            cols = list(df.columns)
+            self._grid_columns = cols
+            self.tree["columns"] = cols
+            self.tree["show"] = "headings"
 
-        # Zebra striping (naprzemienne tła wierszy)
-        self.tree.tag_configure("oddrow", background="#ffffff")
-        self.tree.tag_configure("evenrow", background="#f3f4f6")
+            # Wyliczamy sensowną szerokość kolumn (nagłówek + próbka wierszy, ograniczone do 110–420 px)
+            widths = self.width_estimator.estimate(df)
+
+            for col in cols:
+                cell_w = widths[col]
+
+                # Kliknięcie w nagłówek sortuje podgląd
+                self.tree.heading(col, text=col, anchor=tk.W, command=lambda c=col: self.on_sort_click(c))
 
-        # Wyliczamy sensowną szerokość kolumn na podstawie fontu
-        font = tkfont.Font(family="Segoe UI", size=10)
-        sample_rows = df.head(30).to_numpy()  # próbka do szacowania szerokości
+                # stretch=False -> poziomy scrollbar jest “prawdziwy” i działa przy małym oknie
+                self.tree.column(col, width=cell_w, minwidth=90, anchor=tk.W, stretch=False)
 
-        for col_i, col in enumerate(cols):
-            header_w = font.measure(str(col)) + 24
-            cell_w = header_w
+            # Wstawiamy tylko widoczne okno wierszy (od początku zbioru)
+            self.view_data = df
+            self.view_positions = None
+            self.view_offset = 0
+            self._render_window()
 
-            # bierzemy max szerokość z próbki wierszy
-            for r in sample_rows:
-                try:
-                    cell_w = max(cell_w, font.measure(str(r[col_i])) + 24)
-                except Exception:
-                    pass
+            # Pokaż/ukryj empty state
+            self._show_table_empty_state(len(df) == 0)
 
-            # ograniczamy, żeby kolumny nie były absurdalnie szerokie
-            cell_w = min(max(cell_w, 110), 420)
+    # ====================================================================
+    #                        WIRTUALIZACJA TABELI
+    # ====================================================================
 
-            self.tree.heading(col, text=col, anchor=tk.W)
+    def _view_len(self) -> int:
+        """Liczba wierszy w aktualnie przeglądanym zbiorze."""
+        if self.view_positions is not None:
+            return len(self.view_positions)
+        return 0 if self.view_data is None else len(self.view_data)
 
-            # stretch=False -> poziomy scrollbar jest “prawdziwy” i działa przy małym oknie
-            self.tree.column(col, width=cell_w, minwidth=90, anchor=tk.W, stretch=False)
+    def _render_window(self) -> None:
+        """
+        Wypełnia Treeview wierszami z okna [view_offset, view_offset + visible_rows).
+
+        Wiersze pobieramy z DataFrame po pozycji (iloc – bezpośrednio albo przez
+        view_positions po sortowaniu/wyszukiwaniu), a elementy Treeview
+        są reużywane (item(...)) zamiast kasowania i wstawiania od nowa.
+        """
+        with profiler.span("HomeView.render_window") as span:
+            total = self._view_len()
+            count = min(self.visible_rows + self.ROW_BUFFER, max(total - self.view_offset, 0))
+            span.set_rows(count)
+
+            # Dopasowujemy pulę elementów do rozmiaru okna
+            while len(self._row_items) < count:
+                self._row_items.append(self.tree.insert("", "end"))
+            if len(self._row_items) > count:
+                self.tree.delete(*self._row_items[count:])
+                del self._row_items[count:]
+
+            if count:
+                if isinstance(self.view_data, StoredTable):
+                    # Zbiór z biblioteki: strona wierszy prosto z SQLite (keyset po rowid)
+                    rows = self.view_data.fetch(self.view_offset, count)
+                else:
+                    window = slice(self.view_offset, self.view_offset + count)
+                    if self.view_positions is not None:
+                        window = self.view_positions[window]
+                    rows = self.view_data.iloc[window].to_numpy()
+                for i, (iid, row) in enumerate(zip(self._row_items, rows)):
+                    tag = "evenrow" if (self.view_offset + i) % 2 == 0 else "oddrow"
+                    self.tree.item(iid, values=list(row), tags=(tag,))
+
+            # Scrollbar odzwierciedla pozycję okna w całym zbiorze
+            if total:
+                first = self.view_offset / total
+                last = min(self.view_offset + self.visible_rows, total) / total
+                self.scroll_y.set(first, last)
+            else:
+                self.scroll_y.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int) -> None:
+        """Ustawia pierwszy widoczny wiersz (z ograniczeniem do zakresu danych)."""
+        max_offset = max(self._view_len() - self.visible_rows, 0)
+        offset = min(max(int(offset), 0), max_offset)
+        if offset != self.view_offset:
+            self.view_offset = offset
+            self._render_window()
+
+    def _scroll_rows(self, delta: int) -> str:
+        """Przesuwa okno o delta wierszy (kółko myszy / PageUp / PageDown)."""
+        self._scroll_to(self.view_offset + delta)
+        return "break"
+
+    def _on_scroll_y(self, *args) -> None:
+        """
+        Obsługa pionowego scrollbara (protokół Tk):
+        - ("moveto", fraction) – przeciągnięcie suwaka,
+        - ("scroll", n, "units" | "pages") – strzałki / kliknięcie w tor.
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * self._view_len()))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self._scroll_rows(int(args[1]) * step)
 
-        # Wstawiamy wiersze do tabeli
-        for i, row in enumerate(df.to_numpy()):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-            self.tree.insert("", "end", values=list(row), tags=(tag,))
+    def _on_mouse_wheel(self, event) -> str:
+        """Kółko myszy (Windows / macOS): delta=±120 na „ząbek”."""
+        return self._scroll_rows(-3 if event.delta > 0 else 3)
 
-        # Pokaż/ukryj empty state
-        self._show_table_empty_state(len(df) == 0)
+    def _on_tree_resize(self, event=None) -> None:
+        """
+        Po zmianie rozmiaru tabeli przeliczamy, ile wierszy jest widocznych.
+        Nagłówek odejmujemy na podstawie pozycji pierwszego wiersza (bbox).
+        """
+        header_h = 32
+        if self._row_items:
+            bbox = self.tree.bbox(self._row_items[0])
+            if bbox:
+                header_h = bbox[1]
+
+        visible = max((self.tree.winfo_height() - header_h) // self.ROW_HEIGHT, 1)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self.view_offset = min(self.view_offset, max(self._view_len() - visible, 0))
+            self._render_window()
@@ -1,6 +1,7 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 
+from Core.SessionSnapshot import SessionSnapshot
 from Ui.HomeView import HomeView
 from Ui.DashboardView import DashboardView
 
@@ -12,7 +13,8 @@ class MainWindow(tk.Tk):
     - konfigurację okna,
     - motyw i style globalne (Notebook),
     - nawigację zakładkami (Home / Dashboard),
-    - przekazanie danych z HomeView do DashboardView.
+    - przekazanie danych z HomeView do DashboardView,
+    - zapis / przywracanie sesji (menu Session).
     """
 
     # Kolor tła aplikacji (spójny z resztą widoków)
@@ -48,6 +50,24 @@ class MainWindow(tk.Tk):
         self.tabs.add(self.home_view, text="Home & Data")
         self.tabs.add(self.dashboard_view, text="Sales Analysis")
 
+        # -------------------- Menu --------------------
+        self._build_menu()
+
+    def _build_menu(self) -> None:
+        """
+        Menu “Session”: zapis całej sesji do pliku i jej przywrócenie.
+        """
+        menubar = tk.Menu(self)
+
+        session_menu = tk.Menu(menubar, tearoff=False)
+        session_menu.add_command(label="Open session...", command=self.open_session_click, accelerator="Ctrl+O")
+        session_menu.add_command(label="Save session...", command=self.save_session_click, accelerator="Ctrl+S")
+        menubar.add_cascade(label="Session", menu=session_menu)
+
+        self.config(menu=menubar)
+        self.bind_all("<Control-o>", lambda e: self.open_session_click())
+        self.bind_all("<Control-s>", lambda e: self.save_session_click())
+
     def _configure_styles(self) -> None:
         """
         Konfiguruje wygląd zakładek (Notebook):
@@ -78,12 +98,61 @@ class MainWindow(tk.Tk):
             background=[("selected", "#ffffff"), ("!selected", "#eef2ff")],
         )
 
-    def on_data_ready(self, df):
+    def on_data_ready(self, dataset, report=None):
         """
         Callback wywołany przez HomeView po udanym imporcie danych.
         Robimy tu dwie rzeczy:
-        1) Przekazujemy DataFrame do DashboardView (render KPI + wykres),
+        1) Przekazujemy Dataset (wspólny, niezmienny uchwyt danych – bez kopiowania DataFrame)
+           i agregacje policzone w tle do DashboardView (render KPI + wykres),
         2) Automatycznie przełączamy użytkownika na zakładkę analizy.
         """
-        self.dashboard_view.render(df)
+        self.dashboard_view.render(dataset, report)
         self.tabs.select(1)  # indeks 1 = druga zakładka (Sales Analysis)
+
+    def save_session_click(self):
+        """
+        Zapisuje sesję (dane, agregacje, ustawienia dashboardu i podglądu) do pliku .srsession.
+        Sam zapis wykonuje HomeView w tle.
+        """
+        if self.home_view.dataset is None:
+            messagebox.showwarning("Session", "No data available to save.")
+            return
+
+        path = filedialog.asksaveasfilename(
+            defaultextension=SessionSnapshot.EXTENSION,
+            filetypes=[("SalesResult session", f"*{SessionSnapshot.EXTENSION}"), ("All files", "*.*")],
+            title="Save Session",
+        )
+        if not path:
+            return
+
+        state = {
+            "dashboard": self.dashboard_view.session_state(),
+            "tab": self.tabs.index("current"),
+        }
+        self.home_view.save_session(path, state)
+
+    def open_session_click(self):
+        """
+        Przywraca sesję z pliku .srsession.
+        Plik jest mapowany w pamięci (bez parsowania), więc odczyt trwa ułamek sekundy
+        niezależnie od rozmiaru danych – robimy go więc bezpośrednio na wątku UI.
+        """
+        path = filedialog.askopenfilename(
+            filetypes=[("SalesResult session", f"*{SessionSnapshot.EXTENSION}"), ("All files", "*.*")],
+            title="Open Session",
+        )
+        if not path:
+            return
+
+        try:
+            snapshot = SessionSnapshot().load(path)
+        except Exception as e:
+            messagebox.showerror("Session Error", f"Failed to open session:\n{e}")
+            return
+
+        # Najpierw ustawienia dashboardu – render po przywróceniu danych rysuje już zapisany układ
+        state = snapshot["state"]
+        self.dashboard_view.apply_session_state(state.get("dashboard", {}))
+        self.home_view.restore_session(snapshot)
+        self.tabs.select(state.get("tab", 1))
@@ -0,0 +1,104 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+
+class StoredDatasetsDialog(tk.Toplevel):
+    """
+    Okno z listą zbiorów zapisanych w lokalnej bazie (DatasetStore):
+    - otwarcie wybranego zbioru (przycisk lub dwuklik),
+    - usunięcie zbioru z bazy.
+    """
+
+    BG_APP = "#f6f7fb"
+    FONT_BODY = ("Segoe UI", 10)
+
+    # Kolumny listy: (klucz w rekordzie, nagłówek, szerokość px)
+    COLUMNS = [
+        ("name", "Name", 220),
+        ("rows", "Rows", 100),
+        ("created_at", "Saved", 150),
+        ("source_path", "Source file", 320),
+    ]
+
+    def __init__(self, parent, store, on_open):
+        """
+        Args:
+            parent: Okno nadrzędne.
+            store (DatasetStore): Baza zapisanych zbiorów.
+            on_open: callback wywoływany z rekordem zbioru (dict z DatasetStore.list()).
+        """
+        super().__init__(parent, bg=self.BG_APP)
+        self.title("Stored datasets")
+        self.geometry("820x360")
+        self.transient(parent.winfo_toplevel())
+
+        self.store = store
+        self.on_open = on_open
+        self.records = {}
+
+        self._build_ui()
+        self.reload()
+
+    def _build_ui(self) -> None:
+        """Lista zbiorów (Treeview) + przyciski akcji pod spodem."""
+        frame = tk.Frame(self, bg=self.BG_APP)
+        frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
+
+        self.tree = ttk.Treeview(
+            frame,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show="headings",
+            selectmode="browse",
+            style="Pro.Treeview",
+        )
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, anchor=tk.W)
+            self.tree.column(key, width=width, anchor=tk.W, stretch=(key == "source_path"))
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind("<Double-1>", lambda e: self.open_click())
+
+        buttons = tk.Frame(self, bg=self.BG_APP)
+        buttons.pack(fill=tk.X, padx=12, pady=(0, 12))
+
+        ttk.Button(buttons, text="Close", command=self.destroy, style="Ghost.TButton").pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="🗑 Delete", command=self.delete_click, style="Ghost.TButton").pack(
+            side=tk.RIGHT, padx=(0, 8)
+        )
+        ttk.Button(buttons, text="📂 Open", command=self.open_click, style="Primary.TButton").pack(side=tk.LEFT)
+
+    def reload(self) -> None:
+        """Wczytuje listę zbiorów z bazy (najnowsze na górze)."""
+        self.tree.delete(*self.tree.get_children())
+        self.records = {}
+
+        for record in self.store.list():
+            iid = str(record["id"])
+            self.records[iid] = record
+            values = [f"{record[key]:,}" if key == "rows" else (record[key] or "") for key, _, _ in self.COLUMNS]
+            self.tree.insert("", "end", iid=iid, values=values)
+
+    def _selected(self):
+        """Zwraca rekord zaznaczonego zbioru (albo None)."""
+        selection = self.tree.selection()
+        return self.records.get(selection[0]) if selection else None
+
+    def open_click(self) -> None:
+        """Otwiera zaznaczony zbiór i zamyka okno."""
+        record = self._selected()
+        if record is None:
+            return
+
+        self.destroy()
+        self.on_open(record)
+
+    def delete_click(self) -> None:
+        """Usuwa zaznaczony zbiór z bazy (po potwierdzeniu)."""
+        record = self._selected()
+        if record is None:
+            return
+
+        if not messagebox.askyesno("Delete dataset", f"Delete “{record['name']}” from the library?", parent=self):
+            return
+
+        self.store.delete(record["id"])
+        self.reload()